@@ -0,0 +1,108 @@
+"""Group move benchmark
+
+Measures the time of a mouse move while dragging all elements of a
+diagram in the main window. Runs on the offscreen platform with empty
+settings.
+
+    python benchmarks/bench_group_move.py [--elements N] [--moves N] [--reference]
+
+With --reference, the elements are also dragged as Qt moves them, each
+element snapping and recalculating itself.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPoint, Qt
+from PySide6.QtTest import QTest
+
+from umlayer.composition_root import CompositionRoot
+from umlayer.gui import LineElement, Settings
+
+from bench_render_profiles import open_diagram
+
+
+def move_times(main_window, moves: int) -> list[float]:
+    """Returns milliseconds of every mouse move dragging all elements"""
+    scene = main_window.scene
+    view = main_window.sceneView
+    viewport = view.viewport()
+    main_window.scene_logic.selectAllElements()
+    # lines start at a handle, which resizes a line instead of moving it
+    anchor = next(
+        element
+        for element in scene.selectedElements()
+        if not isinstance(element, LineElement)
+    )
+    view.centerOn(anchor)
+    start = view.mapFromScene(anchor.sceneBoundingRect().center())
+
+    times = []
+    QTest.mousePress(viewport, Qt.LeftButton, Qt.NoModifier, start)
+    for i in range(1, moves + 1):
+        # every move crosses a grid block
+        position = start + QPoint(i * Settings.BLOCK_SIZE, i * Settings.BLOCK_SIZE)
+        started = time.perf_counter()
+        QTest.mouseMove(viewport, position)
+        times.append((time.perf_counter() - started) * 1000)
+    QTest.mouseRelease(viewport, Qt.LeftButton, Qt.NoModifier, position)
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--elements", type=int, default=300)
+    parser.add_argument("--moves", type=int, default=30)
+    parser.add_argument("--reference", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    # keep user settings and logs untouched
+    config_dir = tempfile.TemporaryDirectory()
+    os.environ["XDG_CONFIG_HOME"] = config_dir.name
+
+    composer = CompositionRoot()
+    composer.compose()
+    app = composer.app
+    main_window = composer.main_window
+    main_window.initialize()
+    main_window.resize(1280, 800)
+    main_window.show()
+    app.processEvents()
+    open_diagram(main_window, args.elements)
+    app.processEvents()
+
+    result = {
+        "move_ms": round(statistics.median(move_times(main_window, args.moves)), 2)
+    }
+    if args.reference:
+        Settings.GROUP_MOVE_MIN_ELEMENTS = sys.maxsize
+        result["reference_move_ms"] = round(
+            statistics.median(move_times(main_window, args.moves)), 2
+        )
+
+    if args.json:
+        print(json.dumps(result, indent=1))
+    else:
+        line = f"{2 * args.elements} elements: move {result['move_ms']:7.2f} ms"
+        if "reference_move_ms" in result:
+            line += f"  (moved by Qt {result['reference_move_ms']:.2f} ms)"
+        print(line)
+
+    main_window.setDirty(False)
+    del app
+    config_dir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
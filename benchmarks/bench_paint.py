@@ -0,0 +1,138 @@
+"""Line painting benchmark
+
+Measures painting lines of all types and tips by calling
+LineElement.paint directly, half of them selected. Runs on the offscreen
+platform.
+
+    python benchmarks/bench_paint.py [--lines N] [--runs N] [--reference]
+
+With --reference, the lines are also painted with pens and brushes
+made on every paint, as the lines did before the paint resource table.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPainter, QPen, QPicture
+from PySide6.QtWidgets import QApplication, QStyleOptionGraphicsItem
+
+from umlayer.gui import LineElement, Settings
+
+LINE_TEXTS = ["lt=-", "lt=->", "lt=<<-", "lt=.>>", "lt=->>>>>", "lt=<<<<-", "lt=.."]
+FILLED_TIP_TYPES = LineElement._filled_tip_types
+
+
+class ReferenceLineElement(LineElement):
+    """Makes its pens and brushes on every paint, like the lines did before"""
+
+    def paint(self, painter, option, widget=None):
+        x1 = self._tip1_figure.point().x()
+        y1 = self._tip1_figure.point().y()
+        x2 = self._tip2_figure.point().x()
+        y2 = self._tip2_figure.point().y()
+        pen = (
+            Settings.LINE_SELECTED_PEN
+            if self.isSelected()
+            else Settings.ELEMENT_NORMAL_PEN
+        )
+        if self.isSimplified(painter, option):
+            painter.setPen(pen)
+            painter.drawLine(x1, y1, x2, y2)
+            return
+        line_pen = QPen(pen)
+        line_pen.setStyle(self._pen_style_from_line_type[self._line_type])
+        painter.setPen(line_pen)
+        painter.drawLine(x1, y1, x2, y2)
+        painter.setPen(pen)
+        painter.setBrush(self._tipBrush(self._tip1))
+        self._tip1_figure.paint(painter)
+        painter.setBrush(self._tipBrush(self._tip2))
+        self._tip2_figure.paint(painter)
+        painter.setBrush(Qt.NoBrush)
+
+    def _tipBrush(self, tip_type):
+        if tip_type in FILLED_TIP_TYPES:
+            return (
+                Settings.LINE_SELECTED_BRUSH
+                if self.isSelected()
+                else Settings.ELEMENT_NORMAL_BRUSH
+            )
+        return (
+            Settings.ELEMENT_SELECTED_TRANSPARENT_BRUSH
+            if self.isSelected()
+            else Settings.ELEMENT_NORMAL_TRANSPARENT_BRUSH
+        )
+
+
+def make_lines(size: int, line_class) -> list[LineElement]:
+    lines = []
+    for i in range(size):
+        line = line_class(x1=0, y1=0, x2=80, y2=40 + i % 40, text=LINE_TEXTS[i % 7])
+        line.setSelected(i % 2 == 0)
+        lines.append(line)
+    return lines
+
+
+def measure(lines: list[LineElement]) -> float:
+    """Returns milliseconds to paint all lines
+
+    The painting is recorded, not rasterized, so that the time is spent
+    in the paint methods rather than in drawing pixels.
+    """
+    picture = QPicture()
+    option = QStyleOptionGraphicsItem()
+    painter = QPainter(picture)
+    painter.setRenderHint(QPainter.Antialiasing)
+    started = time.perf_counter()
+    for line in lines:
+        line.paint(painter, option)
+    finished = time.perf_counter()
+    painter.end()
+    return (finished - started) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--reference", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+
+    lines = make_lines(args.lines, LineElement)
+    result = {
+        "paint_ms": round(
+            statistics.median(measure(lines) for _ in range(args.runs)), 1
+        )
+    }
+    if args.reference:
+        reference_lines = make_lines(args.lines, ReferenceLineElement)
+        result["reference_paint_ms"] = round(
+            statistics.median(measure(reference_lines) for _ in range(args.runs)), 1
+        )
+
+    if args.json:
+        print(json.dumps(result, indent=1))
+    else:
+        line = f"{args.lines} lines: paint {result['paint_ms']:8.1f} ms"
+        if "reference_paint_ms" in result:
+            line += f"  (pens made on paint {result['reference_paint_ms']:.1f} ms)"
+        print(line)
+
+    del app
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""Render cache benchmark
+
+Measures frame times of a diagram view while scrolling it and while
+panning it diagonally, with the elements painted from cached pixmaps
+and painted anew on every frame. Runs on the offscreen platform.
+
+    python benchmarks/bench_render_cache.py [--elements N] [--frames N] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtWidgets import (
+    QApplication,
+    QGraphicsItem,
+    QGraphicsScene,
+    QGraphicsView,
+)
+
+from umlayer.gui import (
+    BaseElement,
+    ClassElement,
+    NoteElement,
+    PackageElement,
+    LineElement,
+    GraphicsView,
+)
+
+COLUMNS = 20
+CELL_SIZE = 220
+CLASS_TEXT = "Order\n--\n+id: int\n+items: list\n--\n+total(): float"
+
+
+def make_elements(size: int) -> list[BaseElement]:
+    """Returns size elements in a grid, a line in every cell"""
+    elements = []
+    element_classes = [ClassElement, NoteElement, PackageElement]
+    for i in range(size):
+        position = QPointF((i % COLUMNS) * CELL_SIZE, (i // COLUMNS) * CELL_SIZE)
+        element = element_classes[i % len(element_classes)](text=CLASS_TEXT)
+        element.setPos(position)
+        line = LineElement(text="lt=<<-")
+        line.setPos(position + QPointF(0, 150))
+        elements.extend([element, line])
+    return elements
+
+
+def make_scene(size: int) -> QGraphicsScene:
+    scene = QGraphicsScene()
+    for element in make_elements(size):
+        scene.addItem(element)
+    return scene
+
+
+def set_render_cached(scene: QGraphicsScene, cached: bool) -> None:
+    cache_mode = (
+        QGraphicsItem.DeviceCoordinateCache if cached else QGraphicsItem.NoCache
+    )
+    for item in scene.items():
+        item.setCacheMode(cache_mode)
+
+
+def frame_times(view: QGraphicsView, positions: list[QPointF]) -> list[float]:
+    """Returns milliseconds to paint the view centered on every position"""
+    times = []
+    viewport = view.viewport()
+    for position in positions:
+        started = time.perf_counter()
+        view.centerOn(position)
+        viewport.repaint()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def view_paths(rect: QRectF, frames: int) -> tuple[list[QPointF], list[QPointF]]:
+    """Returns view centers to scroll the rectangle down and to pan it diagonally"""
+    step = rect.height() / frames
+    scroll = [QPointF(rect.center().x(), rect.top() + i * step) for i in range(frames)]
+    diagonal = rect.width() / frames
+    pan = [
+        QPointF(rect.left() + i * diagonal, rect.top() + i * step)
+        for i in range(frames)
+    ]
+    return scroll, pan
+
+
+def measure(scene: QGraphicsScene, frames: int, cached: bool) -> dict:
+    set_render_cached(scene, cached)
+    view = GraphicsView(scene)
+    view.resize(1280, 800)
+    view.show()
+    QApplication.processEvents()
+
+    scroll, pan = view_paths(scene.itemsBoundingRect(), frames)
+    # the first pass fills the cache, as the user sees the diagram first
+    frame_times(view, scroll)
+    result = {
+        "scroll_ms": round(statistics.median(frame_times(view, scroll)), 2),
+        "pan_ms": round(statistics.median(frame_times(view, pan)), 2),
+    }
+    view.hide()
+    view.deleteLater()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--elements", type=int, default=600)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+
+    scene = make_scene(args.elements)
+    results = {
+        "cached": measure(scene, args.frames, cached=True),
+        "uncached": measure(scene, args.frames, cached=False),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+    else:
+        for name, result in results.items():
+            print(
+                f"{name:>8}: scroll {result['scroll_ms']:7.2f} ms/frame"
+                f"  pan {result['pan_ms']:7.2f} ms/frame"
+            )
+
+    del app
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Render profile benchmark
+
+Measures frame times of the diagram view of the main window with each
+render profile, while scrolling a diagram with the grid shown and while
+panning it diagonally. Runs on the offscreen platform with empty settings.
+
+    python benchmarks/bench_render_profiles.py [--elements N] [--frames N] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from umlayer.composition_root import CompositionRoot
+from umlayer.gui import RenderProfile
+
+from bench_render_cache import frame_times, make_elements, view_paths
+
+
+def open_diagram(main_window, size: int) -> None:
+    """Shows a new diagram of size elements with the grid in the main window"""
+    main_window.createNewProject()
+    project = main_window.project
+    diagram = main_window.create_diagram(project.root.id)
+    project.storeDiagram(
+        diagram.id, [element.toJson() for element in make_elements(size)]
+    )
+    main_window.showDiagram(diagram.id)
+    main_window.scene_logic.toggleGrid(True)
+
+
+def measure(main_window, frames: int, profile: RenderProfile) -> dict:
+    main_window.setRenderProfile(profile)
+    view = main_window.sceneView
+    scroll, pan = view_paths(main_window.scene.itemsBoundingRect(), frames)
+    # the first pass fills the caches, as the user sees the diagram first
+    frame_times(view, scroll)
+    return {
+        "scroll_ms": round(statistics.median(frame_times(view, scroll)), 2),
+        "pan_ms": round(statistics.median(frame_times(view, pan)), 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--elements", type=int, default=600)
+    parser.add_argument("--frames", type=int, default=60)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    # keep user settings and logs untouched
+    config_dir = tempfile.TemporaryDirectory()
+    os.environ["XDG_CONFIG_HOME"] = config_dir.name
+
+    composer = CompositionRoot()
+    composer.compose()
+    app = composer.app
+    main_window = composer.main_window
+    main_window.initialize()
+    main_window.resize(1280, 800)
+    main_window.show()
+    app.processEvents()
+    open_diagram(main_window, args.elements)
+    app.processEvents()
+
+    results = {
+        profile.value: measure(main_window, args.frames, profile)
+        for profile in RenderProfile
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+    else:
+        for name, result in results.items():
+            print(
+                f"{name:>8}: scroll {result['scroll_ms']:7.2f} ms/frame"
+                f"  pan {result['pan_ms']:7.2f} ms/frame"
+            )
+
+    main_window.setDirty(False)
+    del app
+    config_dir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Startup benchmark
+
+Measures the cumulative import time of the application modules
+(python -X importtime) and the time until the main window is painted
+for the first time on the offscreen platform.
+
+    python benchmarks/bench_startup.py [--runs N] [--budget-ms MS]
+
+The exit code is 1 if the median import time exceeds the budget.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_MODULE = "umlayer.composition_root"
+
+_IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+_FIRST_PAINT_SCRIPT = """
+import time
+start = time.perf_counter()
+
+from PySide6.QtCore import QEvent, QObject, QTimer
+from umlayer.composition_root import CompositionRoot
+
+class FirstPaintFilter(QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and not hasattr(self, "painted"):
+            self.painted = time.perf_counter()
+            QTimer.singleShot(0, app.quit)
+        return False
+
+composer = CompositionRoot()
+composer.compose()
+app = composer.app
+main_window = composer.main_window
+paint_filter = FirstPaintFilter()
+main_window.installEventFilter(paint_filter)
+main_window.initialize()
+main_window.show()
+app.exec()
+print(round((paint_filter.painted - start) * 1000, 1))
+"""
+
+
+def _child_env(config_dir: str) -> dict:
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    # keep user settings and logs untouched
+    env["XDG_CONFIG_HOME"] = config_dir
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (REPO_DIR, env.get("PYTHONPATH")) if path
+    )
+    return env
+
+
+def measure_import_time(env: dict) -> tuple[float, list[tuple[float, str]]]:
+    """Return the cumulative import time of the root module and the slowest modules"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ROOT_MODULE}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        cumulative_us = int(match.group(2))
+        name = match.group(4)
+        modules.append((cumulative_us / 1000, name))
+        if name == ROOT_MODULE:
+            total_us = cumulative_us
+    modules.sort(reverse=True)
+    return total_us / 1000, modules
+
+
+def measure_first_paint(env: dict, work_dir: str) -> float:
+    """Return milliseconds from process start to the first paint of the main window"""
+    completed = subprocess.run(
+        [sys.executable, "-c", _FIRST_PAINT_SCRIPT],
+        env=env,
+        cwd=work_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+    )
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        env = _child_env(work_dir)
+        import_times = []
+        modules = []
+        for _ in range(args.runs):
+            total_ms, modules = measure_import_time(env)
+            import_times.append(total_ms)
+
+        started = time.perf_counter()
+        paint_times = [measure_first_paint(env, work_dir) for _ in range(args.runs)]
+        wall_ms = (time.perf_counter() - started) * 1000 / args.runs
+
+    results = {
+        "import_ms": statistics.median(import_times),
+        "first_paint_ms": statistics.median(paint_times),
+        "process_wall_ms": round(wall_ms, 1),
+        "slowest_imports": modules[: args.top],
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+    else:
+        print(f"import {ROOT_MODULE}: {results['import_ms']:.1f} ms (median)")
+        print(f"first paint:   {results['first_paint_ms']:.1f} ms (median)")
+        print(f"process wall:  {results['process_wall_ms']:.1f} ms (mean)")
+        print("slowest imports (cumulative):")
+        for cumulative_ms, name in results["slowest_imports"]:
+            print(f"  {cumulative_ms:8.1f} ms  {name}")
+
+    if args.budget_ms is not None and results["import_ms"] > args.budget_ms:
+        print(
+            f"import time budget exceeded: {results['import_ms']:.1f} ms"
+            f" > {args.budget_ms:.1f} ms",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""Benchmark suite of the scene and storage hot paths
+
+Measures, for diagrams of every size, saving and loading a project with
+ProjectStorageImpl, building a scene from a diagram and storing it back,
+switching between diagrams, pasting all elements of a diagram, dragging
+a line handle and a resize handle with synthetic mouse events, and
+exporting the project as SVG and PNG images. The main window runs on the
+offscreen platform with empty settings.
+
+    python benchmarks/bench_suite.py [--sizes N ...] [--runs N] [--cases NAME ...]
+                                     [--baseline PATH] [--save] [--tolerance F]
+
+A size is the number of grid cells of a diagram, an element and a line
+in each. Results are compared with the baseline file, and written to it
+with --save. The exit code is 1 if a result is slower than its baseline
+by more than the tolerance, e.g. 0.25 for 25%.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QPoint, Qt
+from PySide6.QtTest import QTest
+
+from umlayer import model
+from umlayer.composition_root import CompositionRoot
+from umlayer.gui import ClassElement, LineElement, ProjectExporter, Settings
+from umlayer.storage import ProjectStorageImpl
+
+from bench_render_cache import make_elements
+
+DEFAULT_BASELINE = os.path.join(REPO_DIR, "benchmarks", "baseline.json")
+# diagrams of a project saved, loaded and exported
+PROJECT_DIAGRAMS = 5
+# mouse moves of a drag
+DRAG_MOVES = 20
+
+
+def make_project(size: int) -> model.Project:
+    """Returns a project of diagrams of the size"""
+    root = model.Folder("Root")
+    project = model.Project.load_items([root])
+    for i in range(PROJECT_DIAGRAMS):
+        diagram = model.Diagram(f"Diagram {i}")
+        project.add(diagram, root.id)
+        project.storeDiagram(
+            diagram.id, [element.toJson() for element in make_elements(size)]
+        )
+    return project
+
+
+class Context:
+    """The main window, projects and temporary files shared by the cases"""
+
+    def __init__(self, main_window, work_dir: str) -> None:
+        self.main_window = main_window
+        self.work_dir = work_dir
+        self._projects: dict[int, model.Project] = {}
+        self._diagrams: dict[int, list[model.Diagram]] = {}
+
+    def project(self, size: int) -> model.Project:
+        """Returns a project of diagrams of the size, made on first use"""
+        if size not in self._projects:
+            self._projects[size] = make_project(size)
+        return self._projects[size]
+
+    def diagrams(self, size: int) -> list[model.Diagram]:
+        """Returns two diagrams of the size in the main window, made on first use"""
+        if size not in self._diagrams:
+            project = self.main_window.project
+            diagrams = []
+            for _ in range(2):
+                diagram = self.main_window.create_diagram(project.root.id)
+                project.storeDiagram(
+                    diagram.id,
+                    [element.toJson() for element in make_elements(size)],
+                )
+                diagrams.append(diagram)
+            self._diagrams[size] = diagrams
+        return self._diagrams[size]
+
+    def showDiagram(self, diagram: model.Diagram) -> None:
+        self.main_window.showDiagram(diagram.id)
+        assert self.main_window.scene_logic.currentDiagramId() == diagram.id
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.work_dir, name)
+
+
+def timed(function, *args) -> float:
+    """Returns milliseconds to call the function"""
+    started = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - started) * 1000
+
+
+def case_storage_save(context: Context, size: int) -> float:
+    project = context.project(size)
+    storage = ProjectStorageImpl()
+    try:
+        return timed(
+            storage.save,
+            project.walk_breadth_first(),
+            context.path(f"save-{size}.ulr"),
+            project.text_index.rows(),
+        )
+    finally:
+        storage.close()
+
+
+def case_storage_load(context: Context, size: int) -> float:
+    filepath = context.path(f"load-{size}.ulr")
+    if not os.path.exists(filepath):
+        project = context.project(size)
+        storage = ProjectStorageImpl()
+        storage.save(project.walk_breadth_first(), filepath)
+        storage.close()
+    storage = ProjectStorageImpl()
+    try:
+        return timed(lambda: list(storage.load(filepath)))
+    finally:
+        storage.close()
+
+
+def case_scene_build(context: Context, size: int) -> float:
+    diagram = context.diagrams(size)[0]
+    context.showDiagram(diagram)
+    scene_logic = context.main_window.scene_logic
+    context.main_window.scene.clearElements()
+    return timed(scene_logic.buildSceneFrom, diagram)
+
+
+def case_scene_store(context: Context, size: int) -> float:
+    diagram = context.diagrams(size)[0]
+    context.showDiagram(diagram)
+    return timed(context.main_window.scene_logic.storeSceneTo, diagram)
+
+
+def case_diagram_switch(context: Context, size: int) -> float:
+    diagram, other_diagram = context.diagrams(size)[:2]
+    context.showDiagram(other_diagram)
+    return timed(context.showDiagram, diagram)
+
+
+def case_paste(context: Context, size: int) -> float:
+    context.showDiagram(context.diagrams(size)[0])
+    scene_logic = context.main_window.scene_logic
+    scene_logic.selectAllElements()
+    scene_logic.copy_selected_elements()
+    elapsed = timed(scene_logic.paste_elements)
+    context.main_window.undo_stack.undo()
+    return elapsed
+
+
+def drag(context: Context, item, moves: int) -> float:
+    """Returns milliseconds per frame of dragging the item to the bottom right"""
+    view = context.main_window.sceneView
+    viewport = view.viewport()
+    view.centerOn(item)
+    start = view.mapFromScene(item.scenePos())
+    QTest.mousePress(viewport, Qt.LeftButton, Qt.NoModifier, start)
+    started = time.perf_counter()
+    for i in range(1, moves + 1):
+        # every move crosses a grid block
+        position = start + QPoint(i * Settings.BLOCK_SIZE, i * Settings.BLOCK_SIZE)
+        QTest.mouseMove(viewport, position)
+        viewport.repaint()
+    elapsed = (time.perf_counter() - started) * 1000 / moves
+    QTest.mouseRelease(viewport, Qt.LeftButton, Qt.NoModifier, position)
+    context.main_window.undo_stack.undo()
+    return elapsed
+
+
+def case_line_drag(context: Context, size: int) -> float:
+    context.showDiagram(context.diagrams(size)[0])
+    scene = context.main_window.scene
+    line = next(
+        element for element in scene.elements() if isinstance(element, LineElement)
+    )
+    scene.deselectAll()
+    line.setSelected(True)
+    return drag(context, line._handler.handle[2], DRAG_MOVES)
+
+
+def case_resize_drag(context: Context, size: int) -> float:
+    context.showDiagram(context.diagrams(size)[0])
+    scene = context.main_window.scene
+    element = next(
+        element for element in scene.elements() if isinstance(element, ClassElement)
+    )
+    scene.deselectAll()
+    element.setSelected(True)
+    # the bottom right handle
+    return drag(context, element._handler.handle[3], DRAG_MOVES)
+
+
+def export(context: Context, size: int, extension: str) -> float:
+    # a new directory, so that no image is taken from the export cache
+    directory = tempfile.mkdtemp(dir=context.work_dir)
+    exporter = ProjectExporter(context.project(size), context.main_window)
+    return timed(exporter.export, directory, extension)
+
+
+def case_export_svg(context: Context, size: int) -> float:
+    return export(context, size, "svg")
+
+
+def case_export_png(context: Context, size: int) -> float:
+    return export(context, size, "png")
+
+
+CASES = {
+    name[len("case_") :]: function
+    for name, function in globals().items()
+    if name.startswith("case_")
+}
+
+
+def run(context: Context, cases: list[str], sizes: list[int], runs: int) -> dict:
+    """Returns the median milliseconds of every case by size"""
+    results = {}
+    for name in cases:
+        results[name] = {}
+        for size in sizes:
+            times = [CASES[name](context, size) for _ in range(runs)]
+            results[name][str(size)] = round(statistics.median(times), 2)
+    return results
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Returns the cases and sizes slower than the baseline by more than the tolerance"""
+    return [
+        f"{name} {size}"
+        for name, by_size in results.items()
+        for size, elapsed in by_size.items()
+        if baseline.get(name, {}).get(size)
+        and elapsed / baseline[name][size] - 1 > tolerance
+    ]
+
+
+def print_results(results: dict, baseline: dict) -> None:
+    for name, by_size in results.items():
+        for size, elapsed in by_size.items():
+            line = f"{name:>15} {size:>6}: {elapsed:9.2f} ms"
+            base = baseline.get(name, {}).get(size)
+            if base:
+                line += f"  baseline {base:9.2f} ms  {elapsed / base - 1:+7.1%}"
+            print(line)
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as baseline_file:
+            return json.load(baseline_file)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: str, results: dict) -> None:
+    """Merges the results into the baseline file"""
+    baseline = load_baseline(path)
+    for name, by_size in results.items():
+        baseline.setdefault(name, {}).update(by_size)
+    data = {
+        "machine": platform.platform(),
+        "python": platform.python_version(),
+        "results": baseline,
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(data, baseline_file, indent=1, sort_keys=True)
+        baseline_file.write("\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="save results as baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    # keep user settings and logs untouched
+    work_dir = tempfile.TemporaryDirectory()
+    os.environ["XDG_CONFIG_HOME"] = work_dir.name
+
+    composer = CompositionRoot()
+    composer.compose()
+    app = composer.app
+    main_window = composer.main_window
+    main_window.initialize()
+    main_window.resize(1280, 800)
+    main_window.show()
+    app.processEvents()
+    main_window.createNewProject()
+
+    context = Context(main_window, work_dir.name)
+    results = run(context, args.cases, args.sizes, args.runs)
+
+    baseline = load_baseline(args.baseline)
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if args.json:
+        print(json.dumps({"results": results, "regressions": regressions}, indent=1))
+    else:
+        print_results(results, baseline)
+    if args.save:
+        save_baseline(args.baseline, results)
+
+    main_window.setDirty(False)
+    del app
+    work_dir.cleanup()
+    if regressions and not args.save:
+        print(f"slower than the baseline: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
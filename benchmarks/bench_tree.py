@@ -0,0 +1,120 @@
+"""Project tree benchmark
+
+Measures building the rows of a folder with many children in the project
+tree model, which creates them in tree order, and sorting them again
+in the proxy model by the precomputed sort keys. Runs on the offscreen
+platform.
+
+    python benchmarks/bench_tree.py [--sizes N ...] [--runs N] [--reference]
+
+With --reference, sorting is also measured with a proxy model
+that compares rows in Python, as the tree did before sort keys.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QModelIndex, QSortFilterProxyModel, Qt
+from PySide6.QtWidgets import QApplication
+
+from umlayer import adapters, model
+
+
+class PythonSortModel(QSortFilterProxyModel):
+    """Compares rows in Python, like the tree did before sort keys"""
+
+    def lessThan(self, left: QModelIndex, right: QModelIndex):
+        left_type_value = left.data(adapters.ItemRoles.TypeRole).value
+        right_type_value = right.data(adapters.ItemRoles.TypeRole).value
+        if left_type_value != right_type_value:
+            return left_type_value < right_type_value
+        return (
+            left.data(adapters.ItemRoles.NameRole).casefold()
+            < right.data(adapters.ItemRoles.NameRole).casefold()
+        )
+
+
+def make_project(size: int) -> model.Project:
+    """Returns a project whose root has size children, one in ten a folder"""
+    root = model.Folder("Root")
+    project_items = [root]
+    for i in range(size):
+        item_class = model.Folder if i % 10 == 0 else model.Diagram
+        # names in an order unrelated to the creation order
+        project_items.append(item_class(f"Item {i * 7919 % size}", parent_id=root.id))
+    return model.Project.load_items(project_items)
+
+
+def measure(project: model.Project, proxy_class) -> tuple[float, float]:
+    """Returns milliseconds to build all rows of the root and to sort them"""
+    item_model = adapters.ProjectTreeModel()
+    proxy_model = proxy_class()
+    proxy_model.setSourceModel(item_model)
+
+    started = time.perf_counter()
+    item_model.initializeFromProject(project)
+    root_index = item_model.rootIndex()
+    while item_model.canFetchMore(root_index):
+        item_model.fetchMore(root_index)
+    proxy_model.index(0, 0)  # let the proxy map the rows
+    built = time.perf_counter()
+    proxy_model.sort(0, Qt.SortOrder.AscendingOrder)
+    proxy_root_index = proxy_model.index(0, 0)
+    proxy_model.index(0, 0, proxy_root_index)
+    sorted_ = time.perf_counter()
+
+    assert item_model.rowCount(root_index) == project.count() - 1
+    sort_keys = [
+        item_model.index(row, 0, root_index).data(adapters.ItemRoles.SortKeyRole)
+        for row in range(item_model.rowCount(root_index))
+    ]
+    assert sort_keys == sorted(sort_keys)
+    return (built - started) * 1000, (sorted_ - built) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--reference", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+
+    results = {}
+    for size in args.sizes:
+        project = make_project(size)
+        timings = [measure(project, adapters.TreeSortModel) for _ in range(args.runs)]
+        result = {
+            "build_ms": round(statistics.median(t[0] for t in timings), 1),
+            "sort_ms": round(statistics.median(t[1] for t in timings), 1),
+        }
+        if args.reference:
+            result["python_sort_ms"] = round(measure(project, PythonSortModel)[1], 1)
+        results[size] = result
+
+    if args.json:
+        print(json.dumps(results, indent=1))
+    else:
+        for size, result in results.items():
+            line = f"{size:>8} rows: build {result['build_ms']:8.1f} ms"
+            line += f"  sort {result['sort_ms']:8.1f} ms"
+            if "python_sort_ms" in result:
+                line += f"  (Python lessThan {result['python_sort_ms']:.1f} ms)"
+            print(line)
+
+    del app
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from umlayer import gui, model, usecases
+
+
+class MainWindowTestCase(unittest.TestCase):
+    """Opens a new diagram of a new project in the main window"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        data_model = model.DataModel()
+        storage = usecases.LazyProjectStorage(lambda: None)
+        interactors = usecases.Interactors(
+            data_model, usecases.ProjectInteractor(data_model, storage)
+        )
+        self.window = gui.MainWindow(gui.SceneLogic(), data_model, interactors)
+        interactors.set_window(self.window)
+        self.window.initialize()
+        # the window creates the project once its events are processed
+        self.app.processEvents()
+        self.project = self.window.project
+        self.diagram = self.window.create_diagram(self.project.root.id)
+        self.window.showDiagram(self.diagram.id)
+
+    def tearDown(self):
+        self.window.deleteLater()
+
+    def element_ids(self):
+        return sorted(element.elementId() for element in self.window.scene.elements())
+
+    def select_root(self):
+        """Selects the root folder, which stores the open diagram"""
+        self.window.treeView.setCurrentIndex(
+            self.window.treeView.proxyIndexFromId(self.project.root.id)
+        )
@@ -0,0 +1,35 @@
+import unittest
+
+from tests.main_window_case import MainWindowTestCase
+
+
+class TestElementSearch(MainWindowTestCase):
+    def setUp(self):
+        super().setUp()
+        self.stored = []
+        scene_logic = self.window.scene_logic
+        store = scene_logic.storeSceneTo
+        scene_logic.storeSceneTo = lambda item: (self.stored.append(item), store(item))
+
+    def test_unsaved_changes_are_found(self):
+        self.window.scene_logic.addNoteElement()
+        self.assertEqual(1, len(self.window.searchElements("note")))
+
+        self.window.scene.elements()[0].setText("Payment")
+        self.assertEqual([], self.window.searchElements("note"))
+        self.assertEqual(1, len(self.window.searchElements("payment")))
+
+    def test_unchanged_scene_is_not_stored(self):
+        self.window.scene_logic.addNoteElement()
+        for query in ("n", "no", "not", "note"):
+            self.window.searchElements(query)
+        self.assertEqual([self.diagram], self.stored)
+
+        self.select_root()
+        self.window.showDiagram(self.diagram.id)
+        self.window.searchElements("note")
+        self.assertEqual([self.diagram], self.stored[1:])
+
+
+if __name__ == "__main__":
+    unittest.main()
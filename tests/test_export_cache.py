@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from umlayer import model, usecases
+
+
+class TestDiagramDigest(unittest.TestCase):
+    def setUp(self):
+        self.diagram = model.Diagram("Classes")
+        self.diagram.dtos = [
+            '{"class_name": "NoteElement", "x": 0.0, "y": 0.0, "text": "A"}',
+            '{"class_name": "NoteElement", "x": 10.0, "y": 0.0, "text": "B"}',
+        ]
+        self.settings = {"format": "svg"}
+
+    def test_digest_ignores_scroll_data(self):
+        digest = usecases.diagram_digest(self.diagram, self.settings)
+        self.diagram.scroll_data = [1, 2, 3, 4, 5, 6]
+        self.assertEqual(digest, usecases.diagram_digest(self.diagram, self.settings))
+
+    def test_digest_ignores_dto_order(self):
+        digest = usecases.diagram_digest(self.diagram, self.settings)
+        self.diagram.dtos.reverse()
+        self.assertEqual(digest, usecases.diagram_digest(self.diagram, self.settings))
+
+    def test_digest_depends_on_content_and_settings(self):
+        digest = usecases.diagram_digest(self.diagram, self.settings)
+        self.assertNotEqual(
+            digest, usecases.diagram_digest(self.diagram, {"format": "png"})
+        )
+        self.diagram.dtos[0] = self.diagram.dtos[0].replace('"A"', '"C"')
+        self.assertNotEqual(
+            digest, usecases.diagram_digest(self.diagram, self.settings)
+        )
+
+
+class TestExportManifest(unittest.TestCase):
+    def test_manifest_round_trip(self):
+        diagram = model.Diagram()
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = usecases.ExportManifest(directory)
+            manifest.load()
+            self.assertFalse(manifest.is_fresh(diagram.id, "hash", "a.svg"))
+
+            with open(os.path.join(directory, "a.svg"), "w") as image_file:
+                image_file.write("<svg/>")
+            manifest.update(diagram.id, "hash", "a.svg")
+            manifest.save()
+
+            manifest = usecases.ExportManifest(directory)
+            manifest.load()
+            self.assertTrue(manifest.is_fresh(diagram.id, "hash", "a.svg"))
+            self.assertFalse(manifest.is_fresh(diagram.id, "other", "a.svg"))
+
+            manifest.retain([])
+            self.assertFalse(manifest.is_fresh(diagram.id, "hash", "a.svg"))
+
+    def test_missing_image_is_not_fresh(self):
+        diagram = model.Diagram()
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = usecases.ExportManifest(directory)
+            manifest.update(diagram.id, "hash", "a.svg")
+            self.assertFalse(manifest.is_fresh(diagram.id, "hash", "a.svg"))
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+
+from umlayer import generator, model, storage
+
+
+class TestRange(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(generator.Range(5, 5), generator.Range.parse("5"))
+        self.assertEqual(generator.Range(1, 4), generator.Range.parse("1-4"))
+        with self.assertRaises(ValueError):
+            generator.Range.parse("4-1")
+
+
+class TestProjectGenerator(unittest.TestCase):
+    def test_same_seed_same_project(self):
+        first = generator.ProjectGenerator(seed=7, diagrams=3).generate()
+        second = generator.ProjectGenerator(seed=7, diagrams=3).generate()
+        other = generator.ProjectGenerator(seed=8, diagrams=3).generate()
+        self.assertEqual(
+            [(item.id, getattr(item, "dtos", None)) for item in first.project_items],
+            [(item.id, getattr(item, "dtos", None)) for item in second.project_items],
+        )
+        self.assertNotEqual(
+            [item.id for item in first.project_items],
+            [item.id for item in other.project_items],
+        )
+
+    def test_structure(self):
+        generated = generator.ProjectGenerator(
+            depth=2,
+            fan_out=2,
+            diagrams=5,
+            elements=generator.Range(10, 20),
+            mix={"ClassElement": 1, "LineElement": 1},
+        ).generate()
+        project = model.Project.load_items(generated.project_items)
+        item_types = [item.itemType for item in generated.project_items]
+        self.assertEqual(1 + 2 + 4, item_types.count(model.ProjectItemType.FOLDER))
+        self.assertEqual(5, item_types.count(model.ProjectItemType.DIAGRAM))
+
+        diagrams = [
+            item
+            for item in project.project_items.values()
+            if item.itemType == model.ProjectItemType.DIAGRAM
+        ]
+        class_names = set()
+        for diagram in diagrams:
+            self.assertTrue(10 <= len(diagram.dtos) <= 20)
+            class_names.update(json.loads(dto)["class_name"] for dto in diagram.dtos)
+        self.assertEqual({"ClassElement", "LineElement"}, class_names)
+        self.assertEqual(
+            sum(len(diagram.dtos) for diagram in diagrams), len(generated.texts)
+        )
+
+    def test_unknown_element(self):
+        with self.assertRaises(ValueError):
+            generator.ProjectGenerator(mix={"SquareElement": 1})
+
+    def test_main_writes_project(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "generated.ulr")
+            generator.main(
+                [filepath, "--diagrams", "2", "--elements", "5", "--depth", "1"]
+            )
+            store = storage.ProjectStorageImpl()
+            try:
+                project_items = list(store.load(filepath))
+                texts = store.load_texts(filepath)
+            finally:
+                store.close()
+        self.assertEqual(1 + 3 + 2, len(project_items))
+        self.assertEqual(10, len(texts))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from PySide6.QtCore import QPoint, QPointF, Qt
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QGraphicsItem
+
+from tests.main_window_case import MainWindowTestCase
+
+
+def sends_geometry_changes(item: QGraphicsItem) -> bool:
+    return bool(item.flags() & QGraphicsItem.ItemSendsGeometryChanges)
+
+
+class TestGroupMove(MainWindowTestCase):
+    def setUp(self):
+        super().setUp()
+        self.window.resize(1000, 700)
+        self.window.show()
+        self.app.processEvents()
+        scene_logic = self.window.scene_logic
+        scene_logic.addNoteElement()
+        self.note = self.window.scene.selectedElements()[0]
+        scene_logic.addLine("")
+        self.line = self.window.scene.selectedElements()[0]
+        self.note.setPos(QPointF(100, 100))
+        self.line.setPos(QPointF(100, 300))
+        self.window.scene.deselectAll()
+
+    def drag(self, scene_position: QPointF, moves: list[QPoint]) -> None:
+        """Drags the item at the position through the offsets from it"""
+        view = self.window.sceneView
+        viewport = view.viewport()
+        start = view.mapFromScene(scene_position)
+        QTest.mousePress(viewport, Qt.LeftButton, Qt.NoModifier, start)
+        for offset in moves:
+            QTest.mouseMove(viewport, start + offset)
+        QTest.mouseRelease(viewport, Qt.LeftButton, Qt.NoModifier, start + moves[-1])
+
+    def line_handle_positions(self):
+        handles = self.line._handler.handle
+        return [handles[1].pos(), handles[2].pos()]
+
+    def test_selected_elements_move_together(self):
+        self.window.scene_logic.selectAllElements()
+        commands = len(self.window.undo_stack)
+        self.drag(
+            self.note.sceneBoundingRect().center(),
+            [QPoint(7, 11), QPoint(14, 22), QPoint(21, 33)],
+        )
+
+        # the delta of the dragged element is snapped once for all elements
+        self.assertEqual(QPointF(120, 130), self.note.pos())
+        self.assertEqual(QPointF(120, 330), self.line.pos())
+        self.assertEqual(QPointF(120, 330), self.line.point1())
+        self.assertEqual(QPointF(220, 330), self.line.point2())
+        self.assertEqual(
+            [self.line.point1(), self.line.point2()], self.line_handle_positions()
+        )
+
+        for item in [self.note, self.line, *self.line._handler.handle.values()]:
+            self.assertTrue(sends_geometry_changes(item))
+        self.assertEqual(commands + 1, len(self.window.undo_stack))
+        self.assertEqual("Move elements", self.window.undo_stack.undo_text())
+
+        self.window.undo()
+        self.assertEqual(QPointF(100, 100), self.note.pos())
+        self.assertEqual(QPointF(100, 300), self.line.pos())
+
+    def test_handle_of_unselected_element_resizes_it(self):
+        self.line.setSelected(True)
+        handle = self.note._handler.handle[3]
+        handle.setSelected(True)
+        delta_x, delta_y = self.note.deltaX(), self.note.deltaY()
+
+        self.drag(handle.scenePos(), [QPoint(10, 10), QPoint(20, 20), QPoint(30, 30)])
+        self.assertEqual(QPointF(100, 100), self.note.pos())
+        self.assertEqual(delta_x + 30, self.note.deltaX())
+        self.assertEqual(delta_y + 30, self.note.deltaY())
+
+
+if __name__ == "__main__":
+    unittest.main()
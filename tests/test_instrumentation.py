@@ -0,0 +1,65 @@
+import unittest
+
+from umlayer import instrumentation
+
+
+class Counter:
+    def increment(self, step=1):
+        self.value = getattr(self, "value", 0) + step
+        return self.value
+
+    def steps(self, count):
+        yield from range(count)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        instrumentation.instrument(
+            Counter, increment="test increment", steps="test steps"
+        )
+        instrumentation.reset()
+
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_disabled_functions_are_original(self):
+        increment = Counter.__dict__["increment"]
+        instrumentation.enable()
+        self.assertIsNot(increment, Counter.__dict__["increment"])
+        instrumentation.disable()
+        self.assertIs(increment, Counter.__dict__["increment"])
+
+    def test_calls_are_counted_while_enabled(self):
+        counter = Counter()
+        counter.increment()
+        instrumentation.enable()
+        self.assertEqual(2, counter.increment())
+        self.assertEqual(4, counter.increment(step=2))
+        instrumentation.disable()
+        counter.increment()
+        sample = instrumentation.snapshot()["test increment"]
+        self.assertEqual(2, sample.calls)
+        self.assertGreater(sample.seconds, 0)
+
+    def test_generator_is_counted_once(self):
+        instrumentation.enable()
+        self.assertEqual([0, 1, 2], list(Counter().steps(3)))
+        self.assertEqual(1, instrumentation.snapshot()["test steps"].calls)
+
+    def test_measured(self):
+        @instrumentation.measured("test measured")
+        def double(value):
+            return 2 * value
+
+        self.assertEqual(2, double(1))
+        instrumentation.enable()
+        self.assertEqual(4, double(2))
+        self.assertEqual(1, instrumentation.snapshot()["test measured"].calls)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(ValueError):
+            instrumentation.instrument(Counter, decrement="test decrement")
+
+
+if __name__ == "__main__":
+    unittest.main()
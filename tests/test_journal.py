@@ -0,0 +1,132 @@
+import json
+import unittest
+
+from umlayer import model, usecases
+from umlayer.model import journal
+
+
+def element_dto(element_id, text):
+    return json.dumps({"id": element_id, "text": text})
+
+
+class TestReplayJournal(unittest.TestCase):
+    def setUp(self):
+        self.project = model.Project()
+        self.root = model.Folder("Root")
+        self.project.setRoot(self.root)
+        self.diagram = model.Diagram("Diagram")
+        self.project.add(self.diagram, self.root.id)
+        self.project.storeDiagram(
+            self.diagram.id, [element_dto("a", "first"), element_dto("b", "second")]
+        )
+
+    def texts(self):
+        return [json.loads(dto)["text"] for dto in self.diagram.dtos]
+
+    def change(self, changes):
+        return model.JournalRecord(journal.CHANGE_ELEMENTS, self.diagram.id, changes)
+
+    def test_element_changes(self):
+        records = [
+            self.change(
+                {"a": element_dto("a", "changed"), "c": element_dto("c", "new")}
+            ),
+            self.change({"b": None}),
+            self.change({"c": element_dto("c", "newer")}),
+        ]
+        self.assertEqual(3, model.replay_journal(self.project, records))
+        self.assertEqual(["changed", "newer"], self.texts())
+        self.assertEqual(
+            [self.diagram.id],
+            [m.diagram_id for m in self.project.text_index.search("newer")],
+        )
+
+    def test_elements_without_ids(self):
+        self.project.storeDiagram(
+            self.diagram.id, [json.dumps({"text": "old"}), json.dumps({"text": "kept"})]
+        )
+        element_id = model.stored_element_id(self.diagram.id, 0)
+        model.replay_journal(
+            self.project, [self.change({element_id: element_dto(element_id, "new")})]
+        )
+        self.assertEqual(["new", "kept"], self.texts())
+
+    def test_tree_changes(self):
+        folder = model.Folder("Folder", parent_id=self.root.id)
+        records = [
+            model.JournalRecord(journal.ADD_ITEM, folder.id, folder),
+            model.JournalRecord(journal.RENAME_ITEM, folder.id, "Renamed"),
+            model.JournalRecord(journal.MOVE_ITEM, self.diagram.id, folder.id),
+        ]
+        model.replay_journal(self.project, records)
+        self.assertEqual("Renamed", self.project.get(folder.id).name())
+        self.assertEqual({self.diagram}, self.project.children(folder.id))
+
+    def test_records_that_do_not_apply_are_skipped(self):
+        records = [
+            self.change({"a": element_dto("a", "changed")}),
+            model.JournalRecord(journal.REMOVE_ITEM, self.diagram.id),
+            self.change({"b": None}),
+            model.JournalRecord(journal.RENAME_ITEM, self.diagram.id, "Renamed"),
+        ]
+        self.assertEqual(4, model.replay_journal(self.project, records))
+        self.assertIsNone(self.project.get(self.diagram.id))
+        self.assertEqual(1, self.project.count())
+
+
+class RecordingStorage(usecases.ProjectStorage):
+    def __init__(self):
+        self.records = []
+        self.cleared = False
+
+    def save(self, project_items, filename=None, texts=None):
+        pass
+
+    def load(self, filename=None, read_only=False, progress=None):
+        return []
+
+    def append_journal(self, records, filename=None):
+        self.records.extend(records)
+
+    def clear_journal(self, filename=None):
+        self.cleared = True
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.project = model.Project()
+        self.root = model.Folder("Root")
+        self.project.setRoot(self.root)
+        self.storage = RecordingStorage()
+        self.journal = usecases.Journal(self.storage)
+
+    def test_records_are_written_on_flush(self):
+        self.journal.start(self.project, "project.ulr")
+        folder = model.Folder("Folder")
+        self.project.add(folder, self.root.id)
+        self.project.rename(folder.id, "Renamed")
+        self.journal.record_element_changes(folder.id, {"a": None})
+        self.journal.flush()
+        self.project.remove(folder.id)
+        self.journal.stop()
+
+        self.assertEqual(
+            [journal.ADD_ITEM, journal.RENAME_ITEM, journal.CHANGE_ELEMENTS],
+            [record.operation for record in self.storage.records],
+        )
+        # the added item is recorded as it was added
+        self.assertEqual("Folder", self.storage.records[0].value.name())
+
+    def test_stopped_journal_records_nothing(self):
+        self.journal.start(self.project, "project.ulr")
+        self.journal.stop()
+        self.project.add(model.Folder("Folder"), self.root.id)
+        self.journal.record_element_changes(self.root.id, {"a": None})
+        self.journal.flush()
+        self.assertEqual([], self.storage.records)
+
+    def test_discard(self):
+        self.journal.start(self.project, "project.ulr")
+        self.journal.discard()
+        self.assertTrue(self.storage.cleared)
+        self.assertFalse(self.journal.is_started())
@@ -0,0 +1,43 @@
+import logging
+import os
+import tempfile
+import unittest
+
+from umlayer import logging_setup
+
+
+class TestLogLevels(unittest.TestCase):
+    def test_parse_levels(self):
+        levels = logging_setup.parse_levels("storage=DEBUG, scene=warning,INFO")
+        self.assertEqual(
+            {"storage": logging.DEBUG, "scene": logging.WARNING, "root": logging.INFO},
+            levels,
+        )
+
+    def test_parse_levels_ignores_unknown_names(self):
+        self.assertEqual({}, logging_setup.parse_levels("gui=DEBUG,storage=LOUD"))
+        self.assertEqual({}, logging_setup.parse_levels(""))
+
+
+class TestQueueLogging(unittest.TestCase):
+    def tearDown(self):
+        logging_setup.shutdown_logging()
+        logging_setup.apply_levels({})
+
+    def test_records_are_written_by_listener(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "test.log")
+            logging_setup.init_logging(
+                {"root": logging.WARNING, "storage": logging.DEBUG}, filename
+            )
+            logging.getLogger("umlayer.storage.project_storage_impl").debug("saved")
+            logging.getLogger("umlayer.gui.scene_logic").info("scene stored")
+            logging.getLogger("umlayer.gui.scene_logic").warning("scene warning")
+            logging_setup.shutdown_logging()
+
+            with open(filename, encoding="utf-8") as log_file:
+                content = log_file.read()
+
+        self.assertIn("saved", content)
+        self.assertIn("scene warning", content)
+        self.assertNotIn("scene stored", content)
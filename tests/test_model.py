@@ -43,3 +43,16 @@ class TestDiagram(unittest.TestCase):
 
     def test_repository(self):
         store = storage.ProjectStorageImpl()
+
+
+class TestUtils(unittest.TestCase):
+    def test_window_title(self):
+        self.assertEqual("UMLayer", model.utils.build_window_title(None, False))
+        self.assertEqual(
+            "project * \u2014 UMLayer",
+            model.utils.build_window_title("project.ulr", True),
+        )
+        self.assertEqual(
+            "project [read-only] \u2014 UMLayer",
+            model.utils.build_window_title("project.ulr", False, read_only=True),
+        )
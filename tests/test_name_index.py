@@ -0,0 +1,77 @@
+import unittest
+import uuid
+
+from umlayer import model
+
+
+class TestNameKeys(unittest.TestCase):
+    def test_name_keys(self):
+        self.assertEqual(
+            ["order service2", "service2", "2"],
+            model.name_index.name_keys("Order  Service2"),
+        )
+        self.assertEqual(
+            ["httpserver", "server"], model.name_index.name_keys("HTTPServer")
+        )
+
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = model.NameIndex()
+        self.order = uuid.uuid4()
+        self.order_service = uuid.uuid4()
+        self.customer = uuid.uuid4()
+        self.index.load(
+            [
+                (self.order, "Order"),
+                (self.order_service, "OrderService"),
+                (self.customer, "Customer orders"),
+            ]
+        )
+
+    def test_find(self):
+        self.assertEqual(
+            {self.order, self.order_service, self.customer}, self.index.find("ORD")
+        )
+        self.assertEqual({self.order_service}, self.index.find("serv"))
+        self.assertEqual({self.customer}, self.index.find(" customer  ord"))
+        self.assertEqual(set(), self.index.find("rder"))
+
+    def test_find_while_typing(self):
+        found = [self.index.find(query) for query in ["o", "or", "orders", "order"]]
+        self.assertEqual(
+            [
+                {self.order, self.order_service, self.customer},
+                {self.order, self.order_service, self.customer},
+                {self.order_service, self.customer},
+                {self.order, self.order_service, self.customer},
+            ],
+            found,
+        )
+
+    def test_changes_reset_typing(self):
+        self.assertEqual(3, len(self.index.find("o")))
+        other = uuid.uuid4()
+        self.index.add(other, "Ordinal")
+        self.index.rename(self.order, "Invoice")
+        self.index.remove(self.customer)
+        self.assertEqual({self.order_service, other}, self.index.find("or"))
+        self.assertEqual(3, len(self.index))
+
+
+class TestProjectNameIndex(unittest.TestCase):
+    def test_project_keeps_index(self):
+        root = model.Folder("Root")
+        folder = model.Folder("Folder", parent_id=root.id)
+        diagram = model.Diagram("Diagram", parent_id=folder.id)
+        project = model.Project.load_items([root, folder, diagram])
+        self.assertEqual({diagram.id}, project.name_index.find("diag"))
+
+        project.rename(diagram.id, "Classes")
+        other = model.Diagram("Class names")
+        project.add(other, root.id)
+        self.assertEqual({diagram.id, other.id}, project.name_index.find("class"))
+
+        project.remove(folder.id)
+        self.assertEqual({other.id}, project.name_index.find("class"))
+        self.assertEqual(set(), project.name_index.find("folder"))
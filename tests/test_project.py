@@ -0,0 +1,183 @@
+import unittest
+
+from umlayer import model
+
+
+def make_tree():
+    """Returns items of a small tree, children before their parents"""
+    root = model.Folder("Root")
+    folder = model.Folder("Folder", parent_id=root.id)
+    diagram = model.Diagram("Diagram", parent_id=folder.id)
+    return [diagram, folder, root]
+
+
+class TestProjectLoadItems(unittest.TestCase):
+    def test_load_items(self):
+        diagram, folder, root = make_tree()
+        project = model.Project.load_items([diagram, folder, root])
+
+        self.assertIs(root, project.root)
+        self.assertEqual(3, project.count())
+        self.assertEqual({folder}, project.children(root.id))
+        self.assertEqual({diagram}, project.children(folder.id))
+        self.assertFalse(project.dirty())
+
+    def test_loaded_project_is_editable(self):
+        diagram, folder, root = make_tree()
+        project = model.Project.load_items([diagram, folder, root])
+
+        project.add(model.Diagram("Other"), root.id)
+        self.assertEqual(2, len(project.children(root.id)))
+        project.remove(folder.id)
+        self.assertIsNone(project.get(diagram.id))
+        self.assertEqual(2, project.count())
+
+    def test_orphan_is_rejected(self):
+        diagram, folder, root = make_tree()
+        with self.assertRaises(ValueError):
+            model.Project.load_items([diagram, root])
+
+    def test_cycle_is_rejected(self):
+        diagram, folder, root = make_tree()
+        other = model.Folder("Other", parent_id=diagram.id)
+        diagram.parent_id = other.id
+        with self.assertRaises(ValueError):
+            model.Project.load_items([diagram, other, folder, root])
+
+    def test_two_roots_are_rejected(self):
+        with self.assertRaises(ValueError):
+            model.Project.load_items(make_tree() + [model.Folder("Root 2")])
+
+
+class RecordingObserver(model.ProjectObserver):
+    def __init__(self):
+        self.events = []
+
+    def onItemAdded(self, project_item):
+        self.events.append(("added", project_item.name()))
+
+    def onItemRemoved(self, project_item):
+        self.events.append(("removed", project_item.name()))
+
+    def onItemRenamed(self, project_item):
+        self.events.append(("renamed", project_item.name()))
+
+    def onItemMoved(self, project_item, old_parent_id):
+        self.events.append(("moved", project_item.name()))
+
+
+class TestProjectObserver(unittest.TestCase):
+    def setUp(self):
+        self.diagram, self.folder, self.root = make_tree()
+        self.project = model.Project.load_items([self.diagram, self.folder, self.root])
+        self.observer = RecordingObserver()
+        self.project.subscribe(self.observer)
+
+    def test_events(self):
+        other = model.Folder("Other")
+        self.project.add(other, self.root.id)
+        self.project.rename(other.id, "Renamed")
+        self.project.rename(other.id, "Renamed")
+        self.project.move(self.diagram.id, other.id)
+        self.project.remove(self.folder.id)
+        self.assertEqual(
+            [
+                ("added", "Other"),
+                ("renamed", "Renamed"),
+                ("moved", "Diagram"),
+                ("removed", "Folder"),
+            ],
+            self.observer.events,
+        )
+        self.assertTrue(self.project.dirty())
+        self.assertEqual({self.diagram}, self.project.children(other.id))
+
+    def test_move_into_own_subtree_is_rejected(self):
+        with self.assertRaises(AttributeError):
+            self.project.move(self.folder.id, self.diagram.id)
+        with self.assertRaises(AttributeError):
+            self.project.move(self.root.id, self.folder.id)
+        self.assertEqual([], self.observer.events)
+
+    def test_unsubscribe(self):
+        self.project.unsubscribe(self.observer)
+        self.project.add(model.Folder("Other"), self.root.id)
+        self.assertEqual([], self.observer.events)
+
+
+class TestProjectTraversal(unittest.TestCase):
+    def setUp(self):
+        self.project = model.Project()
+        self.root = model.Folder("Root")
+        self.project.setRoot(self.root)
+        self.a = model.Folder("A")
+        self.b = model.Folder("B")
+        self.a1 = model.Diagram("A1")
+        self.project.add(self.a, self.root.id)
+        self.project.add(self.b, self.root.id)
+        self.project.add(self.a1, self.a.id)
+
+    def test_walk_depth_first(self):
+        self.assertEqual(
+            [self.root, self.a, self.a1, self.b],
+            list(self.project.walk_depth_first()),
+        )
+
+    def test_walk_breadth_first(self):
+        self.assertEqual(
+            [self.root, self.a, self.b, self.a1],
+            list(self.project.walk_breadth_first()),
+        )
+        self.assertEqual(
+            [self.a, self.a1], list(self.project.walk_breadth_first(self.a.id))
+        )
+
+    def test_descendants(self):
+        self.assertEqual([self.a1], list(self.project.descendants(self.a.id)))
+        self.assertEqual([], list(self.project.descendants(self.b.id)))
+
+    def test_deep_tree(self):
+        parent = self.b
+        for i in range(10000):
+            folder = model.Folder(f"Level {i}")
+            self.project.add(folder, parent.id)
+            parent = folder
+
+        self.assertEqual(10000, sum(1 for _ in self.project.descendants(self.b.id)))
+        model.Project.load_items(list(self.project.walk_breadth_first()))
+        self.project.remove(self.b.id)
+        self.assertEqual(3, self.project.count())
+
+
+class TestProjectStats(unittest.TestCase):
+    def test_counters(self):
+        diagram, folder, root = make_tree()
+        diagram.dtos = ['{"a": 1}']
+        project = model.Project.load_items([diagram, folder, root])
+        stats = project.stats
+        self.assertEqual(
+            (3, 2, 1, 1), (stats.items, stats.folders, stats.diagrams, stats.elements)
+        )
+        self.assertEqual(8, stats.payload_bytes)
+
+        other = model.Diagram("Other")
+        project.add(other, root.id)
+        project.storeDiagram(other.id, ['{"b": 2}', '{"c": "é"}'], None)
+        self.assertEqual(2, stats.diagram_elements(other.id))
+        self.assertEqual((4, 2, 3), (stats.items, stats.diagrams, stats.elements))
+        self.assertEqual(8 + 8 + 11, stats.payload_bytes)
+
+        project.storeDiagram(other.id, [], None)
+        self.assertEqual(1, stats.elements)
+
+        project.remove(folder.id)
+        self.assertEqual(
+            {
+                "items": 2,
+                "folders": 1,
+                "diagrams": 1,
+                "elements": 0,
+                "payload_bytes": 0,
+            },
+            stats.as_dict(),
+        )
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+
+from umlayer import model, storage, usecases
+
+
+class FakeWindow:
+    """Answers the dialogs of the interactor with the given file names"""
+
+    def __init__(self):
+        self.interactor: usecases.ProjectInteractor = None
+        self.save_filename = ""
+        self.open_filename = ""
+        self.errors = []
+
+    def getFileNameFromSaveDialog(self, caption):
+        return self.save_filename
+
+    def getFileNameFromOpenDialog(self, caption):
+        return self.open_filename
+
+    def askToSaveModifiedProject(self):
+        return model.constants.DISCARD
+
+    def showCriticalError(self, message):
+        self.errors.append(message)
+
+    def flushJournal(self):
+        self.interactor.flush_journal()
+
+    def showLoadingProgress(self, loaded, total):
+        pass
+
+    def storeScene(self):
+        pass
+
+    def updateTitle(self):
+        pass
+
+    def initializeTreeFromProject(self):
+        pass
+
+    def clearProjectTree(self):
+        pass
+
+    def disableScene(self):
+        pass
+
+
+class TestProjectInteractor(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data_model = model.DataModel()
+        self.storage = storage.ProjectStorageImpl()
+        self.interactor = usecases.ProjectInteractor(self.data_model, self.storage)
+        self.window = FakeWindow()
+        self.window.interactor = self.interactor
+        self.interactor.set_window(self.window)
+
+    def tearDown(self):
+        self.interactor.release_storage()
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def save_as(self, filename):
+        self.window.save_filename = filename
+        self.interactor.save_project_as()
+
+    def open(self, filename):
+        self.window.open_filename = filename
+        self.interactor.open_project()
+
+    def test_save_as_clears_journal_of_original_file(self):
+        self.interactor.create_new_project()
+        project = self.data_model.project
+        self.save_as(self.path("a.ulr"))
+        project.add(model.Folder("Folder"), project.root.id)
+        self.save_as(self.path("b.ulr"))
+        self.interactor.close_project()
+
+        self.assertEqual([], self.storage.load_journal(self.path("a.ulr")))
+        self.open(self.path("a.ulr"))
+        self.assertFalse(self.interactor.is_dirty())
+        self.assertEqual(2, len(self.data_model.project.project_items))
+
+    def test_save_after_save_as_keeps_file_open(self):
+        self.interactor.create_new_project()
+        project = self.data_model.project
+        self.save_as(self.path("a.ulr"))
+        project.add(model.Folder("Folder"), project.root.id)
+        self.save_as(self.path("b.ulr"))
+        engine = self.storage._engine
+
+        project.add(model.Folder("Other folder"), project.root.id)
+        self.assertTrue(self.interactor.save_project())
+        self.assertIs(engine, self.storage._engine)
+        loaded_items = list(self.storage.load(self.path("b.ulr")))
+        self.assertEqual(len(project.project_items), len(loaded_items))
+
+    def test_failed_save_does_not_restart_journal(self):
+        self.interactor.create_new_project()
+        self.save_as(self.path("a.ulr"))
+        self.assertTrue(self.interactor._journal.is_started())
+
+        directory = self.path("directory.ulr")
+        os.mkdir(directory)
+        self.save_as(directory)
+        self.assertEqual(["Unable to save project!"], self.window.errors)
+        self.assertFalse(self.interactor._journal.is_started())
+
+
+if __name__ == "__main__":
+    unittest.main()
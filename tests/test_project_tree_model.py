@@ -0,0 +1,245 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QModelIndex
+from PySide6.QtWidgets import QApplication
+
+from umlayer import adapters, model
+
+
+def make_project(folder_count, diagram_count):
+    root = model.Folder("Root")
+    project_items = [root]
+    for i in range(folder_count):
+        folder = model.Folder(f"Folder {i}", parent_id=root.id)
+        project_items.append(folder)
+        project_items.extend(
+            model.Diagram(f"Diagram {j}", parent_id=folder.id)
+            for j in range(diagram_count)
+        )
+    return model.Project.load_items(project_items)
+
+
+class TestProjectTreeModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.project = make_project(3, 5)
+        self.item_model = adapters.ProjectTreeModel()
+        self.item_model.initializeFromProject(self.project)
+
+    def test_rows_are_created_on_fetch(self):
+        root_index = self.item_model.rootIndex()
+        self.assertEqual(1, self.item_model.count())
+        self.assertTrue(self.item_model.hasChildren(root_index))
+        self.assertEqual(0, self.item_model.rowCount(root_index))
+
+        self.assertTrue(self.item_model.canFetchMore(root_index))
+        self.item_model.fetchMore(root_index)
+        self.assertFalse(self.item_model.canFetchMore(root_index))
+        self.assertEqual(3, self.item_model.rowCount(root_index))
+        self.assertEqual(4, self.item_model.count())
+
+        folder_index = self.item_model.index(0, 0, root_index)
+        self.assertEqual("Folder 0", folder_index.data())
+        self.assertEqual(root_index, self.item_model.parent(folder_index))
+        self.assertEqual(QModelIndex(), self.item_model.parent(root_index))
+
+    def test_index_from_id_fetches_ancestors(self):
+        diagram = next(
+            project_item
+            for project_item in self.project.project_items.values()
+            if project_item.name() == "Diagram 4"
+        )
+        index = self.item_model.indexFromId(diagram.id)
+        self.assertEqual(diagram.id, index.data(adapters.ItemRoles.IdRole))
+        self.assertEqual(
+            diagram.parent_id, index.parent().data(adapters.ItemRoles.IdRole)
+        )
+
+    def test_add_and_remove_item(self):
+        root_index = self.item_model.rootIndex()
+        diagram = model.Diagram("New diagram")
+        self.project.add(diagram, self.project.root.id)
+        # folders sort before the diagram, so their rows are fetched first
+        self.assertEqual(4, self.item_model.rowCount(root_index))
+        self.assertFalse(self.item_model.canFetchMore(root_index))
+        self.assertEqual("New diagram", self.item_model.index(3, 0, root_index).data())
+
+        folder_id = self.item_model.index(0, 0, root_index).data(
+            adapters.ItemRoles.IdRole
+        )
+        self.item_model.indexFromId(next(iter(self.project.children(folder_id))).id)
+        self.project.remove(folder_id)
+        self.assertEqual(3, self.item_model.rowCount(root_index))
+        self.assertEqual(4, self.item_model.count())
+        for row in range(3):
+            self.assertEqual(row, self.item_model.index(row, 0, root_index).row())
+
+    def test_rows_are_sorted(self):
+        root_index = self.item_model.rootIndex()
+        self.item_model.fetchMore(root_index)
+        folder_index = self.item_model.index(0, 0, root_index)
+        self.item_model.fetchMore(folder_index)
+
+        sort_keys = [
+            self.item_model.index(row, 0, folder_index).data(
+                adapters.ItemRoles.SortKeyRole
+            )
+            for row in range(self.item_model.rowCount(folder_index))
+        ]
+        self.assertEqual(sorted(sort_keys), sort_keys)
+
+    def test_renamed_row_is_moved(self):
+        item_model = adapters.ProjectTreeModel(self.project.rename)
+        item_model.initializeFromProject(self.project)
+        root_index = item_model.rootIndex()
+        item_model.fetchMore(root_index)
+
+        item_model.setData(item_model.index(0, 0, root_index), "folder 9")
+        names = [
+            item_model.index(row, 0, root_index).data()
+            for row in range(item_model.rowCount(root_index))
+        ]
+        self.assertEqual(["Folder 1", "Folder 2", "folder 9"], names)
+        for row in range(3):
+            item_id = item_model.index(row, 0, root_index).data(
+                adapters.ItemRoles.IdRole
+            )
+            self.assertEqual(row, item_model.indexFromId(item_id).row())
+
+    def test_renamed_rows_stay_sorted(self):
+        root_index = self.item_model.rootIndex()
+        self.item_model.fetchMore(root_index)
+        folder_index = self.item_model.index(0, 0, root_index)
+        self.item_model.fetchMore(folder_index)
+        diagram_ids = [
+            self.item_model.index(row, 0, folder_index).data(adapters.ItemRoles.IdRole)
+            for row in range(5)
+        ]
+
+        for diagram_id, name in zip(diagram_ids, ["D", "A", "Diagram 2", "B", "Z"]):
+            self.project.rename(diagram_id, name)
+        names = [self.item_model.index(row, 0, folder_index).data() for row in range(5)]
+        self.assertEqual(["A", "B", "D", "Diagram 2", "Z"], names)
+        for row in range(5):
+            index = self.item_model.index(row, 0, folder_index)
+            item_id = index.data(adapters.ItemRoles.IdRole)
+            self.assertEqual(row, self.item_model.indexFromId(item_id).row())
+
+    def test_moved_row(self):
+        root_index = self.item_model.rootIndex()
+        self.item_model.fetchMore(root_index)
+        folder_0_index = self.item_model.index(0, 0, root_index)
+        folder_1_index = self.item_model.index(1, 0, root_index)
+        self.item_model.fetchMore(folder_0_index)
+        folder_1_id = folder_1_index.data(adapters.ItemRoles.IdRole)
+
+        diagram_id = self.item_model.index(0, 0, folder_0_index).data(
+            adapters.ItemRoles.IdRole
+        )
+        self.project.move(diagram_id, folder_1_id)
+        self.assertEqual(4, self.item_model.rowCount(folder_0_index))
+        self.assertEqual(1, self.item_model.rowCount(folder_1_index))
+        self.assertTrue(self.item_model.canFetchMore(folder_1_index))
+
+        self.project.move(
+            folder_1_id,
+            self.item_model.index(0, 0, root_index).data(adapters.ItemRoles.IdRole),
+        )
+        self.assertEqual(2, self.item_model.rowCount(root_index))
+        index = self.item_model.indexFromId(diagram_id)
+        self.assertEqual(folder_1_id, index.parent().data(adapters.ItemRoles.IdRole))
+
+    def test_clear_unsubscribes(self):
+        self.item_model.clear()
+        self.project.add(model.Diagram(), self.project.root.id)
+        self.assertEqual(0, self.item_model.count())
+
+    def test_set_data_renames_item(self):
+        renamed = []
+
+        def rename(item_id, name):
+            renamed.append((item_id, name))
+            if name != "Rejected":
+                self.project.rename(item_id, name)
+
+        item_model = adapters.ProjectTreeModel(rename)
+        item_model.initializeFromProject(self.project)
+        self.assertTrue(item_model.setData(item_model.rootIndex(), "Top"))
+        self.assertEqual([(self.project.root.id, "Top")], renamed)
+        self.assertFalse(item_model.setData(item_model.rootIndex(), "Rejected"))
+        self.assertEqual("Top", self.project.root.name())
+
+    def test_set_data_without_rename(self):
+        self.assertFalse(self.item_model.setData(self.item_model.rootIndex(), "Top"))
+        self.assertEqual("Root", self.project.root.name())
+
+    def test_changed_items_not_fetched_yet(self):
+        root_index = self.item_model.rootIndex()
+        self.item_model.fetchMore(root_index)
+        folder_index = self.item_model.index(0, 0, root_index)
+        folder_id = folder_index.data(adapters.ItemRoles.IdRole)
+        diagrams = sorted(self.project.children(folder_id), key=adapters.sortKey)
+        # the first row is fetched, the other diagrams are pending
+        self.item_model._fetch(folder_index.internalPointer(), 1)
+        self.assertEqual(1, self.item_model.rowCount(folder_index))
+
+        self.project.rename(diagrams[4].id, "Diagram 0a")
+        self.project.remove(diagrams[4].id)
+        self.project.remove(diagrams[2].id)
+        self.item_model.fetchMore(folder_index)
+        names = [self.item_model.index(row, 0, folder_index).data() for row in range(3)]
+        self.assertEqual(["Diagram 0", "Diagram 1", "Diagram 3"], names)
+        self.assertFalse(self.item_model.canFetchMore(folder_index))
+
+    def test_filter(self):
+        item_ids = self.project.name_index.find("diagram 3")
+        self.assertEqual(3, len(item_ids))
+        diagram_id = next(iter(item_ids))
+        self.item_model.setFilter({diagram_id})
+        self.assertTrue(self.item_model.isFiltered())
+        self.assertTrue(self.item_model.isFilteredBy({diagram_id}))
+        self.assertEqual(3, self.item_model.shownCount())
+
+        root_index = self.item_model.rootIndex()
+        self.item_model.fetchMore(root_index)
+        self.assertEqual(1, self.item_model.rowCount(root_index))
+        folder_index = self.item_model.index(0, 0, root_index)
+        self.item_model.fetchMore(folder_index)
+        self.assertEqual(1, self.item_model.rowCount(folder_index))
+        self.assertEqual(
+            diagram_id,
+            self.item_model.index(0, 0, folder_index).data(adapters.ItemRoles.IdRole),
+        )
+        self.assertFalse(
+            self.item_model.hasChildren(self.item_model.index(0, 0, folder_index))
+        )
+
+        # new items in shown folders are shown
+        folder_id = folder_index.data(adapters.ItemRoles.IdRole)
+        self.project.add(model.Diagram("New"), folder_id)
+        self.assertEqual(2, self.item_model.rowCount(folder_index))
+
+        # a filter of all items is no filter
+        self.item_model.setFilter(set(self.project.project_items))
+        self.assertFalse(self.item_model.isFiltered())
+        self.item_model.fetchMore(self.item_model.rootIndex())
+        self.assertEqual(3, self.item_model.rowCount(self.item_model.rootIndex()))
+
+    def test_is_shown_by(self):
+        diagram_id = next(iter(self.project.name_index.find("diagram 3")))
+        folder_id = self.project.get(diagram_id).parent_id
+        other_id = next(
+            child.id
+            for child in self.project.children(folder_id)
+            if child.id != diagram_id
+        )
+        for item_id in (self.project.root.id, folder_id, diagram_id):
+            self.assertTrue(self.item_model.isShownBy(item_id, {diagram_id}))
+        self.assertFalse(self.item_model.isShownBy(other_id, {diagram_id}))
+        self.assertTrue(self.item_model.isShownBy(other_id, None))
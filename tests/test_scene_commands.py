@@ -0,0 +1,48 @@
+import unittest
+
+from tests.main_window_case import MainWindowTestCase
+
+
+class TestSceneCommands(MainWindowTestCase):
+    def test_undo_and_redo_add_elements(self):
+        self.window.scene_logic.addNoteElement()
+        element_ids = self.element_ids()
+        self.select_root()
+
+        self.window.undo()
+        self.assertEqual(self.diagram.id, self.window.scene_logic.currentDiagramId())
+        self.assertEqual([], self.element_ids())
+        self.window.redo()
+        self.assertEqual(element_ids, self.element_ids())
+
+    def test_undo_and_redo_remove_elements(self):
+        self.window.scene_logic.addNoteElement()
+        element_ids = self.element_ids()
+        self.window.scene_logic.selectAllElements()
+        self.window.scene_logic.delete_selected_elements()
+        self.assertEqual([], self.element_ids())
+
+        self.window.undo()
+        self.assertEqual(element_ids, self.element_ids())
+        self.window.redo()
+        self.assertEqual([], self.element_ids())
+
+    def test_redo_of_removed_open_diagram(self):
+        self.window.scene_logic.addLine("")
+        element_ids = self.element_ids()
+        self.select_root()
+
+        self.window.undo()  # the line is removed in the open diagram
+        self.window.undo()  # the open diagram is removed
+        self.assertIsNone(self.project.get(self.diagram.id))
+        self.window.redo()
+        self.window.redo()
+        self.assertEqual(self.diagram.id, self.window.scene_logic.currentDiagramId())
+        self.assertEqual(element_ids, self.element_ids())
+
+        self.select_root()
+        self.assertEqual(1, len(self.diagram.dtos))
+
+
+if __name__ == "__main__":
+    unittest.main()
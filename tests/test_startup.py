@@ -0,0 +1,39 @@
+import subprocess
+import sys
+import unittest
+
+from umlayer import usecases
+
+
+class TestDeferredImports(unittest.TestCase):
+    def test_storage_and_svg_are_not_imported_at_startup(self):
+        code = (
+            "import sys, umlayer.composition_root; "
+            "print(','.join(m for m in ('sqlalchemy', 'jsonpickle', 'PySide6.QtSvg') "
+            "if m in sys.modules))"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual("", completed.stdout.strip())
+
+
+class TestLazyProjectStorage(unittest.TestCase):
+    def test_storage_is_created_on_first_use(self):
+        created = []
+
+        class FakeStorage(usecases.ProjectStorage):
+            def __init__(self):
+                created.append(self)
+
+            def save(self, elements, filename=None, texts=None):
+                pass
+
+            def load(self, filename=None, read_only=False, progress=None):
+                return ["root"]
+
+        lazy_storage = usecases.LazyProjectStorage(FakeStorage)
+        self.assertEqual([], created)
+        self.assertEqual(["root"], lazy_storage.load("project.ulr"))
+        lazy_storage.save([], "project.ulr")
+        self.assertEqual(1, len(created))
@@ -0,0 +1,256 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+import uuid
+from unittest import mock
+
+import jsonpickle
+
+from umlayer import model, storage
+
+
+def make_project_items():
+    root = model.Folder("Root")
+    diagram = model.Diagram("Diagram 'quoted'", parent_id=root.id)
+    diagram.dtos = ['{"class_name": "NoteElement", "text": "it\'s a note"}']
+    return [root, diagram]
+
+
+def make_deep_project_items():
+    """Returns items of a three level tree, children before their parents"""
+    root = model.Folder("Root")
+    folders = [model.Folder(f"Folder {i}", parent_id=root.id) for i in range(3)]
+    diagrams = [
+        model.Diagram(f"Diagram {i}", parent_id=folder.id)
+        for i, folder in enumerate(folders)
+    ]
+    return diagrams + folders[::-1] + [root]
+
+
+class TestProjectStorageImpl(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.directory.name, "project.ulr")
+        self.store = storage.ProjectStorageImpl()
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_save_and_load(self):
+        project_items = make_project_items()
+        self.store.save(project_items, self.filepath)
+        self.store.close()
+
+        loaded_items = list(self.store.load(self.filepath))
+        self.assertEqual(
+            {project_item.id for project_item in project_items},
+            {project_item.id for project_item in loaded_items},
+        )
+        diagram = next(item for item in loaded_items if item.parent_id is not None)
+        self.assertEqual("Diagram 'quoted'", diagram.name())
+        self.assertEqual(project_items[1].dtos, diagram.dtos)
+
+    def test_repeated_saves_share_engine(self):
+        project_items = make_project_items()
+        self.store.save(project_items, self.filepath)
+        engine = self.store._engine
+        self.store.save(project_items[:1], self.filepath)
+        self.assertIs(engine, self.store._engine)
+        self.assertEqual(1, len(list(self.store.load(self.filepath))))
+        self.assertIs(engine, self.store._engine)
+
+    def test_save_as_replaces_other_file(self):
+        other_filepath = os.path.join(self.directory.name, "other.ulr")
+        with open(other_filepath, "w") as other_file:
+            other_file.write("not a project")
+
+        self.store.save(make_project_items(), self.filepath)
+        self.store.save(make_project_items(), other_filepath)
+        self.assertEqual(2, len(list(self.store.load(other_filepath))))
+
+    def test_close_releases_file(self):
+        self.store.save(make_project_items(), self.filepath)
+        self.store.close()
+        self.assertIsNone(self.store._engine)
+        self.assertFalse(os.path.exists(self.filepath + "-wal"))
+
+    def test_read_only_load_ignores_locks(self):
+        self.store.save(make_project_items(), self.filepath)
+
+        writer = sqlite3.connect(self.filepath)
+        writer.execute("BEGIN EXCLUSIVE")
+        try:
+            reader = storage.ProjectStorageImpl()
+            loaded_items = list(reader.load(self.filepath, read_only=True))
+            self.assertIsNone(reader._engine)
+        finally:
+            writer.rollback()
+            writer.close()
+
+        self.assertEqual(2, len(loaded_items))
+
+    def test_parents_are_loaded_before_children(self):
+        project_items = make_deep_project_items()
+        self.store.save(project_items, self.filepath)
+
+        for read_only in (False, True):
+            loaded_items = list(self.store.load(self.filepath, read_only=read_only))
+            self.assertIsNone(loaded_items[0].parent_id)
+            seen = set()
+            for project_item in loaded_items:
+                self.assertTrue(
+                    project_item.parent_id is None or project_item.parent_id in seen
+                )
+                seen.add(project_item.id)
+            self.assertEqual(len(project_items), len(seen))
+
+    def test_load_order_is_deterministic(self):
+        project_items = make_deep_project_items()
+        self.store.save(project_items, self.filepath)
+        first = [item.id for item in self.store.load(self.filepath)]
+        self.store.save(project_items, self.filepath)
+        second = [item.id for item in self.store.load(self.filepath)]
+        self.assertEqual(first, second)
+
+    def test_ordered_items_are_saved_in_their_order(self):
+        project = model.Project.load_items(make_deep_project_items())
+        project_items = list(project.walk_breadth_first())
+        with mock.patch.object(model.Project, "load_items") as load_items:
+            self.store.save(project_items, self.filepath)
+        load_items.assert_not_called()
+        self.assertEqual(
+            [project_item.id for project_item in project_items],
+            [project_item.id for project_item in self.store.load(self.filepath)],
+        )
+
+    def test_save_rejects_unreachable_items(self):
+        project_items = make_project_items() + [model.Folder("Orphan", parent_id=None)]
+        with self.assertRaises(ValueError):
+            self.store.save(project_items, self.filepath)
+
+    def test_rejected_save_keeps_previous_content(self):
+        project_items = make_project_items()
+        self.store.save(project_items, self.filepath)
+        orphan = model.Folder("Orphan", parent_id=uuid.uuid4())
+        with self.assertRaises(ValueError):
+            self.store.save(project_items + [orphan], self.filepath)
+        self.assertEqual(2, len(list(self.store.load(self.filepath))))
+
+    def test_failed_save_is_rolled_back(self):
+        project_items = make_project_items()
+        self.store.save(project_items, self.filepath)
+
+        def texts():
+            yield project_items[1].id, 0, "a note"
+            raise OSError("texts")
+
+        with self.assertRaises(OSError):
+            self.store.save(make_deep_project_items(), self.filepath, texts())
+        self.store.close()
+        self.assertEqual(
+            {project_item.id for project_item in project_items},
+            {project_item.id for project_item in self.store.load(self.filepath)},
+        )
+
+    def test_failed_save_as_keeps_target(self):
+        other_filepath = os.path.join(self.directory.name, "other.ulr")
+        other_store = storage.ProjectStorageImpl()
+        other_store.save(make_project_items(), other_filepath)
+        other_store.close()
+        self.store.save(make_project_items(), self.filepath)
+
+        def texts():
+            raise OSError("texts")
+            yield
+
+        with self.assertRaises(OSError):
+            self.store.save(make_deep_project_items(), other_filepath, texts())
+        self.assertEqual(2, len(list(self.store.load(other_filepath, read_only=True))))
+        self.assertEqual(
+            ["other.ulr", "project.ulr"], sorted(os.listdir(self.directory.name))
+        )
+
+        self.store.save(make_deep_project_items(), self.filepath)
+        progress = []
+        list(self.store.load(self.filepath, progress=lambda *p: progress.append(p)))
+        self.assertEqual([(7, 7)], progress)
+
+    def test_load_file_without_order(self):
+        project_items = make_deep_project_items()
+        connection = sqlite3.connect(self.filepath)
+        connection.execute(
+            "CREATE TABLE elements (id text PRIMARY KEY, json_data text)"
+        )
+        connection.executemany(
+            "INSERT INTO elements (id, json_data) VALUES (?, ?)",
+            [(str(item.id), jsonpickle.encode(item)) for item in project_items],
+        )
+        connection.commit()
+        connection.close()
+
+        loaded_items = list(self.store.load(self.filepath))
+        self.assertIsNone(loaded_items[0].parent_id)
+        self.assertEqual(len(project_items), len(loaded_items))
+
+    def test_save_and_load_texts(self):
+        root, diagram = make_project_items()
+        texts = [(diagram.id, 0, "it's a note"), (diagram.id, 2, "Order\nService")]
+        self.store.save([root, diagram], self.filepath, iter(texts))
+
+        self.assertEqual(texts, self.store.load_texts(self.filepath))
+        self.store.close()
+        self.assertEqual(texts, self.store.load_texts(self.filepath, read_only=True))
+
+    def test_file_without_texts(self):
+        self.store.save(make_project_items(), self.filepath)
+        self.assertIsNone(self.store.load_texts(self.filepath))
+        self.assertIsNone(self.store.load_texts(self.filepath, read_only=True))
+
+    def test_append_and_load_journal(self):
+        root, diagram = make_project_items()
+        self.store.save([root, diagram], self.filepath)
+        self.assertEqual([], self.store.load_journal(self.filepath))
+
+        folder = model.Folder("Folder", parent_id=root.id)
+        records = [
+            model.JournalRecord(model.journal.ADD_ITEM, folder.id, folder),
+            model.JournalRecord(model.journal.RENAME_ITEM, folder.id, "Renamed"),
+        ]
+        self.store.append_journal(records[:1], self.filepath)
+        self.store.append_journal(records[1:], self.filepath)
+
+        loaded = self.store.load_journal(self.filepath)
+        self.assertEqual(
+            [(record.operation, record.item_id) for record in records],
+            [(record.operation, record.item_id) for record in loaded],
+        )
+        self.assertEqual("Folder", loaded[0].value.name())
+        self.assertEqual("Renamed", loaded[1].value)
+
+    def test_save_and_clear_drop_journal(self):
+        root, diagram = make_project_items()
+        record = model.JournalRecord(model.journal.REMOVE_ITEM, diagram.id)
+        self.store.save([root, diagram], self.filepath)
+        self.store.append_journal([record], self.filepath)
+        self.store.save([root, diagram], self.filepath)
+        self.assertEqual([], self.store.load_journal(self.filepath))
+
+        self.store.append_journal([record], self.filepath)
+        self.store.clear_journal(self.filepath)
+        self.assertEqual([], self.store.load_journal(self.filepath))
+
+    def test_clear_journal_of_other_file_keeps_engine(self):
+        root, diagram = make_project_items()
+        other_filepath = os.path.join(self.directory.name, "other.ulr")
+        record = model.JournalRecord(model.journal.REMOVE_ITEM, diagram.id)
+        self.store.save([root, diagram], other_filepath)
+        self.store.append_journal([record], other_filepath)
+        self.store.save([root, diagram], self.filepath)
+        engine = self.store._engine
+
+        self.store.clear_journal(other_filepath)
+        self.assertIs(engine, self.store._engine)
+        self.store.close()
+        self.assertEqual([], self.store.load_journal(other_filepath))
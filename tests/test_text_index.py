@@ -0,0 +1,89 @@
+import unittest
+import uuid
+
+from umlayer import model
+
+
+class TestTokenize(unittest.TestCase):
+    def test_tokenize(self):
+        self.assertEqual(
+            ["orderservice", "place", "order_id", "int"],
+            model.tokenize("<<interface>>\nOrderService\n--\n+place(order_id: int)"),
+        )
+
+
+class TestTextIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = model.TextIndex()
+        self.first = uuid.uuid4()
+        self.second = uuid.uuid4()
+        self.index.set_diagram(self.first, ["Customer", "", "Order\nplace()"])
+        self.index.set_diagram(self.second, ["Order service", "Invoice"])
+
+    def found(self, query):
+        return {
+            (match.diagram_id, match.element_index)
+            for match in self.index.search(query)
+        }
+
+    def test_prefix_search(self):
+        self.assertEqual({(self.first, 2), (self.second, 0)}, self.found("ord"))
+        self.assertEqual({(self.second, 0)}, self.found("ORDER serv"))
+        self.assertEqual(set(), self.found("order customer"))
+        self.assertEqual(set(), self.found(""))
+
+    def test_match_text(self):
+        (match,) = self.index.search("invoice")
+        self.assertEqual(model.TextMatch(self.second, 1, "Invoice"), match)
+
+    def test_limit(self):
+        self.assertEqual(1, len(self.index.search("order", limit=1)))
+
+    def test_replace_and_remove_diagram(self):
+        self.index.set_diagram(self.second, ["Payment"])
+        self.assertEqual({(self.first, 2)}, self.found("order"))
+        self.assertEqual(set(), self.found("invoice"))
+
+        self.index.remove_diagram(self.first)
+        self.assertEqual(set(), self.found("order"))
+        self.assertEqual(1, len(self.index))
+
+    def test_rows(self):
+        index = model.TextIndex()
+        index.load_rows(self.index.rows())
+        self.assertEqual(list(self.index.rows()), list(index.rows()))
+        self.assertEqual(self.index.words(), index.words())
+
+
+class TestProjectTextIndex(unittest.TestCase):
+    def setUp(self):
+        self.project = model.Project()
+        self.root = model.Folder("Root")
+        self.project.setRoot(self.root)
+        self.folder = model.Folder("Folder")
+        self.diagram = model.Diagram("Diagram")
+        self.project.add(self.folder, self.root.id)
+        self.project.add(self.diagram, self.folder.id)
+
+    def test_stored_diagram_is_indexed(self):
+        self.project.storeDiagram(self.diagram.id, ['{"text": "Customer"}', "{}"])
+        self.assertEqual(1, len(self.project.text_index.search("cust")))
+
+        self.project.storeDiagram(self.diagram.id, ["{}"], texts=["Invoice"])
+        self.assertEqual([], self.project.text_index.search("cust"))
+        self.assertEqual(1, len(self.project.text_index.search("inv")))
+
+    def test_removed_diagram_is_not_found(self):
+        self.project.storeDiagram(self.diagram.id, ['{"text": "Customer"}'])
+        self.project.remove(self.folder.id)
+        self.assertEqual([], self.project.text_index.search("customer"))
+
+    def test_loaded_project_is_indexed(self):
+        self.diagram.dtos = ['{"text": "Customer"}']
+        project = model.Project.load_items(list(self.project.walk_depth_first()))
+        project.indexTexts()
+        self.assertEqual(1, len(project.text_index.search("customer")))
+
+        stored = model.Project.load_items(list(self.project.walk_depth_first()))
+        stored.indexTexts([(self.diagram.id, 0, "Invoice")])
+        self.assertEqual(1, len(stored.text_index.search("invoice")))
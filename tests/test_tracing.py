@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+
+from umlayer import instrumentation, tracing
+
+
+class Loader:
+    def load(self):
+        return list(self.items(2))
+
+    def items(self, count):
+        yield from range(count)
+
+
+instrumentation.instrument(Loader, load="test load", items="test items")
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self):
+        tracing.stop()
+
+    def test_nested_spans(self):
+        tracing.start()
+        self.assertTrue(instrumentation.is_enabled())
+        Loader().load()
+        recorder = tracing.stop()
+        self.assertFalse(instrumentation.is_enabled())
+
+        events = [event for event in recorder.events() if event["ph"] == "X"]
+        self.assertEqual(
+            ["Loader.items", "Loader.load"], [event["name"] for event in events]
+        )
+        items, load = events
+        self.assertEqual("test items", items["cat"])
+        self.assertLessEqual(load["ts"], items["ts"])
+        self.assertLessEqual(
+            items["ts"] + items["dur"], load["ts"] + load["dur"] + 0.001
+        )
+
+    def test_ring_buffer(self):
+        tracing.start(capacity=3)
+        for _ in range(5):
+            Loader().load()
+        self.assertEqual(3, len(tracing.stop()))
+
+    def test_nothing_recorded_when_stopped(self):
+        self.assertIsNone(tracing.stop())
+        self.assertFalse(tracing.is_recording())
+
+    def test_write(self):
+        tracing.start()
+        Loader().load()
+        recorder = tracing.stop()
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "trace.json")
+            recorder.write(filepath)
+            with open(filepath, encoding="utf-8") as trace_file:
+                trace = json.load(trace_file)
+        self.assertEqual(recorder.events(), trace["traceEvents"])
+        self.assertIn("thread_name", [event["name"] for event in trace["traceEvents"]])
+
+    def test_shared_with_counters(self):
+        instrumentation.enable()
+        tracing.start()
+        tracing.stop()
+        self.assertTrue(instrumentation.is_enabled())
+        instrumentation.disable()
+        self.assertFalse(instrumentation.is_enabled())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from umlayer import instrumentation
+
+from tests.main_window_case import MainWindowTestCase
+
+
+class TestTreeFilter(MainWindowTestCase):
+    def setUp(self):
+        super().setUp()
+        self.project.rename(self.diagram.id, "Orders")
+        self.window.scene_logic.addNoteElement()
+        self.elements = self.window.scene.elements()
+        self.built = []
+        scene_logic = self.window.scene_logic
+        build = scene_logic.buildSceneFrom
+        scene_logic.buildSceneFrom = lambda item: (self.built.append(item), build(item))
+
+    def filter(self, query):
+        self.window.treeFilterEdit.setText(query)
+        self.window.filterProjectTree()
+
+    def test_shown_diagram_stays_open(self):
+        for query in ("o", "or", "ord", ""):
+            self.filter(query)
+        self.assertEqual(self.diagram.id, self.window.scene_logic.currentDiagramId())
+        self.assertEqual([], self.built)
+        self.assertEqual(self.elements, self.window.scene.elements())
+        self.assertTrue(self.elements[0].isSelected())
+
+    def test_hidden_diagram_is_closed(self):
+        self.filter("nothing")
+        self.assertEqual(self.project.root.id, self.window.treeView.getSelectedItemId())
+        self.assertEqual([], self.window.scene.elements())
+        self.assertEqual(1, len(self.diagram.dtos))
+
+
+class TestDiagramSwitch(MainWindowTestCase):
+    def tearDown(self):
+        instrumentation.disable()
+        super().tearDown()
+
+    def test_tree_selection_is_measured(self):
+        instrumentation.enable()
+        before = instrumentation.snapshot().get("diagram switch")
+        self.select_root()
+        self.window.treeView.setCurrentIndex(
+            self.window.treeView.proxyIndexFromId(self.diagram.id)
+        )
+        after = instrumentation.snapshot()["diagram switch"]
+        self.assertEqual(2, after.calls - (before.calls if before else 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import unittest
+
+from umlayer import model
+
+
+class SetValueCommand(model.UndoCommand):
+    def __init__(self, target, old, new, size=100, merge_key=None):
+        self.target = target
+        self.old = old
+        self.new = new
+        self._size = size
+        self.merge_key = merge_key
+        self.text = f"Set {new}"
+
+    def undo(self):
+        self.target["value"] = self.old
+
+    def redo(self):
+        self.target["value"] = self.new
+
+    def size(self):
+        return self._size
+
+    def merge_with(self, command):
+        if self.merge_key is None or self.merge_key != command.merge_key:
+            return False
+        self.new = command.new
+        self._size += command.size()
+        return True
+
+
+class TestUndoStack(unittest.TestCase):
+    def setUp(self):
+        self.target = {"value": 0}
+        self.notifications = 0
+        self.stack = model.UndoStack(byte_budget=1000, on_changed=self.on_changed)
+
+    def on_changed(self):
+        self.notifications += 1
+
+    def set(self, value, **kwargs):
+        old = self.target["value"]
+        self.target["value"] = value
+        self.stack.push(SetValueCommand(self.target, old, value, **kwargs))
+
+    def test_undo_redo(self):
+        self.set(1)
+        self.set(2)
+        self.assertEqual("Set 2", self.stack.undo_text())
+
+        self.stack.undo()
+        self.assertEqual(1, self.target["value"])
+        self.assertEqual("Set 2", self.stack.redo_text())
+        self.stack.undo()
+        self.stack.undo()
+        self.assertEqual(0, self.target["value"])
+        self.assertFalse(self.stack.can_undo())
+
+        self.stack.redo()
+        self.stack.redo()
+        self.assertEqual(2, self.target["value"])
+        self.assertFalse(self.stack.can_redo())
+        self.assertEqual(6, self.notifications)
+
+    def test_push_drops_undone_commands(self):
+        self.set(1)
+        self.set(2)
+        self.stack.undo()
+        self.set(3)
+        self.assertEqual(2, len(self.stack))
+        self.assertEqual(200, self.stack.size())
+        self.assertFalse(self.stack.can_redo())
+        self.stack.undo()
+        self.assertEqual(1, self.target["value"])
+
+    def test_budget_evicts_oldest(self):
+        for value in range(1, 16):
+            self.set(value)
+        self.assertEqual(10, len(self.stack))
+        self.assertEqual(1000, self.stack.size())
+
+        while self.stack.can_undo():
+            self.stack.undo()
+        self.assertEqual(5, self.target["value"])
+
+    def test_last_command_is_kept_over_budget(self):
+        self.set(1)
+        self.set(2, size=5000)
+        self.assertEqual(1, len(self.stack))
+        self.stack.undo()
+        self.assertEqual(1, self.target["value"])
+
+    def test_smaller_budget(self):
+        for value in range(1, 6):
+            self.set(value)
+        self.stack.set_byte_budget(300)
+        self.assertEqual(3, len(self.stack))
+
+    def test_merge(self):
+        self.set(1)
+        self.set(2, merge_key="typing")
+        self.set(3, merge_key="typing")
+        self.assertEqual(2, len(self.stack))
+        self.assertEqual(300, self.stack.size())
+        self.stack.undo()
+        self.assertEqual(1, self.target["value"])
+
+    def test_changes_while_applying_are_not_recorded(self):
+        stack = self.stack
+
+        class RecordingCommand(SetValueCommand):
+            def undo(self):
+                super().undo()
+                stack.push(SetValueCommand(self.target, 0, 0))
+
+        self.stack.push(RecordingCommand(self.target, 0, 1))
+        self.stack.undo()
+        self.assertEqual(1, len(self.stack))
+        self.assertTrue(self.stack.can_redo())
+
+
+class TestProjectCommands(unittest.TestCase):
+    def setUp(self):
+        self.project = model.Project()
+        self.root = model.Folder("Root")
+        self.project.setRoot(self.root)
+        self.folder = model.Folder("Folder")
+        self.project.add(self.folder, self.root.id)
+        self.diagram = model.Diagram("Diagram")
+        self.project.add(self.diagram, self.folder.id)
+        self.project.storeDiagram(self.diagram.id, ['{"text": "order"}'])
+        self.stack = model.UndoStack()
+
+    def test_add(self):
+        other = model.Folder("Other")
+        self.project.add(other, self.root.id)
+        self.stack.push(model.AddItemCommand(self.project, other))
+
+        self.stack.undo()
+        self.assertIsNone(self.project.get(other.id))
+        self.stack.redo()
+        self.assertEqual({self.folder, other}, self.project.children(self.root.id))
+
+    def test_remove(self):
+        items = list(self.project.walk_breadth_first(self.folder.id))
+        self.project.remove(self.folder.id)
+        self.stack.push(model.RemoveItemCommand(self.project, items))
+        self.assertEqual(1, self.project.count())
+
+        self.stack.undo()
+        self.assertEqual({self.diagram}, self.project.children(self.folder.id))
+        self.assertEqual(1, self.project.stats.elements)
+        self.assertEqual(
+            [self.diagram.id],
+            [match.diagram_id for match in self.project.text_index.search("ord")],
+        )
+        self.assertEqual({self.diagram.id}, self.project.name_index.find("diag"))
+
+        self.stack.redo()
+        self.assertEqual(1, self.project.count())
+
+    def test_rename(self):
+        self.project.rename(self.folder.id, "Renamed")
+        self.stack.push(
+            model.RenameItemCommand(self.project, self.folder.id, "Folder", "Renamed")
+        )
+        self.stack.undo()
+        self.assertEqual("Folder", self.folder.name())
+        self.stack.redo()
+        self.assertEqual("Renamed", self.folder.name())
@@ -1,4 +1,7 @@
-from umlayer.adapters.standard_item import StandardItem
-from umlayer.adapters.standard_item_model import StandardItemModel
+from umlayer.adapters.project_tree_model import (
+    ItemRoles,
+    ProjectTreeModel,
+    itemTypeIcon,
+    sortKey,
+)
 from umlayer.adapters.tree_sort_model import TreeSortModel
-from umlayer.adapters.gui_adapters import makeItemFromProjectItem, itemize
@@ -0,0 +1,511 @@
+import bisect
+from typing import Callable
+from uuid import UUID
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PySide6.QtGui import QIcon
+
+from umlayer import model
+
+# number of rows added to an expanded folder at once
+FETCH_BATCH_SIZE = 1000
+
+ITEM_TYPE_TO_ICON = {
+    model.ProjectItemType.FOLDER: "icons:folder.png",
+    model.ProjectItemType.DIAGRAM: "icons:diagram.png",
+}
+
+
+# item type -> icon, shared by all models
+_icons: dict[model.ProjectItemType, QIcon] = {}
+
+
+def itemTypeIcon(item_type: model.ProjectItemType) -> QIcon:
+    icon = _icons.get(item_type)
+    if icon is None:
+        icon = _icons[item_type] = QIcon(ITEM_TYPE_TO_ICON[item_type])
+    return icon
+
+
+_SORT_KEY_PREFIXES = {
+    item_type: f"{item_type.value:03d}" for item_type in model.ProjectItemType
+}
+
+
+def sortKey(project_item: model.BaseItem) -> str:
+    """Returns the key of the tree order: folders first, then names ignoring case
+
+    The key is a string, so a proxy model sorting by it compares keys natively.
+    """
+    return _SORT_KEY_PREFIXES[project_item.itemType] + project_item.name().casefold()
+
+
+class ItemRoles:
+    NameRole = Qt.DisplayRole
+    IdRole = Qt.UserRole
+    TypeRole = Qt.UserRole + 1
+    SortKeyRole = Qt.UserRole + 2
+
+
+class _Node:
+    """Row of the tree created for a project item"""
+
+    __slots__ = (
+        "item_id",
+        "sort_key",
+        "parent",
+        "row",
+        "children",
+        "pending",
+        "pending_keys",
+    )
+
+    def __init__(self, item_id: UUID, sort_key: str, parent: "_Node", row: int):
+        self.item_id = item_id
+        self.sort_key = sort_key
+        self.parent = parent
+        self.row = row
+        self.children: list[_Node] = []
+        # sorted (sort key, id) of children without rows; None until the first fetch
+        self.pending: list[tuple[str, UUID]] = None
+        # id -> sort key of the pending children, to find them by bisection
+        self.pending_keys: dict[UUID, str] = None
+
+    def setPending(self, pending: list[tuple[str, UUID]]) -> None:
+        self.pending = pending
+        self.pending_keys = {item_id: sort_key for sort_key, item_id in pending}
+
+    def addPending(self, sort_key: str, item_id: UUID) -> None:
+        bisect.insort(self.pending, (sort_key, item_id))
+        self.pending_keys[item_id] = sort_key
+
+    def takePending(self, count: int) -> list[tuple[str, UUID]]:
+        """Removes and returns the first count pending children"""
+        taken = self.pending[:count]
+        del self.pending[:count]
+        for _, item_id in taken:
+            del self.pending_keys[item_id]
+        return taken
+
+    def discardPending(self, item_id: UUID) -> bool:
+        """Removes the child from the pending ones, tells if it was pending"""
+        if not self.pending:
+            return False
+        sort_key = self.pending_keys.pop(item_id, None)
+        if sort_key is None:
+            return False
+        del self.pending[bisect.bisect_left(self.pending, (sort_key, item_id))]
+        return True
+
+
+def _insertionRow(nodes: list[_Node], sort_key: str, skipped: int = None) -> int:
+    """Returns the row of the sort key after the nodes with keys not greater
+
+    Works as bisect.bisect_right by sort keys of the nodes, leaving out
+    the skipped row, without copying the list and without the key argument
+    of bisect, which needs Python 3.10.
+    """
+    low, high = 0, len(nodes) - (skipped is not None)
+    while low < high:
+        middle = (low + high) // 2
+        row = middle + 1 if skipped is not None and middle >= skipped else middle
+        if sort_key < nodes[row].sort_key:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+class ProjectTreeModel(QAbstractItemModel, model.ProjectObserver):
+    """
+    Item model of the project tree
+
+    Rows of a folder are created when the folder is expanded,
+    so the memory used grows with the expanded part of the tree,
+    not with the size of the project.
+
+    Rows are kept in the order of their sort keys, so views do not need
+    to sort them. Rows of a folder are fetched in this order: every row
+    sorts before the children that are not fetched yet.
+
+    The model observes the project and applies each change to the rows
+    it affects, without rebuilding the tree.
+
+    A filter limits the rows to given items and their ancestors. Items
+    added to a shown folder are shown too, so new items can be edited.
+
+    All methods must be called with model index (not proxy index).
+    """
+
+    def __init__(self, rename: Callable[[UUID, str], None] = None, parent=None):
+        super().__init__(parent)
+        self._rename = rename
+        self._project: model.Project = None
+        self._root: _Node = None
+        self._nodes: dict[UUID, _Node] = {}
+        # ids of the filter, of the shown items and of their parents,
+        # None when not filtered
+        self._filter: set[UUID] = None
+        self._shown: set[UUID] = None
+        self._shown_parents: set[UUID] = None
+
+    def initializeFromProject(self, project: model.Project) -> None:
+        self.beginResetModel()
+        self._setProject(project)
+        self._filter = self._shown = self._shown_parents = None
+        self._nodes = {}
+        self._root = self._makeNode(project.root.id, sortKey(project.root), None, 0)
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._setProject(None)
+        self._filter = self._shown = self._shown_parents = None
+        self._root = None
+        self._nodes = {}
+        self.endResetModel()
+
+    def setFilter(self, item_ids: set[UUID] = None) -> None:
+        """Shows only the items with their ancestors, or all items if None
+
+        The rows are created anew, lazily as without the filter.
+        """
+        if self.isFilteredBy(item_ids):
+            return
+
+        self.beginResetModel()
+        self._filter = self._normalizedFilter(item_ids)
+        item_ids = self._filter
+        if item_ids is None:
+            self._shown = self._shown_parents = None
+        else:
+            self._shown, self._shown_parents = self._withAncestors(item_ids)
+        root = self._project.root
+        self._nodes = {}
+        self._root = self._makeNode(root.id, sortKey(root), None, 0)
+        self.endResetModel()
+
+    def isFiltered(self) -> bool:
+        return self._shown is not None
+
+    def isFilteredBy(self, item_ids: set[UUID] = None) -> bool:
+        """Returns True if setting the filter would not change the rows"""
+        return self._normalizedFilter(item_ids) == self._filter
+
+    def isShownBy(self, item_id: UUID, item_ids: set[UUID] = None) -> bool:
+        """Returns True if the filter of the items would show the item"""
+        item_ids = self._normalizedFilter(item_ids)
+        if item_ids is None or item_id in item_ids or item_id == self._project.root.id:
+            return True
+        if not self._project.hasChildren(item_id):
+            return False
+        shown, _ = self._withAncestors(item_ids)
+        return item_id in shown
+
+    def shownCount(self) -> int:
+        """Returns the number of items the filter shows"""
+        if self._shown is None:
+            return self._project.count() if self._project else 0
+        return len(self._shown)
+
+    def count(self) -> int:
+        """Returns the number of rows created so far"""
+        return len(self._nodes)
+
+    def rootIndex(self) -> QModelIndex:
+        if self._root is None:
+            return QModelIndex()
+        return self._index(self._root)
+
+    def indexFromId(self, item_id: UUID) -> QModelIndex:
+        """Returns the index of the item, creating rows of its ancestors if needed"""
+        # ids of the item and its ancestors without rows, the item first
+        missing = []
+        while item_id not in self._nodes:
+            project_item = self._project.get(item_id) if self._project else None
+            if project_item is None or project_item.parent_id is None:
+                return QModelIndex()
+            missing.append(item_id)
+            item_id = project_item.parent_id
+
+        node = self._nodes[item_id]
+        for item_id in reversed(missing):
+            while item_id not in self._nodes and self.canFetchMore(self._index(node)):
+                self._fetch(node, FETCH_BATCH_SIZE)
+            node = self._nodes.get(item_id)
+            if node is None:
+                return QModelIndex()
+        return self._index(node)
+
+    # ProjectObserver interface
+
+    def onItemAdded(self, project_item: model.BaseItem) -> None:
+        if self._shown is not None:
+            if project_item.parent_id not in self._shown:
+                return
+            self._shown.add(project_item.id)
+            self._shown_parents.add(project_item.parent_id)
+        parent = self._nodes.get(project_item.parent_id)
+        if parent is None:
+            return
+        if parent.pending is None:
+            parent.setPending(
+                [
+                    pending
+                    for pending in self._sortedChildren(parent.item_id)
+                    if pending[1] != project_item.id
+                ]
+            )
+        sort_key = sortKey(project_item)
+        self._fetchBefore(parent, sort_key)
+        row = _insertionRow(parent.children, sort_key)
+        self.beginInsertRows(self._index(parent), row, row)
+        node = self._makeNode(project_item.id, sort_key, parent, row)
+        parent.children.insert(row, node)
+        self._renumber(parent, row + 1)
+        self.endInsertRows()
+
+    def onItemRemoved(self, project_item: model.BaseItem) -> None:
+        node = self._nodes.get(project_item.id)
+        if node is None:
+            self._discardPending(project_item.parent_id, project_item.id)
+        else:
+            self._removeRow(node)
+
+    def onItemRenamed(self, project_item: model.BaseItem) -> None:
+        node = self._nodes.get(project_item.id)
+        if node is None:
+            if self._discardPending(project_item.parent_id, project_item.id):
+                parent = self._nodes[project_item.parent_id]
+                parent.addPending(sortKey(project_item), project_item.id)
+            return
+        self._reorder(node)
+        index = self._index(node)
+        self.dataChanged.emit(
+            index, index, [Qt.DisplayRole, Qt.EditRole, ItemRoles.SortKeyRole]
+        )
+
+    def onItemMoved(self, project_item: model.BaseItem, old_parent_id: UUID) -> None:
+        node = self._nodes.get(project_item.id)
+        if node is None:
+            self._discardPending(old_parent_id, project_item.id)
+        else:
+            self._removeRow(node)
+        self.onItemAdded(project_item)
+
+    # QAbstractItemModel interface
+
+    def index(self, row: int, column: int, parent=QModelIndex()) -> QModelIndex:
+        if column != 0 or row < 0:
+            return QModelIndex()
+        if not parent.isValid():
+            if row == 0 and self._root is not None:
+                return self._index(self._root)
+            return QModelIndex()
+        children = parent.internalPointer().children
+        if row >= len(children):
+            return QModelIndex()
+        return self.createIndex(row, 0, children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None:
+            return QModelIndex()
+        return self._index(parent)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        if not parent.isValid():
+            return 0 if self._root is None else 1
+        return len(parent.internalPointer().children)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()) -> bool:
+        if not parent.isValid():
+            return self._root is not None
+        node: _Node = parent.internalPointer()
+        return bool(node.children) or self._hasChildren(node.item_id)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        if not parent.isValid():
+            return False
+        node: _Node = parent.internalPointer()
+        if node.pending is None:
+            return self._hasChildren(node.item_id)
+        return bool(node.pending)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        if not parent.isValid():
+            return
+        self._fetch(parent.internalPointer(), FETCH_BATCH_SIZE)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node: _Node = index.internalPointer()
+        if role == ItemRoles.SortKeyRole:
+            return node.sort_key
+        project_item = self._project.get(node.item_id)
+        if project_item is None:
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return project_item.name()
+        if role == Qt.DecorationRole:
+            return itemTypeIcon(project_item.itemType)
+        if role == ItemRoles.IdRole:
+            return project_item.id
+        if role == ItemRoles.TypeRole:
+            return project_item.itemType
+        return None
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        if self._rename is None:
+            return False
+        item_id = index.internalPointer().item_id
+        # the row changes when the project reports the new name
+        self._rename(item_id, value)
+        project_item = self._project.get(item_id)
+        # the name is kept when the rename is rejected
+        return project_item is not None and project_item.name() == value
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    # implementation
+
+    def _setProject(self, project: model.Project) -> None:
+        if self._project is not None:
+            self._project.unsubscribe(self)
+        self._project = project
+        if project is not None:
+            project.subscribe(self)
+
+    def _index(self, node: _Node) -> QModelIndex:
+        return self.createIndex(node.row, 0, node)
+
+    def _makeNode(self, item_id: UUID, sort_key: str, parent: _Node, row: int) -> _Node:
+        node = _Node(item_id, sort_key, parent, row)
+        self._nodes[item_id] = node
+        return node
+
+    def _fetch(self, node: _Node, count: int) -> None:
+        """Adds rows for the next count children of the node"""
+        if node.pending is None:
+            node.setPending(self._sortedChildren(node.item_id))
+        project_items = self._project.project_items
+        batch = [
+            pending
+            for pending in node.takePending(count)
+            if pending[1] in project_items
+        ]
+        if not batch:
+            return
+
+        first = len(node.children)
+        self.beginInsertRows(self._index(node), first, first + len(batch) - 1)
+        node.children.extend(
+            self._makeNode(item_id, sort_key, node, row)
+            for row, (sort_key, item_id) in enumerate(batch, first)
+        )
+        self.endInsertRows()
+
+    def _fetchBefore(self, node: _Node, sort_key: str) -> None:
+        """Adds rows for the children not fetched yet that sort before the key"""
+        if not node.pending:
+            return
+        count = bisect.bisect_left(node.pending, (sort_key,))
+        if count:
+            self._fetch(node, count)
+
+    def _removeRow(self, node: _Node) -> None:
+        """Removes the row of the node with rows of its descendants"""
+        parent = node.parent
+        self.beginRemoveRows(self._index(parent), node.row, node.row)
+        del parent.children[node.row]
+        self._renumber(parent, node.row)
+        self._forget(node)
+        self.endRemoveRows()
+
+    def _discardPending(self, parent_id: UUID, item_id: UUID) -> bool:
+        """Removes the item from children of the parent not fetched yet"""
+        parent = self._nodes.get(parent_id)
+        return parent is not None and parent.discardPending(item_id)
+
+    def _reorder(self, node: _Node) -> None:
+        """Moves the row of a renamed item to the position of its new sort key"""
+        sort_key = sortKey(self._project.get(node.item_id))
+        if sort_key == node.sort_key:
+            return
+        parent = node.parent
+        if parent is None:
+            node.sort_key = sort_key
+            return
+
+        self._fetchBefore(parent, sort_key)
+        siblings = parent.children
+        row = node.row
+        new_row = _insertionRow(siblings, sort_key, skipped=row)
+        node.sort_key = sort_key
+        if new_row == row:
+            return
+
+        parent_index = self._index(parent)
+        destination = new_row + 1 if new_row > row else new_row
+        self.beginMoveRows(parent_index, row, row, parent_index, destination)
+        siblings.insert(new_row, siblings.pop(row))
+        self._renumber(parent, min(row, new_row), max(row, new_row) + 1)
+        self.endMoveRows()
+
+    @staticmethod
+    def _renumber(parent: _Node, start: int, stop: int = None) -> None:
+        for row in range(start, len(parent.children) if stop is None else stop):
+            parent.children[row].row = row
+
+    def _forget(self, node: _Node) -> None:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            self._nodes.pop(node.item_id, None)
+            stack.extend(node.children)
+
+    def _hasChildren(self, item_id: UUID) -> bool:
+        if self._shown_parents is not None and item_id not in self._shown_parents:
+            return False
+        return self._project.hasChildren(item_id)
+
+    def _sortedChildren(self, parent_id: UUID) -> list[tuple[str, UUID]]:
+        """Returns sort keys and ids of the children in the order of the project tree"""
+        children = self._project.children(parent_id)
+        if self._shown is not None:
+            children = (child for child in children if child.id in self._shown)
+        return sorted((sortKey(child), child.id) for child in children)
+
+    def _normalizedFilter(self, item_ids: set[UUID]) -> set[UUID]:
+        if item_ids is not None and len(item_ids) >= self._project.count():
+            return None  # a filter showing all items
+        return item_ids
+
+    def _withAncestors(self, item_ids: set[UUID]) -> tuple[set[UUID], set[UUID]]:
+        """Returns ids of the items with their ancestors, and ids of their parents"""
+        project_items = self._project.project_items
+        shown = set(item_ids)
+        shown.add(self._project.root.id)
+        parents = set()
+        # one level of ancestors at a time
+        level = item_ids
+        while level:
+            level_parents = {project_items[item_id].parent_id for item_id in level}
+            level_parents.discard(None)
+            parents |= level_parents
+            level = level_parents - shown
+            shown |= level
+        return shown, parents
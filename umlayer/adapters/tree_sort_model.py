@@ -1,20 +1,17 @@
-from PySide6.QtCore import QModelIndex, QSortFilterProxyModel
+from PySide6.QtCore import QSortFilterProxyModel
 
-from . import StandardItem, StandardItemModel
+from . import ItemRoles
 
 
 class TreeSortModel(QSortFilterProxyModel):
-    def lessThan(self, left: QModelIndex, right: QModelIndex):
-        model: StandardItemModel = self.sourceModel()
-        left_item: StandardItem = model.itemFromIndex(left)
-        right_item: StandardItem = model.itemFromIndex(right)
+    """Proxy model of the project tree
 
-        left_type_value = left_item.itemType().value
-        right_type_value = right_item.itemType().value
+    The item model already keeps rows in tree order, so the view does not
+    enable sorting. When sort() is called, rows are compared by their
+    precomputed sort keys: the keys are strings and compared natively,
+    without calling back into Python for every comparison.
+    """
 
-        if left_type_value < right_type_value:
-            return True
-        if left_type_value > right_type_value:
-            return False
-
-        return left_item.itemName() < right_item.itemName()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setSortRole(ItemRoles.SortKeyRole)
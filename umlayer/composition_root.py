@@ -1,11 +1,17 @@
+import importlib
 import sys
 
 from umlayer import model
 from umlayer import gui
-from umlayer import storage
 from umlayer import usecases
 
 
+def _create_project_storage() -> usecases.ProjectStorage:
+    # the storage stack is heavy to import, so it is imported on first use
+    storage = importlib.import_module("umlayer.storage")
+    return storage.ProjectStorageImpl()
+
+
 class CompositionRoot:
     """Creates concrete realizations and wires the application up"""
 
@@ -15,7 +21,7 @@ class CompositionRoot:
         self._app = gui.UMLayerApplication(sys.argv)
 
         data_model = model.DataModel()
-        project_storage = storage.ProjectStorageImpl()
+        project_storage = usecases.LazyProjectStorage(_create_project_storage)
 
         project_interactor = usecases.ProjectInteractor(data_model, project_storage)
         interactors = usecases.Interactors(data_model, project_interactor)
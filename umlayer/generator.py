@@ -0,0 +1,251 @@
+"""Synthetic project generator
+
+Writes projects of generated folders, diagrams and elements for load
+tests, benchmarks and bug reports. The same parameters and seed give
+the same project, ids included, so a project can be shared as its
+command line:
+
+    python -m umlayer.generator project.ulr [--seed N] [--depth N] [--fan-out N]
+        [--diagrams N] [--elements N | MIN-MAX] [--mix CLASS=WEIGHT,...]
+        [--text-lines N | MIN-MAX] [--line-length N | MIN-MAX]
+
+Folders form a tree of the given depth and fan-out under the root,
+diagrams are spread over all folders. Elements are laid out on a grid,
+lines connect neighboring cells. Counts and text lengths given as
+MIN-MAX are drawn uniformly for every diagram and element.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from typing import Iterator, NamedTuple
+
+from umlayer import model
+from umlayer.storage import ProjectStorageImpl
+
+# class name of the element -> weight in the default mix
+DEFAULT_MIX = {
+    "ClassElement": 4,
+    "LineElement": 4,
+    "NoteElement": 1,
+    "PackageElement": 1,
+    "EllipseElement": 1,
+    "ActorElement": 1,
+    "TextElement": 1,
+}
+
+LINE_TYPES = ["lt=-", "lt=->", "lt=<<-", "lt=.>", "lt=<<<<-", "lt=<<<<<-", "lt=.."]
+
+WORDS = (
+    "order customer item invoice payment account user session request response "
+    "service repository factory adapter model view controller event queue cache "
+    "index report product price total state status handler manager client server"
+).split()
+
+# distance between grid cells of elements
+CELL_SIZE = 200
+COLUMNS = 20
+
+
+class Range(NamedTuple):
+    low: int
+    high: int
+
+    @classmethod
+    def parse(cls, text: str) -> "Range":
+        """Returns the range of "N" or "MIN-MAX" """
+        low, _, high = text.partition("-")
+        result = cls(int(low), int(high or low))
+        if result.low < 0 or result.low > result.high:
+            raise ValueError(f"Invalid range {text}")
+        return result
+
+    def draw(self, rng: random.Random) -> int:
+        return rng.randint(self.low, self.high)
+
+
+class GeneratedProject(NamedTuple):
+    project_items: list[model.BaseItem]
+    # (diagram id, element position, text) of all elements
+    texts: list[tuple[uuid.UUID, int, str]]
+
+
+class ProjectGenerator:
+    def __init__(
+        self,
+        seed: int = 0,
+        depth: int = 2,
+        fan_out: int = 3,
+        diagrams: int = 10,
+        elements: Range = Range(100, 100),
+        mix: dict[str, int] = None,
+        text_lines: Range = Range(1, 4),
+        line_length: Range = Range(4, 24),
+    ) -> None:
+        mix = DEFAULT_MIX if mix is None else mix
+        unknown = mix.keys() - DEFAULT_MIX.keys()
+        if unknown:
+            raise ValueError(f"Unknown elements {sorted(unknown)}")
+        if not any(mix.values()):
+            raise ValueError("mix")
+        self._seed = seed
+        self._depth = depth
+        self._fan_out = fan_out
+        self._diagrams = diagrams
+        self._elements = elements
+        self._class_names = list(mix)
+        self._weights = list(mix.values())
+        self._text_lines = text_lines
+        self._line_length = line_length
+        self._rng: random.Random = None
+
+    def generate(self) -> GeneratedProject:
+        self._rng = random.Random(self._seed)
+        root = self._item(model.Folder("Root"))
+        folders = [root]
+        level = [root]
+        for depth in range(1, self._depth + 1):
+            level = [
+                self._item(model.Folder(f"Folder {depth}.{i}", parent_id=parent.id))
+                for parent in level
+                for i in range(self._fan_out)
+            ]
+            folders.extend(level)
+
+        project_items = list(folders)
+        texts = []
+        for i in range(self._diagrams):
+            parent = folders[i % len(folders)]
+            diagram = self._item(model.Diagram(f"Diagram {i}", parent_id=parent.id))
+            dtos = list(self._element_dtos(self._elements.draw(self._rng)))
+            diagram.dtos = [json.dumps(dto) for dto in dtos]
+            texts.extend(
+                (diagram.id, position, dto["text"]) for position, dto in enumerate(dtos)
+            )
+            project_items.append(diagram)
+        return GeneratedProject(project_items, texts)
+
+    def _item(self, project_item: model.BaseItem) -> model.BaseItem:
+        project_item.id = uuid.UUID(int=self._rng.getrandbits(128), version=4)
+        return project_item
+
+    def _element_dtos(self, count: int) -> Iterator[dict]:
+        class_names = self._rng.choices(self._class_names, self._weights, k=count)
+        for cell, class_name in enumerate(class_names):
+            x = cell % COLUMNS * CELL_SIZE
+            y = cell // COLUMNS * CELL_SIZE
+            dto = {
+                "class_name": class_name,
+                "id": uuid.UUID(int=self._rng.getrandbits(128), version=4).hex,
+                "x": float(x),
+                "y": float(y),
+                "zValue": 0.0,
+            }
+            if class_name == "LineElement":
+                # to the next cell, the line sets its position from the points
+                dto.update(
+                    x1=float(x),
+                    y1=float(y + CELL_SIZE // 2),
+                    x2=float(x + CELL_SIZE),
+                    y2=float(y + CELL_SIZE // 2),
+                    text=self._line_text(),
+                )
+                dto["x"], dto["y"] = dto["x1"], dto["y1"]
+            else:
+                dto["text"] = self._text(class_name)
+                if class_name in ("TextElement", "NoteElement"):
+                    dto["center"] = False
+                if class_name not in ("TextElement", "ActorElement"):
+                    dto["dx"] = 0.0
+                    dto["dy"] = 0.0
+            yield dto
+
+    def _words(self) -> str:
+        length = self._line_length.draw(self._rng)
+        words = []
+        while sum(len(word) + 1 for word in words) < length:
+            words.append(self._rng.choice(WORDS))
+        return " ".join(words)[:length]
+
+    def _text(self, class_name: str) -> str:
+        if class_name == "ActorElement":
+            return self._rng.choice(WORDS).capitalize()
+        lines = [self._words() for _ in range(self._text_lines.draw(self._rng))]
+        if class_name == "ClassElement":
+            # the name, attributes and operations
+            name = self._rng.choice(WORDS).capitalize()
+            middle = len(lines) // 2
+            attributes = [f"+{line.replace(' ', '_')}: int" for line in lines[:middle]]
+            operations = [f"+{line.replace(' ', '_')}()" for line in lines[middle:]]
+            return "\n".join([name, "--", *attributes, "--", *operations])
+        return "\n".join(lines)
+
+    def _line_text(self) -> str:
+        line_type = self._rng.choice(LINE_TYPES)
+        if self._rng.random() < 0.5:
+            return line_type
+        return f"{line_type}\n{self._words()}"
+
+
+def parse_mix(text: str) -> dict[str, int]:
+    """Returns the weights of "ClassElement=4,LineElement=3,..." """
+    mix = {}
+    for part in text.split(","):
+        class_name, _, weight = part.partition("=")
+        mix[class_name.strip()] = int(weight or 1)
+    return mix
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("filepath", help="the project file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=2, help="depth of folders")
+    parser.add_argument("--fan-out", type=int, default=3, help="subfolders per folder")
+    parser.add_argument("--diagrams", type=int, default=10)
+    parser.add_argument(
+        "--elements", type=Range.parse, default="100", help="elements per diagram"
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=None,
+        help="element weights, e.g. ClassElement=4,LineElement=3,NoteElement=1",
+    )
+    parser.add_argument(
+        "--text-lines", type=Range.parse, default="1-4", help="lines of a text"
+    )
+    parser.add_argument(
+        "--line-length", type=Range.parse, default="4-24", help="characters of a line"
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    generated = ProjectGenerator(
+        seed=args.seed,
+        depth=args.depth,
+        fan_out=args.fan_out,
+        diagrams=args.diagrams,
+        elements=args.elements,
+        mix=args.mix,
+        text_lines=args.text_lines,
+        line_length=args.line_length,
+    ).generate()
+    storage = ProjectStorageImpl()
+    try:
+        storage.save(generated.project_items, args.filepath, generated.texts)
+    finally:
+        storage.close()
+    print(
+        f"{args.filepath}: {len(generated.project_items)} items,"
+        f" {len(generated.texts)} elements"
+        f" in {time.perf_counter() - started:.1f} s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
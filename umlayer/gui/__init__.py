@@ -1,6 +1,11 @@
 # the order is important
 from umlayer.gui import constants
 from umlayer.gui.settings import Settings
+from umlayer.gui.paint_resources import (
+    PaintKind,
+    paint_resource,
+    invalidate_paint_resources,
+)
 from umlayer.gui.gui_utils import snap, snap_up, snap_round
 from umlayer.gui.base_element import BaseElement, Abilities
 
@@ -28,12 +33,22 @@ from umlayer.gui.class_element import ClassElement
 from umlayer.gui.line_element import LineElement
 
 from umlayer.gui.line_icons_proxy_stype import LineIconsProxyStyle
+from umlayer.gui.scene_commands import (
+    dto_delta,
+    AddElementsCommand,
+    RemoveElementsCommand,
+    ChangeElementsCommand,
+)
 from umlayer.gui.scene_logic import SceneLogic
+from umlayer.gui.group_move import GroupMove
 from umlayer.gui.graphics_scene import GraphicsScene
 from umlayer.gui.export_scene import ExportScene
+from umlayer.gui.project_exporter import ProjectExporter
 
-from umlayer.gui.graphics_view import GraphicsView
+from umlayer.gui.graphics_view import GraphicsView, RenderProfile
+from umlayer.gui.performance_hud import PerformanceHud
 from umlayer.gui.tree_view import TreeView
+from umlayer.gui.search_panel import SearchPanel
 from umlayer.gui.actions import Actions
 
 from umlayer.gui.mainwindow import MainWindow
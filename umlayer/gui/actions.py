@@ -1,4 +1,6 @@
-from PySide6.QtGui import QAction, QIcon, QKeySequence
+from PySide6.QtGui import QAction, QActionGroup, QIcon, QKeySequence
+
+from . import RenderProfile
 
 
 class Actions:
@@ -27,6 +29,13 @@ class Actions:
             triggered=self.window.openProject,
         )
 
+        self.openReadOnlyAction = QAction(
+            text="Open read-only...",
+            statusTip="Open project for viewing without locking the file",
+            parent=self.window,
+            triggered=self.window.openProjectReadOnly,
+        )
+
         self.saveAction = QAction(
             icon=QIcon("icons:save.png"),
             text="&Save",
@@ -68,6 +77,20 @@ class Actions:
             triggered=self.window.exportAsSvgImageHandler,
         )
 
+        self.exportProjectAsSvgImagesAction = QAction(
+            text="Export project as SVG images...",
+            statusTip="Export all diagrams of the project as SVG images",
+            parent=self.window,
+            triggered=self.window.exportProjectAsSvgImagesHandler,
+        )
+
+        self.exportProjectAsRasterImagesAction = QAction(
+            text="Export project as PNG images...",
+            statusTip="Export all diagrams of the project as PNG images",
+            parent=self.window,
+            triggered=self.window.exportProjectAsRasterImagesHandler,
+        )
+
         self.aboutAction = QAction(
             icon=QIcon("icons:about.png"),
             text="A&bout",
@@ -134,6 +157,22 @@ class Actions:
             checkable=True,
         )
 
+        self.togglePerformanceHudAction = QAction(
+            text="&Performance HUD",
+            statusTip="Show frame time and hot path rates in the status bar",
+            parent=self.window,
+            checkable=True,
+            toggled=self.window.setPerformanceHudActive,
+        )
+
+        self.recordTraceAction = QAction(
+            text="Record &trace",
+            statusTip="Record a trace of the hot paths, saved when recording stops",
+            parent=self.window,
+            checkable=True,
+            toggled=self.window.setTraceRecording,
+        )
+
         self.deleteAction = QAction(
             icon=QIcon("icons:delete.png"),
             text="&Delete",
@@ -242,6 +281,22 @@ class Actions:
             triggered=self.window.scene_logic.addPackageElement,
         )
 
+        self.undoAction = QAction(
+            text="&Undo",
+            statusTip="Undo the last change",
+            parent=self.window,
+            shortcut=QKeySequence.Undo,
+            triggered=self.window.undo,
+        )
+
+        self.redoAction = QAction(
+            text="&Redo",
+            statusTip="Redo the last undone change",
+            parent=self.window,
+            shortcut=QKeySequence.Redo,
+            triggered=self.window.redo,
+        )
+
         self.bringToFrontAction = QAction(
             icon=QIcon("icons:bring_to_front.png"),
             text="Bring to &Front",
@@ -260,6 +315,14 @@ class Actions:
             triggered=self.window.scene_logic.send_to_back,
         )
 
+        self.findElementsAction = QAction(
+            text="Find in project",
+            statusTip="Find diagram elements by text (Ctrl-Shift-F)",
+            shortcut="Ctrl+Shift+F",
+            parent=self.window,
+            triggered=self.window.findElements,
+        )
+
         self.printProjectAction = QAction(
             icon=QIcon("icons:miscellaneous.png"),
             text="Print project data",
@@ -268,6 +331,24 @@ class Actions:
             triggered=self.window.printProjectItems,
         )
 
+        self.renderProfileActionGroup = QActionGroup(self.window)
+        self.renderProfileActions = {}
+        for profile, text, status_tip in [
+            (RenderProfile.QUALITY, "&Quality", "Paint diagrams at the best quality"),
+            (RenderProfile.BALANCED, "&Balanced", "Paint diagrams smoothly and fast"),
+            (RenderProfile.FAST, "&Fast", "Paint diagrams fast, without antialiasing"),
+        ]:
+            action = QAction(
+                text=text,
+                statusTip=status_tip,
+                parent=self.renderProfileActionGroup,
+                checkable=True,
+            )
+            action.triggered.connect(
+                lambda checked, profile=profile: self.window.setRenderProfile(profile)
+            )
+            self.renderProfileActions[profile] = action
+
         # line icon size: 110 x 40
 
         self.lineActions = [
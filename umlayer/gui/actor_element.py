@@ -8,7 +8,17 @@ from PySide6.QtWidgets import (
     QStyleOptionGraphicsItem,
 )
 
-from . import gui_utils, Settings, Abilities, BaseElement, TextItem
+from umlayer import instrumentation
+
+from . import (
+    gui_utils,
+    Settings,
+    PaintKind,
+    paint_resource,
+    Abilities,
+    BaseElement,
+    TextItem,
+)
 
 
 class ActorElement(BaseElement):
@@ -67,21 +77,17 @@ class ActorElement(BaseElement):
         path.addRect(self.rect())
         return path
 
+    @instrumentation.measured("paint")
     def paint(
         self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None
     ) -> None:
-        pen = (
-            Settings.ELEMENT_SELECTED_PEN
-            if self.isSelected()
-            else Settings.ELEMENT_NORMAL_PEN
-        )
+        pen = paint_resource(PaintKind.ELEMENT, self.isSelected()).pen
         self._setElementPen(pen)
 
         self._text_item.setColor(self.textColor())
 
-        if self.isSelected():
-            shape_pen = Settings.ELEMENT_SHAPE_SELECTED_PEN
-            painter.setPen(shape_pen)
+        if self.isSelected() and not self.isSimplified(painter, option):
+            painter.setPen(paint_resource(PaintKind.SHAPE, True).pen)
             painter.drawPath(self.shape())
 
     def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value):
@@ -123,4 +129,9 @@ class ActorElement(BaseElement):
 
     def _setElementPen(self, pen):
         for item in self.items:
-            item.setPen(pen)
+            # the element sets the pen on every paint, a new pen repaints the item
+            if item.pen() != pen:
+                item.setPen(pen)
+
+
+instrumentation.instrument(ActorElement, _recalculate="recalculate")
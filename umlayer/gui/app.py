@@ -6,6 +6,8 @@ from PySide6.QtWidgets import QApplication
 
 import umlayer
 
+logger = logging.getLogger(__name__)
+
 
 class UMLayerApplication(QApplication):
     """UMLayer application class.
@@ -25,4 +27,4 @@ class UMLayerApplication(QApplication):
             "icons", os.path.join(umlayer.__path__[0], "resources", "icons")
         )
 
-        logging.info("Application constructor finished")
+        logger.info("Application constructor finished")
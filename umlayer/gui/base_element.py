@@ -1,12 +1,14 @@
 import abc
 import importlib
 import json
+import uuid
 from enum import Enum
 
 from PySide6.QtCore import QPointF
-from PySide6.QtWidgets import QGraphicsItem
+from PySide6.QtGui import QPainter
+from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
 
-from . import Settings
+from . import Settings, gui_utils
 
 
 class Abilities(Enum):
@@ -16,6 +18,16 @@ class Abilities(Enum):
 class BaseElement(QGraphicsItem):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
+        self._element_id = uuid.uuid4().hex
+        self.setRenderCached(Settings.RENDER_CACHE_ENABLED)
+
+    def elementId(self) -> str:
+        """Returns the id of the element, kept when the diagram is stored"""
+        return self._element_id
+
+    def renewElementId(self) -> None:
+        """Gives the element a new id, e.g. when it becomes a copy"""
+        self._element_id = uuid.uuid4().hex
 
     def positionNotify(self, change):
         if self.scene() and change == QGraphicsItem.ItemPositionHasChanged:
@@ -23,7 +35,52 @@ class BaseElement(QGraphicsItem):
 
     def notify(self):
         if self.scene() is not None:
-            self.scene().notify()
+            self.scene().notify(self)
+
+    def beginGroupMove(self) -> None:
+        """Prepares the element to be moved by groupMoveBy
+
+        The scene snaps the delta of a group move once for all elements
+        and notifies them at once, so the element is not told about its
+        moves until endGroupMove.
+        """
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, False)
+
+    def groupMoveBy(self, delta: QPointF) -> None:
+        self.moveBy(delta.x(), delta.y())
+
+    def endGroupMove(self) -> None:
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
+
+    def isSimplified(self, painter: QPainter, option: QStyleOptionGraphicsItem) -> bool:
+        """Tells if the element is too small on the screen to paint its details"""
+        return (
+            gui_utils.level_of_detail(painter, option) < Settings.SIMPLIFIED_SHAPE_LOD
+        )
+
+    def isLive(self) -> bool:
+        """Tells if the element is being edited, e.g. moved or resized"""
+        return self.isSelected()
+
+    def updateCacheMode(self) -> None:
+        """Caches the painting of the element unless it is being edited
+
+        An edited element is painted differently on every change,
+        so its cached pixmap would be rendered again and again.
+        """
+        self.setRenderCached(Settings.RENDER_CACHE_ENABLED and not self.isLive())
+
+    def setRenderCached(self, cached: bool) -> None:
+        cache_mode = (
+            QGraphicsItem.DeviceCoordinateCache if cached else QGraphicsItem.NoCache
+        )
+        if self.cacheMode() != cache_mode:
+            self.setCacheMode(cache_mode)
+
+    def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value):
+        if change == QGraphicsItem.ItemSelectedHasChanged:
+            self.updateCacheMode()
+        return super().itemChange(change, value)
 
     def getAbilities(self):
         return self._abilities
@@ -44,6 +101,7 @@ class BaseElement(QGraphicsItem):
     def toDto(self):
         dto = {}
         dto["class_name"] = self.__class__.__name__
+        dto["id"] = self._element_id
         position = self.pos()
         dto["x"] = position.x()
         dto["y"] = position.y()
@@ -54,9 +112,18 @@ class BaseElement(QGraphicsItem):
     def setFromDto(self, dto):
         if dto["class_name"] != self.__class__.__name__:
             raise ValueError("dto")
+        # elements stored before ids were introduced keep the new id
+        self._element_id = dto.get("id", self._element_id)
         self.setPos(QPointF(dto["x"], dto["y"]))
         self.setZValue(dto["zValue"])
 
+    def updateFromDto(self, fields: dict) -> None:
+        """Changes the element by some fields of its dto"""
+        dto = self.toDto()
+        dto.update(fields)
+        self.setFromDto(dto)
+        self.notify()
+
     def clone(self):
         dto = self.toDto()
         element = self.__class__()
@@ -65,7 +132,10 @@ class BaseElement(QGraphicsItem):
 
     @staticmethod
     def fromJson(json_dto):
-        dto = json.loads(json_dto)
+        return BaseElement.fromDto(json.loads(json_dto))
+
+    @staticmethod
+    def fromDto(dto: dict):
         module_instance = importlib.import_module("umlayer.gui")
         class_name = dto["class_name"]
         element_class = getattr(module_instance, class_name)
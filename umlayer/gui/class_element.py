@@ -5,7 +5,17 @@ from PySide6.QtWidgets import (
     QStyleOptionGraphicsItem,
 )
 
-from . import gui_utils, Abilities, Settings, TextItem, ResizableElement
+from umlayer import instrumentation
+
+from . import (
+    gui_utils,
+    Abilities,
+    Settings,
+    PaintKind,
+    paint_resource,
+    TextItem,
+    ResizableElement,
+)
 
 
 class ClassElement(ResizableElement):
@@ -54,24 +64,23 @@ class ClassElement(ResizableElement):
     def shape(self) -> QPainterPath:
         return self._shape_path
 
+    @instrumentation.measured("paint")
     def paint(
         self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None
     ) -> None:
         for item in self._text_items:
             item.setColor(self.textColor())
 
-        pen = (
-            Settings.ELEMENT_SELECTED_PEN
-            if self.isSelected()
-            else Settings.ELEMENT_NORMAL_PEN
-        )
+        pen = paint_resource(PaintKind.ELEMENT, self.isSelected()).pen
         painter.setPen(pen)
+        if self.isSimplified(painter, option):
+            painter.drawRect(self._rect)
+            return
         for compartment in self._compartments:
             painter.drawRect(compartment)
 
         if self.isSelected():
-            shape_pen = Settings.ELEMENT_SHAPE_SELECTED_PEN
-            painter.setPen(shape_pen)
+            painter.setPen(paint_resource(PaintKind.SHAPE, True).pen)
             painter.drawPath(self.shape())
 
     def recalculate(self):
@@ -183,3 +192,6 @@ class ClassElement(ResizableElement):
             self._compartments[-1].adjust(0, 0, 0, height1 - height)
             height = height1
         return height
+
+
+instrumentation.instrument(ClassElement, recalculate="recalculate")
@@ -2,7 +2,17 @@ from PySide6.QtCore import QRectF
 from PySide6.QtGui import QPainter, QPainterPath
 from PySide6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
 
-from . import gui_utils, Abilities, Settings, TextItem, ResizableElement
+from umlayer import instrumentation
+
+from . import (
+    gui_utils,
+    Abilities,
+    Settings,
+    PaintKind,
+    paint_resource,
+    TextItem,
+    ResizableElement,
+)
 
 
 class EllipseElement(ResizableElement):
@@ -51,22 +61,18 @@ class EllipseElement(ResizableElement):
     def shape(self) -> QPainterPath:
         return self._shape_path
 
+    @instrumentation.measured("paint")
     def paint(
         self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None
     ) -> None:
         self._text_item.setColor(self.textColor())
 
-        pen = (
-            Settings.ELEMENT_SELECTED_PEN
-            if self.isSelected()
-            else Settings.ELEMENT_NORMAL_PEN
-        )
+        pen = paint_resource(PaintKind.ELEMENT, self.isSelected()).pen
         painter.setPen(pen)
         painter.drawEllipse(self.rect())
 
-        if self.isSelected():
-            shape_pen = Settings.ELEMENT_SHAPE_SELECTED_PEN
-            painter.setPen(shape_pen)
+        if self.isSelected() and not self.isSimplified(painter, option):
+            painter.setPen(paint_resource(PaintKind.SHAPE, True).pen)
             painter.drawPath(self.shape())
 
     def recalculate(self):
@@ -94,3 +100,6 @@ class EllipseElement(ResizableElement):
         self._shape_path = path
 
         self.updateHandlePositions()
+
+
+instrumentation.instrument(EllipseElement, recalculate="recalculate")
@@ -1,25 +1,46 @@
 from PySide6.QtCore import Qt, QRect
 from PySide6.QtGui import QImage, QPainter, QBrush
-from PySide6.QtSvg import QSvgGenerator
-from PySide6.QtWidgets import QGraphicsScene
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsScene
 
-from . import GraphicsScene
+from umlayer import model
+from . import GraphicsScene, BaseElement
 
 
 class ExportScene(QGraphicsScene):
-    def __init__(self, scene: GraphicsScene):
-        super().__init__(sceneRect=scene.sceneRect(), parent=scene.parent())
-        self._scene = scene
+    def __init__(self, scene: GraphicsScene = None, parent=None):
+        super().__init__(parent=parent if scene is None else scene.parent())
         self.setBackgroundBrush(QBrush(Qt.transparent))
         self.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
-        for element in self._scene.elements():
-            self.addItem(element.clone())
+        if scene is not None:
+            self.addElements(element.clone() for element in scene.elements())
+
+    @classmethod
+    def fromDiagram(cls, diagram: model.Diagram, parent=None) -> "ExportScene":
+        """Builds the scene from the stored diagram content"""
+        export_scene = cls(parent=parent)
+        export_scene.addElements(
+            BaseElement.fromJson(json_dto) for json_dto in diagram.dtos
+        )
+        return export_scene
+
+    def addElements(self, elements) -> None:
+        for element in elements:
+            # exported images are painted from the elements, not from pixmaps
+            for item in [element] + element.childItems():
+                item.setCacheMode(QGraphicsItem.NoCache)
+            self.addItem(element)
         self.new_scene_rect = self.itemsBoundingRect()
         self.setSceneRect(self.new_scene_rect)
         self.scene_size = self.new_scene_rect.size().toSize()
         self.clearSelection()
 
+    def notify(self, element=None):
+        """Exported elements never make the project dirty"""
+
     def exportAsSvgImage(self, filename) -> None:
+        # QtSvg is only needed for export, so it is not imported at startup
+        from PySide6.QtSvg import QSvgGenerator
+
         generator = QSvgGenerator()
         generator.setFileName(filename)
         generator.setSize(self.scene_size)
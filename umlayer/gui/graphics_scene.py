@@ -1,8 +1,18 @@
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QLineF, QRectF
 from PySide6.QtGui import QKeyEvent, QPainter
-from PySide6.QtWidgets import QGraphicsScene, QGraphicsItem
+from PySide6.QtWidgets import QGraphicsScene, QGraphicsItem, QGraphicsSceneMouseEvent
 
-from . import constants, Settings, SceneLogic, BaseElement
+from umlayer import instrumentation
+
+from . import (
+    gui_utils,
+    Settings,
+    SceneLogic,
+    GroupMove,
+    BaseElement,
+    ResizeHandleItem,
+    LineHandleItem,
+)
 
 
 class GraphicsScene(QGraphicsScene):
@@ -10,48 +20,47 @@ class GraphicsScene(QGraphicsScene):
         super().__init__(*args, **kwargs)
         self.init_grid()
         self._scene_logic: SceneLogic = scene_logic
+        self._elements_by_id: dict[str, BaseElement] = {}
+        # elements changed since the last call of takeChangedElements,
+        # None for removed ones
+        self._changed_elements: dict[str, BaseElement] = {}
+        # False once the elements have changed since the scene was stored
+        self._stored = True
+        self._group_move: GroupMove = None
+
+    def notify(self, element: BaseElement = None):
+        self._scene_logic.setDirty()
+        self._stored = False
+        if element is not None:
+            self._changed_elements[element.elementId()] = element
 
-    def notify(self):
+    def notifyElements(self, elements: list[BaseElement]) -> None:
+        """Notifies about many changed elements at once"""
         self._scene_logic.setDirty()
+        self._stored = False
+        for element in elements:
+            self._changed_elements[element.elementId()] = element
+
+    def takeChangedElements(self) -> dict[str, BaseElement]:
+        """Returns the elements changed since the last call, None for removed ones"""
+        changed_elements = self._changed_elements
+        self._changed_elements = {}
+        return changed_elements
+
+    def isStored(self) -> bool:
+        """Returns False if the elements have changed since setStored was called"""
+        return self._stored
+
+    def setStored(self) -> None:
+        self._stored = True
 
     def deselectAll(self):
         for item in self.selectedItems():
             item.setSelected(False)
 
     def init_grid(self):
-        self.lines = []
-        self.draw_grid()
-        self._is_grid_visible = True
-        self.set_grid_visible(False)
-        # self.delete_grid()
-
-    def draw_grid(self):
-        X = self.sceneRect().x()
-        Y = self.sceneRect().y()
-        width = int(self.sceneRect().width())
-        height = int(self.sceneRect().height())
-        num_blocks_x = int(width / Settings.BLOCK_SIZE)
-        num_blocks_y = int(height / Settings.BLOCK_SIZE)
         self.setItemIndexMethod(QGraphicsScene.NoIndex)
-
-        pen = Settings.GRID_PEN
-
-        small_z_value = -1e100
-
-        for x in range(0, num_blocks_x + 1):
-            xc = X + x * Settings.BLOCK_SIZE
-            line = self.addLine(xc, Y, xc, height, pen)
-            line.setZValue(small_z_value)
-            self.lines.append(line)
-
-        for y in range(0, num_blocks_y + 1):
-            yc = Y + y * Settings.BLOCK_SIZE
-            line = self.addLine(X, yc, width, yc, pen)
-            line.setZValue(small_z_value)
-            self.lines.append(line)
-
-        for line in self.lines:
-            line.setData(constants.ITEM_TYPE, "grid")
+        self._is_grid_visible = False
 
     def is_grid_visible(self):
         return self._is_grid_visible
@@ -60,13 +69,85 @@ class GraphicsScene(QGraphicsScene):
         if self._is_grid_visible is visible:
             return
         self._is_grid_visible = visible
-        for line in self.lines:
-            line.setVisible(visible)
-
-    def delete_grid(self):
-        for line in self.lines:
-            self.removeItem(line)
-        del self.lines[:]
+        self.invalidate(self.sceneRect(), QGraphicsScene.BackgroundLayer)
+
+    def addItem(self, item: QGraphicsItem) -> None:
+        super().addItem(item)
+        if isinstance(item, BaseElement):
+            self._elements_by_id[item.elementId()] = item
+            self._changed_elements[item.elementId()] = item
+            self._stored = False
+
+    def removeItem(self, item: QGraphicsItem) -> None:
+        if isinstance(item, BaseElement):
+            self._elements_by_id.pop(item.elementId(), None)
+            self._changed_elements[item.elementId()] = None
+            self._stored = False
+        super().removeItem(item)
+
+    def element(self, element_id: str) -> BaseElement:
+        """Returns the element of the scene with the id, or None"""
+        return self._elements_by_id.get(element_id)
+
+    def mousePressEvent(self, event: QGraphicsSceneMouseEvent) -> None:
+        super().mousePressEvent(event)
+        if event.button() == Qt.LeftButton:
+            # the elements a drag may move or resize
+            self._scene_logic.beginChange(self.changeableElements())
+            self._finishGroupMove()
+            self._group_move = self._startGroupMove(event.scenePos())
+
+    def mouseMoveEvent(self, event: QGraphicsSceneMouseEvent) -> None:
+        if self._group_move is not None and event.buttons() & Qt.LeftButton:
+            # the group move replaces the moves of the items by Qt
+            if self._group_move.moveTo(event.scenePos()):
+                self.notifyElements(self._group_move.elements())
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event: QGraphicsSceneMouseEvent) -> None:
+        super().mouseReleaseEvent(event)
+        if event.button() == Qt.LeftButton:
+            self._finishGroupMove()
+            self._scene_logic.endChange("Move elements")
+
+    def _finishGroupMove(self) -> None:
+        if self._group_move is not None:
+            self._group_move.finish()
+            self._group_move = None
+
+    def _startGroupMove(self, mouse_position) -> GroupMove:
+        """Returns the group move of the selected elements, or None
+
+        A group move starts when a selected element is dragged together
+        with enough other ones. A selected handle of an element that is
+        not selected resizes the element, which a group move cannot do.
+        """
+        anchor = self.mouseGrabberItem()
+        if not isinstance(anchor, BaseElement) or not anchor.isSelected():
+            return None
+        selected_items = self.selectedItems()
+        elements = self._filter_elements(selected_items)
+        if len(elements) < Settings.GROUP_MOVE_MIN_ELEMENTS:
+            return None
+        for item in selected_items:
+            if (
+                isinstance(item, (ResizeHandleItem, LineHandleItem))
+                and not item.element().isSelected()
+            ):
+                return None
+        return GroupMove(anchor, elements, mouse_position)
+
+    def changeableElements(self) -> list[BaseElement]:
+        """Returns selected elements and elements with selected handles"""
+        elements = {}
+        for item in self.selectedItems():
+            if isinstance(item, (ResizeHandleItem, LineHandleItem)):
+                item = item.element()
+            if isinstance(item, BaseElement):
+                elements[item.elementId()] = item
+        return list(elements.values())
 
     def keyPressEvent(self, event: QKeyEvent):
         super().keyPressEvent(event)
@@ -94,18 +175,42 @@ class GraphicsScene(QGraphicsScene):
             self.removeItem(element)
 
     def printItems(self):
-        items = [
-            item for item in self.items() if item.data(constants.ITEM_TYPE) != "grid"
-        ]
-        for i, item in enumerate(items):
+        for i, item in enumerate(self.items()):
             print(i, item)
 
     def _filter_elements(self, items: list[QGraphicsItem]) -> list[BaseElement]:
         return [item for item in items if isinstance(item, BaseElement)]
 
-    def drawBackground(self, painter: QPainter, rect) -> None:
+    def drawBackground(self, painter: QPainter, rect: QRectF) -> None:
         super().drawBackground(painter, rect)
-        # TODO: more effective grid?
-        # create vector image of the grid
-        # store it in an attribute
-        # use it to redraw the grid at the background
+        if self._is_grid_visible:
+            self._drawGrid(painter, rect)
+
+    def _drawGrid(self, painter: QPainter, rect: QRectF) -> None:
+        """Draws the grid lines crossing the rectangle
+
+        Views with the background cache draw the grid only when they
+        are scrolled or scaled.
+        """
+        block_size = Settings.BLOCK_SIZE
+        if painter.worldTransform().m11() * block_size < Settings.GRID_MIN_SPACING:
+            # the grid is too dense to be seen
+            return
+        area = rect.intersected(self.sceneRect())
+        if area.isEmpty():
+            return
+        left = gui_utils.snap_up(area.left())
+        top = gui_utils.snap_up(area.top())
+        lines = [
+            QLineF(x, area.top(), x, area.bottom())
+            for x in range(int(left), int(area.right()) + 1, block_size)
+        ]
+        lines.extend(
+            QLineF(area.left(), y, area.right(), y)
+            for y in range(int(top), int(area.bottom()) + 1, block_size)
+        )
+        painter.setPen(Settings.GRID_PEN)
+        painter.drawLines(lines)
+
+
+instrumentation.instrument(GraphicsScene, notify="notify", notifyElements="notify")
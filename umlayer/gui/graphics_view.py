@@ -2,13 +2,67 @@
 
 """
 
+from enum import Enum
+from typing import NamedTuple
+
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QMouseEvent, QFocusEvent, QWheelEvent
+from PySide6.QtGui import (
+    QMouseEvent,
+    QFocusEvent,
+    QPainter,
+    QPaintEvent,
+    QWheelEvent,
+)
 from PySide6.QtWidgets import QFrame, QScrollBar, QGraphicsView
 
+from umlayer import instrumentation
+
+
+class RenderProfile(Enum):
+    QUALITY = "quality"
+    BALANCED = "balanced"
+    FAST = "fast"
+
+
+class RenderSettings(NamedTuple):
+    viewport_update_mode: QGraphicsView.ViewportUpdateMode
+    optimization_flags: QGraphicsView.OptimizationFlag
+    cache_mode: QGraphicsView.CacheModeFlag
+    render_hints: QPainter.RenderHint
+
+
+_render_settings = {
+    # Qt defaults with all the render hints
+    RenderProfile.QUALITY: RenderSettings(
+        QGraphicsView.MinimalViewportUpdate,
+        QGraphicsView.OptimizationFlag(0),
+        QGraphicsView.CacheNone,
+        QPainter.Antialiasing
+        | QPainter.TextAntialiasing
+        | QPainter.SmoothPixmapTransform
+        | QPainter.VerticalSubpixelPositioning,
+    ),
+    # elements restore the painter state they change themselves,
+    # the grid is painted once into the cached background
+    RenderProfile.BALANCED: RenderSettings(
+        QGraphicsView.SmartViewportUpdate,
+        QGraphicsView.DontSavePainterState,
+        QGraphicsView.CacheBackground,
+        QPainter.Antialiasing | QPainter.TextAntialiasing,
+    ),
+    # no antialiasing: updated areas need no margins for it
+    RenderProfile.FAST: RenderSettings(
+        QGraphicsView.BoundingRectViewportUpdate,
+        QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing,
+        QGraphicsView.CacheBackground,
+        QPainter.TextAntialiasing,
+    ),
+}
+
 
 class GraphicsView(QGraphicsView):
     step_ticks = 120
+    default_render_profile = RenderProfile.BALANCED
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -18,6 +72,30 @@ class GraphicsView(QGraphicsView):
         self.onFocused(False)
         self.last_ticks: int = 0
         self.current_ticks: int = 0
+        self._render_profile: RenderProfile = None
+        self.setRenderProfile(self.default_render_profile)
+
+    def renderProfile(self) -> RenderProfile:
+        return self._render_profile
+
+    def setRenderProfile(self, profile: RenderProfile) -> None:
+        """Sets how the view trades painting quality for speed"""
+        if profile == self._render_profile:
+            return
+        self._render_profile = profile
+        render_settings = _render_settings[profile]
+        self.setViewportUpdateMode(render_settings.viewport_update_mode)
+        for flag in (
+            QGraphicsView.DontSavePainterState,
+            QGraphicsView.DontAdjustForAntialiasing,
+        ):
+            self.setOptimizationFlag(
+                flag, bool(render_settings.optimization_flags & flag)
+            )
+        self.setCacheMode(render_settings.cache_mode)
+        self.setRenderHints(render_settings.render_hints)
+        self.resetCachedContent()
+        self.viewport().update()
 
     @property
     def window(self):
@@ -90,6 +168,10 @@ class GraphicsView(QGraphicsView):
         self.onFocused(False)
         super().focusOutEvent(event)
 
+    @instrumentation.measured("frame")
+    def paintEvent(self, event: QPaintEvent) -> None:
+        super().paintEvent(event)
+
     def onFocused(self, is_focused: bool) -> None:
         self.setFrameStyle(
             QFrame.Panel | (QFrame.Plain if is_focused else QFrame.Sunken)
@@ -0,0 +1,42 @@
+from PySide6.QtCore import QPointF
+
+from . import gui_utils, BaseElement
+
+
+class GroupMove:
+    """Moves selected elements together while one of them is dragged
+
+    Qt moves every selected item by itself, so each element would snap
+    its position and recalculate itself on every mouse move. A group move
+    snaps the position of the dragged element once and moves all elements
+    by the same delta, until it is finished.
+    """
+
+    def __init__(
+        self, anchor: BaseElement, elements: list[BaseElement], mouse_position: QPointF
+    ) -> None:
+        self._anchor = anchor
+        self._anchor_position = anchor.pos()
+        self._elements = elements
+        self._mouse_position = mouse_position
+        for element in elements:
+            element.beginGroupMove()
+
+    def elements(self) -> list[BaseElement]:
+        return self._elements
+
+    def moveTo(self, mouse_position: QPointF) -> bool:
+        """Moves the elements after the mouse, tells if they have moved"""
+        position = gui_utils.snap_position(
+            self._anchor_position + mouse_position - self._mouse_position
+        )
+        delta = position - self._anchor.pos()
+        if delta.isNull():
+            return False
+        for element in self._elements:
+            element.groupMoveBy(delta)
+        return True
+
+    def finish(self) -> None:
+        for element in self._elements:
+            element.endGroupMove()
@@ -1,6 +1,8 @@
 import math
 
 from PySide6.QtCore import QPointF, QSizeF
+from PySide6.QtGui import QPainter
+from PySide6.QtWidgets import QStyleOptionGraphicsItem
 
 from . import Settings
 
@@ -25,6 +27,11 @@ def snap_size(size: QSizeF) -> QSizeF:
     return QSizeF(snap(size.x()), snap(size.y()))
 
 
+def level_of_detail(painter: QPainter, option: QStyleOptionGraphicsItem) -> float:
+    """Returns the scale of the painted item on the screen, 1 at 100% zoom"""
+    return option.levelOfDetailFromTransform(painter.worldTransform())
+
+
 def split_to_sections(text) -> list[str]:
     """ "Return the list of text sections.
 
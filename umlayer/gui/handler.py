@@ -1,5 +1,6 @@
 from PySide6.QtCore import QPointF
 from PySide6.QtWidgets import (
+    QGraphicsItem,
     QGraphicsScene,
 )
 
@@ -42,6 +43,11 @@ class Handler(object):
         for handle in self._handle.values():
             handle.moveBy(delta.x(), delta.y())
 
+    def setSendsGeometryChanges(self, enabled: bool) -> None:
+        """Tells if the handles check their moves, e.g. not in a group move"""
+        for handle in self._handle.values():
+            handle.setFlag(QGraphicsItem.ItemSendsGeometryChanges, enabled)
+
     def setLive(self, is_live: bool) -> None:
         for handle in self._handle.values():
             handle.setLive(is_live)
@@ -1,7 +1,7 @@
 from enum import Enum
 
 from PySide6.QtCore import Qt, QPointF, QRectF, QLineF
-from PySide6.QtGui import QPainter, QPainterPath, QPen
+from PySide6.QtGui import QPainter, QPainterPath
 from PySide6.QtWidgets import (
     QApplication,
     QGraphicsItem,
@@ -9,11 +9,16 @@ from PySide6.QtWidgets import (
     QStyleOptionGraphicsItem,
 )
 
+from umlayer import instrumentation
+
 from . import (
     gui_utils,
     Abilities,
     BaseElement,
     Settings,
+    PaintKind,
+    paint_resource,
+    paint_resources,
     Handler,
     NoTip,
     Tip,
@@ -77,11 +82,13 @@ class LineElement(BaseElement):
 
     def _createHandles(self):
         self._handler.handle[1] = LineHandleItem(
+            self,
             Settings.LINE_HANDLE_SIZE,
             self.calculateHandlePositionChange,
             name="1",
         )
         self._handler.handle[2] = LineHandleItem(
+            self,
             Settings.LINE_HANDLE_SIZE,
             self.calculateHandlePositionChange,
             name="2",
@@ -135,6 +142,10 @@ class LineElement(BaseElement):
         )
         self._is_live = is_really_live
         self._handler.setLive(is_really_live)
+        self.updateCacheMode()
+
+    def isLive(self) -> bool:
+        return self.isSelected() or self._handler.is_handle_selected()
 
     def toDto(self):
         dto = super().toDto()
@@ -161,6 +172,8 @@ class LineElement(BaseElement):
         self.prepareGeometryChange()
 
         self._parse_text()
+        # the line type and tips may have changed
+        self._paint_resources_generation = None
 
         position = QPointF(
             min(self._pos1.x(), self._pos2.x()), min(self._pos1.y(), self._pos2.y())
@@ -237,6 +250,21 @@ class LineElement(BaseElement):
         self.recalculate()
         return position
 
+    def beginGroupMove(self) -> None:
+        super().beginGroupMove()
+        self._handler.setSendsGeometryChanges(False)
+
+    def groupMoveBy(self, delta: QPointF) -> None:
+        """Translates the line with its handles, its shape does not change"""
+        self._pos1 = self._pos1 + delta
+        self._pos2 = self._pos2 + delta
+        super().groupMoveBy(delta)
+        self._handler.moveBy(delta)
+
+    def endGroupMove(self) -> None:
+        super().endGroupMove()
+        self._handler.setSendsGeometryChanges(True)
+
     def isPositionChangeAccepted(self) -> bool:
         return self._isPositionChangeAccepted
 
@@ -303,6 +331,7 @@ class LineElement(BaseElement):
         LineType.Dot: Qt.DotLine,
     }
 
+    @instrumentation.measured("paint")
     def paint(
         self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None
     ) -> None:
@@ -312,25 +341,29 @@ class LineElement(BaseElement):
         x2 = self._tip2_figure.point().x()
         y2 = self._tip2_figure.point().y()
 
-        pen = (
-            Settings.LINE_SELECTED_PEN
-            if self.isSelected()
-            else Settings.ELEMENT_NORMAL_PEN
-        )
+        if self._paint_resources_generation != paint_resources.generation:
+            self._updatePaintResources()
+        line_pen, tip1_resource, tip2_resource = self._paint_resources[
+            self.isSelected()
+        ]
 
-        line_pen = QPen(pen)
-        line_pen_style = self._pen_style_from_line_type[self._line_type]
-        line_pen.setStyle(line_pen_style)
+        if self.isSimplified(painter, option):
+            # neither line styles nor tips are visible
+            painter.setPen(tip1_resource.pen)
+            painter.drawLine(x1, y1, x2, y2)
+            return
 
         painter.setPen(line_pen)
         painter.drawLine(x1, y1, x2, y2)
 
-        painter.setPen(pen)
-        painter.setBrush(self._get_tip_brush(self._tip1))
+        painter.setPen(tip1_resource.pen)
+        painter.setBrush(tip1_resource.brush)
         self._tip1_figure.paint(painter)
 
-        painter.setBrush(self._get_tip_brush(self._tip2))
+        painter.setBrush(tip2_resource.brush)
         self._tip2_figure.paint(painter)
+        # the view may not restore the painter state after items
+        painter.setBrush(Qt.NoBrush)
 
         # pen = Settings.ELEMENT_SELECTED_PEN if self.isSelected() else Settings.ELEMENT_NORMAL_PEN
         # painter.setPen(pen)
@@ -339,24 +372,32 @@ class LineElement(BaseElement):
         #
         # painter.drawPath(self.shape())
 
-    def _get_tip_brush(self, tip_type):
-        if tip_type in [
-            TipType.FullTriangle,
-            TipType.FullDiamond,
-            TipType.FullHalfTriangle,
-        ]:
-            brush = (
-                Settings.LINE_SELECTED_BRUSH
-                if self.isSelected()
-                else Settings.ELEMENT_NORMAL_BRUSH
-            )
-        else:
-            brush = (
-                Settings.ELEMENT_SELECTED_TRANSPARENT_BRUSH
-                if self.isSelected()
-                else Settings.ELEMENT_NORMAL_TRANSPARENT_BRUSH
+    def _updatePaintResources(self) -> None:
+        """Takes the pens and brushes for the line type and tips, unselected and selected"""
+        line_pen_style = self._pen_style_from_line_type[self._line_type]
+        self._paint_resources = tuple(
+            (
+                paint_resource(PaintKind.LINE, selected, line_pen_style).pen,
+                paint_resource(
+                    PaintKind.LINE,
+                    selected,
+                    filled=self._tip1 in self._filled_tip_types,
+                ),
+                paint_resource(
+                    PaintKind.LINE,
+                    selected,
+                    filled=self._tip2 in self._filled_tip_types,
+                ),
             )
-        return brush
+            for selected in (False, True)
+        )
+        self._paint_resources_generation = paint_resources.generation
+
+    _filled_tip_types = {
+        TipType.FullTriangle,
+        TipType.FullDiamond,
+        TipType.FullHalfTriangle,
+    }
 
     def _handle_selection_changed(self, is_selected):
         self.setLive(is_selected)
@@ -431,3 +472,6 @@ class LineElement(BaseElement):
         self._tip2 = TipType.Empty
         if len(tips) > 1:
             self._tip2 = self._tip2_type_from_txt.get(tips[1]) or TipType.Empty
+
+
+instrumentation.instrument(LineElement, recalculate="recalculate")
@@ -14,9 +14,15 @@ class LineHandleItem(QGraphicsObject):
     selection_changed_signal = Signal(bool)
 
     def __init__(
-        self, size: int, calculateHandlePositionChange, name: str = "", parent=None
+        self,
+        element,
+        size: int,
+        calculateHandlePositionChange,
+        name: str = "",
+        parent=None,
     ):
         super().__init__(parent)
+        self._element = element
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setFlag(QGraphicsItem.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
@@ -36,6 +42,10 @@ class LineHandleItem(QGraphicsObject):
     def __str__(self):
         return f"<Handle {self._name} size={self.size}: {self.pos().x()}, {self.pos().y()}>"
 
+    def element(self):
+        """Returns the element changed by the handle"""
+        return self._element
+
     def isPositionChangeAccepted(self) -> bool:
         return self._isPositionChangeAccepted
 
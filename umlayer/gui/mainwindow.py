@@ -2,10 +2,18 @@ import logging
 import traceback
 from uuid import UUID
 
-from PySide6.QtCore import Qt, QSettings, QDir, QItemSelection, QByteArray
+from PySide6.QtCore import (
+    Qt,
+    QSettings,
+    QDir,
+    QItemSelection,
+    QByteArray,
+    QTimer,
+    QEventLoop,
+)
 
 from PySide6.QtGui import (
-    QPainter,
+    QPixmapCache,
     QTextOption,
     QKeySequence,
     QShortcut,
@@ -21,19 +29,25 @@ from PySide6.QtWidgets import (
     QComboBox,
     QPushButton,
     QLabel,
+    QLineEdit,
     QDockWidget,
     QPlainTextEdit,
     QVBoxLayout,
     QWidget,
+    QApplication,
 )
 
-from umlayer import version, model, adapters
+from umlayer import version, model, adapters, tracing
 
 from . import (
     GraphicsScene,
     ExportScene,
+    ProjectExporter,
     GraphicsView,
+    RenderProfile,
+    PerformanceHud,
     TreeView,
+    SearchPanel,
     LineIconsProxyStyle,
     Settings,
     Actions,
@@ -41,6 +55,14 @@ from . import (
     Abilities,
 )
 
+logger = logging.getLogger(__name__)
+
+# delay between the last key press in the tree filter and filtering, milliseconds
+TREE_FILTER_DELAY = 150
+
+# interval between writes of the journal of unsaved changes, milliseconds
+JOURNAL_FLUSH_INTERVAL = 2000
+
 
 class MainWindow(QMainWindow):
     """Main window of the UMLayer application"""
@@ -51,12 +73,15 @@ class MainWindow(QMainWindow):
 
         self._interactors = interactors
         self._data_model = data_model
+        self.undo_stack = model.UndoStack(on_changed=self.updateUndoActions)
+        self._render_profile = GraphicsView.default_render_profile
 
     def initialize(self):
         self.scene_logic.setWindow(self)
         self.readSettings()
         self.initGUI()
-        self.createNewProject()
+        # the window is shown before the project is created
+        QTimer.singleShot(0, self.createNewProject)
 
     @property
     def filename(self) -> str:
@@ -70,35 +95,44 @@ class MainWindow(QMainWindow):
         self._interactors.project_interactor.set_dirty(dirty)
 
     def setProjectItemName(self, item_id: UUID, name: str) -> None:
+        old_name = self.project.get(item_id).name()
         self._interactors.project_interactor.set_project_item_name(item_id, name)
+        if self.project.get(item_id).name() != old_name:
+            self.undo_stack.push(
+                model.RenameItemCommand(self.project, item_id, old_name, name)
+            )
 
     def createFolder(self) -> None:
-        logging.info("Action: Create Folder")
+        logger.info("Action: Create Folder")
         self.createProjectItem(model.ProjectItemType.FOLDER)
 
     def createDiagram(self) -> None:
-        logging.info("Action: Create Diagram")
+        logger.info("Action: Create Diagram")
         self.createProjectItem(model.ProjectItemType.DIAGRAM)
 
     def createNewProject(self) -> None:
-        logging.info("Action: New project")
+        logger.info("Action: New project")
         self._interactors.project_interactor.create_new_project()
 
     def openProject(self) -> None:
-        logging.info("Action: Open")
+        logger.info("Action: Open")
         self._interactors.project_interactor.open_project()
 
+    def openProjectReadOnly(self) -> None:
+        logger.info("Action: Open read-only")
+        self._interactors.project_interactor.open_project(read_only=True)
+
     def saveProject(self) -> None:
-        logging.info("Action: Save")
+        logger.info("Action: Save")
         self._interactors.project_interactor.save_project()
 
     def saveProjectAs(self) -> None:
-        logging.info("Action: Save As")
+        logger.info("Action: Save As")
         self._interactors.project_interactor.save_project_as()
 
     def closeProject(self) -> bool:
         """Returns True if project was closed successfully, False otherwise"""
-        logging.info("Action: Close")
+        logger.info("Action: Close")
         return self._interactors.project_interactor.close_project()
 
     def askToSaveModifiedProject(self) -> None:
@@ -118,13 +152,25 @@ class MainWindow(QMainWindow):
     def showCriticalError(self, message: str) -> None:
         QMessageBox.critical(self, "Error!", message, QMessageBox.Abort)
 
+    def showLoadingProgress(self, loaded: int, total: int) -> None:
+        self.aStatusBar.showMessage(f"Loading project: {loaded} of {total} items")
+        # keep the window painted, but do not let the user act on a half-loaded project
+        QApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
+
     def isDirty(self) -> bool:
         return self._interactors.project_interactor.is_dirty()
 
     def updateTitle(self) -> None:
-        title = model.utils.build_window_title(self.filename, self.isDirty())
+        title = model.utils.build_window_title(
+            self.filename, self.isDirty(), self._data_model.read_only
+        )
         self.setWindowTitle(title)
         self.updateToolbar()
+        self.updateStatistics()
+
+    def updateStatistics(self) -> None:
+        project = self.project
+        self.statisticsLabel.setText("" if project is None else str(project.stats))
 
     def updateToolbar(self) -> None:
         is_dirty = self.isDirty()
@@ -133,6 +179,8 @@ class MainWindow(QMainWindow):
         project_is_open = self.project is not None
         self.app_actions.saveAsAction.setEnabled(project_is_open)
         self.app_actions.closeAction.setEnabled(project_is_open)
+        self.app_actions.exportProjectAsSvgImagesAction.setEnabled(project_is_open)
+        self.app_actions.exportProjectAsRasterImagesAction.setEnabled(project_is_open)
         self.app_actions.bringToFrontAction.setEnabled(project_is_open)
         self.app_actions.sendToBackAction.setEnabled(project_is_open)
 
@@ -141,9 +189,24 @@ class MainWindow(QMainWindow):
         settings.beginGroup("MainWindow")
         settings.setValue("geometry", self.saveGeometry())
         settings.endGroup()
+        settings.beginGroup("Undo")
+        settings.setValue("byteBudget", self.undo_stack.byte_budget())
+        settings.endGroup()
+        settings.beginGroup("View")
+        settings.setValue("renderProfile", self.sceneView.renderProfile().value)
+        settings.endGroup()
+        settings.beginGroup("RenderCache")
+        settings.setValue("enabled", Settings.RENDER_CACHE_ENABLED)
+        settings.setValue("limitKb", Settings.RENDER_CACHE_LIMIT)
+        settings.endGroup()
+        settings.beginGroup("LevelOfDetail")
+        settings.setValue("greekedText", Settings.GREEKED_TEXT_LOD)
+        settings.setValue("hiddenText", Settings.HIDDEN_TEXT_LOD)
+        settings.setValue("simplifiedShapes", Settings.SIMPLIFIED_SHAPE_LOD)
+        settings.endGroup()
 
     def readSettings(self) -> None:
-        logging.info("Settings loading started")
+        logger.info("Settings loading started")
         settings = QSettings()
         settings.beginGroup("MainWindow")
         geometry_array = settings.value("geometry", QByteArray())
@@ -155,20 +218,67 @@ class MainWindow(QMainWindow):
         else:
             self.restoreGeometry(geometry_array)
 
-        logging.info("Geometry set: {0}".format(self.geometry()))
+        logger.info("Geometry set: %s", self.geometry())
+        settings.endGroup()
+        settings.beginGroup("Undo")
+        byte_budget = settings.value(
+            "byteBudget", model.undo_stack.DEFAULT_BYTE_BUDGET, type=int
+        )
+        self.undo_stack.set_byte_budget(byte_budget)
+        logger.info("Undo history budget: %s bytes", byte_budget)
+        settings.endGroup()
+        settings.beginGroup("View")
+        profile_name = settings.value(
+            "renderProfile", GraphicsView.default_render_profile.value, type=str
+        )
+        try:
+            self._render_profile = RenderProfile(profile_name)
+        except ValueError:
+            logger.warning("Unknown render profile %s", profile_name)
+        logger.info("Render profile: %s", self._render_profile.value)
+        settings.endGroup()
+        settings.beginGroup("RenderCache")
+        Settings.RENDER_CACHE_ENABLED = settings.value(
+            "enabled", Settings.RENDER_CACHE_ENABLED, type=bool
+        )
+        Settings.RENDER_CACHE_LIMIT = settings.value(
+            "limitKb", Settings.RENDER_CACHE_LIMIT, type=int
+        )
+        QPixmapCache.setCacheLimit(Settings.RENDER_CACHE_LIMIT)
+        logger.info(
+            "Render cache: %s, %s KB",
+            "on" if Settings.RENDER_CACHE_ENABLED else "off",
+            Settings.RENDER_CACHE_LIMIT,
+        )
+        settings.endGroup()
+        settings.beginGroup("LevelOfDetail")
+        Settings.GREEKED_TEXT_LOD = settings.value(
+            "greekedText", Settings.GREEKED_TEXT_LOD, type=float
+        )
+        Settings.HIDDEN_TEXT_LOD = settings.value(
+            "hiddenText", Settings.HIDDEN_TEXT_LOD, type=float
+        )
+        Settings.SIMPLIFIED_SHAPE_LOD = settings.value(
+            "simplifiedShapes", Settings.SIMPLIFIED_SHAPE_LOD, type=float
+        )
         settings.endGroup()
-        logging.info("Settings loading finished")
+        logger.info("Settings loading finished")
 
     def initGUI(self) -> None:
-        logging.info("GUI initialization started")
+        logger.info("GUI initialization started")
         self.setupComponents()
 
         self.treeView.selectionModel().selectionChanged.connect(
             self.on_selection_changed
         )
 
+        self.journalTimer = QTimer(self)
+        self.journalTimer.setInterval(JOURNAL_FLUSH_INTERVAL)
+        self.journalTimer.timeout.connect(self.flushJournal)
+        self.journalTimer.start()
+
         self.updateTitle()
-        logging.info("GUI initialization finished")
+        logger.info("GUI initialization finished")
 
     def setScaleIndex(self, index) -> None:
         self._scene_scale_combo.setCurrentIndex(index)
@@ -181,13 +291,13 @@ class MainWindow(QMainWindow):
 
     def _createSceneScaleCombo(self) -> QComboBox:
         scene_scale_combo = QComboBox()
-        min_scale = 50
+        min_scale = 10
         max_scale = 250
         scene_scale_combo.addItems(
             [f"{scale}%" for scale in range(min_scale, max_scale + 10, 10)]
         )
         scene_scale_combo.currentTextChanged.connect(self.scene_scale_changed)
-        scene_scale_combo.setCurrentIndex(5)  # 100%
+        scene_scale_combo.setCurrentText("100%")
         return scene_scale_combo
 
     def createToolBar(self) -> None:
@@ -246,6 +356,10 @@ class MainWindow(QMainWindow):
         self.aStatusBar = QStatusBar(self)
         self.aStatusLabel = QLabel(self.aStatusBar)
         self.aStatusBar.addWidget(self.aStatusLabel, 3)
+        self.performanceHud = PerformanceHud(self.aStatusBar)
+        self.aStatusBar.addPermanentWidget(self.performanceHud)
+        self.statisticsLabel = QLabel(self.aStatusBar)
+        self.aStatusBar.addPermanentWidget(self.statisticsLabel)
         self.setStatusBar(self.aStatusBar)
 
     def createElementsWindow(self) -> None:
@@ -263,11 +377,23 @@ class MainWindow(QMainWindow):
         property_window.setWidget(self.propertyView)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, property_window)
 
+    def createSearchWindow(self) -> None:
+        self.searchWindow = QDockWidget("Search", self)
+        self.searchPanel = SearchPanel(self, self.searchWindow)
+        self.searchWindow.setWidget(self.searchPanel)
+        self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.searchWindow)
+
     def on_text_changed(self) -> None:
-        if self.element_with_text is None:
+        element = self.element_with_text
+        if element is None:
             return
         text = self.propertyView.toPlainText()
-        self.element_with_text.setText(text)
+        if text == element.text():
+            return
+        self.scene_logic.beginChange([element])
+        element.setText(text)
+        # typing in the editor is undone as a whole
+        self.scene_logic.endChange("Edit text", merge_key=("text", element.elementId()))
 
     @staticmethod
     def isEditable(item: object) -> bool:
@@ -302,11 +428,10 @@ class MainWindow(QMainWindow):
 
         self.scene.selectionChanged.connect(self.on_scene_selection_changed)
 
+        self.performanceHud.setScene(self.scene)
+
         self.sceneView = GraphicsView(self.scene)
-        self.sceneView.setRenderHint(QPainter.Antialiasing)
-        self.sceneView.setRenderHint(QPainter.TextAntialiasing)
-        self.sceneView.setRenderHint(QPainter.SmoothPixmapTransform)
-        self.sceneView.setRenderHint(QPainter.VerticalSubpixelPositioning)
+        self.sceneView.setRenderProfile(self._render_profile)
 
         _ = QShortcut(
             QKeySequence.SelectAll,
@@ -329,9 +454,11 @@ class MainWindow(QMainWindow):
         self.createProjectTree()
         self.createElementsWindow()
         self.createPropertyEditor()
+        self.createSearchWindow()
         self.createCentralWidget()  # used in actions
 
         self.app_actions = Actions(self)
+        self.updateUndoActions()
         self.createMenu()
         self.createToolBar()
 
@@ -340,19 +467,26 @@ class MainWindow(QMainWindow):
     def createMenu(self) -> None:
         self.fileMenu = self.menuBar().addMenu("&File")
         self.editMenu = self.menuBar().addMenu("&Edit")
+        self.viewMenu = self.menuBar().addMenu("&View")
         self.helpMenu = self.menuBar().addMenu("&Help")
 
         self.fileMenu.addAction(self.app_actions.newAction)
         self.fileMenu.addAction(self.app_actions.openAction)
+        self.fileMenu.addAction(self.app_actions.openReadOnlyAction)
         self.fileMenu.addAction(self.app_actions.saveAction)
         self.fileMenu.addAction(self.app_actions.saveAsAction)
         self.fileMenu.addAction(self.app_actions.closeAction)
         self.fileMenu.addSeparator()
         self.fileMenu.addAction(self.app_actions.exportAsSvgImageAction)
         self.fileMenu.addAction(self.app_actions.exportAsRasterImageAction)
+        self.fileMenu.addAction(self.app_actions.exportProjectAsSvgImagesAction)
+        self.fileMenu.addAction(self.app_actions.exportProjectAsRasterImagesAction)
         self.fileMenu.addSeparator()
         self.fileMenu.addAction(self.app_actions.exitAction)
 
+        self.editMenu.addAction(self.app_actions.undoAction)
+        self.editMenu.addAction(self.app_actions.redoAction)
+        self.editMenu.addSeparator()
         self.editMenu.addAction(self.app_actions.cutAction)
         self.editMenu.addAction(self.app_actions.copyAction)
         self.editMenu.addAction(self.app_actions.pasteAction)
@@ -361,6 +495,20 @@ class MainWindow(QMainWindow):
         self.editMenu.addSeparator()
         self.editMenu.addAction(self.app_actions.bringToFrontAction)
         self.editMenu.addAction(self.app_actions.sendToBackAction)
+        self.editMenu.addSeparator()
+        self.editMenu.addAction(self.app_actions.findElementsAction)
+
+        self.viewMenu.addAction(self.app_actions.toggleGridAction)
+        self.viewMenu.addSeparator()
+        render_profile_menu = self.viewMenu.addMenu("&Render profile")
+        for action in self.app_actions.renderProfileActions.values():
+            render_profile_menu.addAction(action)
+        self.app_actions.renderProfileActions[self._render_profile].setChecked(True)
+        self.viewMenu.addSeparator()
+        self.viewMenu.addAction(self.app_actions.togglePerformanceHudAction)
+        self.viewMenu.addAction(self.app_actions.recordTraceAction)
+        # recording may be started by the environment
+        self.app_actions.recordTraceAction.setChecked(tracing.is_recording())
 
         self.helpMenu.addAction(self.app_actions.aboutAction)
         self.helpMenu.addAction(self.app_actions.aboutQtAction)
@@ -375,8 +523,9 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event) -> None:
         if self._interactors.project_interactor.save_project_if_needed():
+            self._interactors.project_interactor.release_storage()
             self.writeSettings()
-            logging.info("Main window closed")
+            logger.info("Main window closed")
             event.accept()
         else:
             event.ignore()
@@ -385,8 +534,7 @@ class MainWindow(QMainWindow):
         """Show context menu for item in the project tree"""
         if not self.treeView.isSelected():
             return
-        item = self.treeView.getSelectedItem()
-        project_item = self.projectItemFromItem(item)
+        project_item = self.getSelectedProjectItem()
         menu = QMenu(self.treeView)
         item_type = project_item.itemType
 
@@ -402,43 +550,72 @@ class MainWindow(QMainWindow):
 
         menu.exec(self.treeView.viewport().mapToGlobal(point))
 
-    def projectItemFromItem(self, item: adapters.StandardItem) -> model.BaseItem:
-        item_id = item.itemId()
-        project_item: model.BaseItem = self.project.get(item_id)
-        return project_item
-
     def _createTreeView(self) -> TreeView:
         tree_view: TreeView = TreeView(self)
         tree_view.customContextMenuRequested.connect(
             self.onTreeViewCustomContextMenuRequested
         )
         proxy_model: adapters.TreeSortModel = adapters.TreeSortModel(self)
-        proxy_model.setSourceModel(adapters.StandardItemModel())
+        proxy_model.setSourceModel(
+            adapters.ProjectTreeModel(self.setProjectItemName, proxy_model)
+        )
         tree_view.setModel(proxy_model)
         return tree_view
 
     def createProjectTree(self) -> None:
         self.treeView = self._createTreeView()
+
+        self.treeFilterEdit = QLineEdit()
+        self.treeFilterEdit.setPlaceholderText("Filter")
+        self.treeFilterEdit.setClearButtonEnabled(True)
+        self.treeFilterTimer = QTimer(self)
+        self.treeFilterTimer.setSingleShot(True)
+        self.treeFilterTimer.setInterval(TREE_FILTER_DELAY)
+        self.treeFilterTimer.timeout.connect(self.filterProjectTree)
+        self.treeFilterEdit.textChanged.connect(self.treeFilterTimer.start)
+        self.treeFilterEdit.returnPressed.connect(self.filterProjectTree)
+
+        tree_widget = QWidget()
+        vbox = QVBoxLayout(tree_widget)
+        vbox.setContentsMargins(0, 0, 0, 0)
+        vbox.setSpacing(2)
+        vbox.addWidget(self.treeFilterEdit)
+        vbox.addWidget(self.treeView)
+
         tree_window = QDockWidget("Project", self)
-        tree_window.setWidget(self.treeView)
+        tree_window.setWidget(tree_widget)
         self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, tree_window)
 
+    def filterProjectTree(self) -> None:
+        self.treeFilterTimer.stop()
+        if self.project is None:
+            return
+        query = self.treeFilterEdit.text()
+        item_ids = self.project.name_index.find(query) if query.strip() else None
+        self.treeView.applyFilter(item_ids)
+
+    def clearTreeFilter(self) -> None:
+        self.treeFilterEdit.clear()
+        self.treeFilterTimer.stop()
+
     def clearProjectTree(self) -> None:
+        self.undo_stack.clear()
+        self.clearTreeFilter()
         self.treeView.itemModel.clear()
+        self.searchPanel.clear()
 
     def disableScene(self) -> None:
         self.scene_logic.disableScene()
 
     def printStats(self) -> None:
         if self.project is not None:
-            print("number of elements", self.project.count())
-            print("number of items", self.treeView.itemModel.count())
+            print("project", self.project.stats)
+            print("number of tree rows", self.treeView.itemModel.count())
 
     def getSelectedProjectItem(self) -> model.BaseItem:
         if not self.treeView.isSelected():
             return None
-        item: adapters.StandardItem = self.treeView.getSelectedItem()
-        item_id: UUID = item.itemId()
+        item_id: UUID = self.treeView.getSelectedItemId()
         project_item: model.BaseItem = self.project.get(item_id)
         return project_item
 
@@ -458,6 +635,7 @@ class MainWindow(QMainWindow):
 
     def _add_project_item(self, element, parent_id):
         self.project.add(element, parent_id)
+        self.undo_stack.push(model.AddItemCommand(self.project, element))
 
     def create_folder(self, parent_id) -> model.BaseItem:
         project_item: model.BaseItem = model.Folder("New folder")
@@ -473,7 +651,10 @@ class MainWindow(QMainWindow):
         """Delete elements from model recursively"""
         if project_item_id == self.project.root.id:
             return
+        self.storeScene()  # the removed items keep unsaved changes for undo
+        removed_items = list(self.project.walk_breadth_first(project_item_id))
         self.project.remove(project_item_id)
+        self.undo_stack.push(model.RemoveItemCommand(self.project, removed_items))
 
     def setFilename(self, filename) -> None:
         self._interactors.set_filename(filename)
@@ -509,17 +690,12 @@ class MainWindow(QMainWindow):
         raise ValueError("item_type")
 
     def createProjectItem(self, item_type: model.ProjectItemType) -> None:
-        parent_item: adapters.StandardItem = self.treeView.getSelectedItem()
-        parent_model_index = parent_item.index()
-        parent_proxy_index = self.treeView.getProxyIndex(parent_model_index)
+        parent_id: UUID = self.treeView.getSelectedItemId()
+        parent_proxy_index = self.treeView.proxyIndexFromId(parent_id)
         self.treeView.expand(parent_proxy_index)  # treeView must use proxy index!
-        parent_id = parent_item.itemId()
 
         project_item = self._createProjectItem(parent_id, item_type)
-
-        item = adapters.makeItemFromProjectItem(project_item)
-        parent_item.appendRow([item])
-        self.treeView.startEditName(item)
+        self.treeView.startEditName(project_item.id)
         self.updateTitle()
 
     def getFileNameForRasterImageDialog(self) -> str:
@@ -547,6 +723,16 @@ class MainWindow(QMainWindow):
         )
         return filename
 
+    def getFileNameForTraceDialog(self) -> str:
+        filename, selected_filter = QFileDialog.getSaveFileName(
+            parent=self,
+            caption="Save trace",
+            dir=QDir.currentPath() + "/" + tracing.DEFAULT_TRACE_FILENAME,
+            filter="Chrome trace (*.json);;All (*)",
+            selectedFilter="Chrome trace (*.json)",
+        )
+        return filename
+
     def exportAsRasterImageHandler(self) -> None:
         filename = self.getFileNameForRasterImageDialog()
         if filename is None or len(filename.strip()) == 0:
@@ -554,9 +740,9 @@ class MainWindow(QMainWindow):
         try:
             export_scene = ExportScene(self.scene)
             export_scene.exportAsRasterImage(filename)
-            logging.info("The scene was exported as raster image")
+            logger.info("The scene was exported as raster image")
         except Exception:
-            logging.exception(traceback.format_exc())
+            logger.exception(traceback.format_exc())
             self.showCriticalError("Unable to export scene content as raster image!")
 
     def exportAsSvgImageHandler(self) -> None:
@@ -566,11 +752,40 @@ class MainWindow(QMainWindow):
         try:
             export_scene = ExportScene(self.scene)
             export_scene.exportAsSvgImage(filename)
-            logging.info("The scene was exported as SVG image")
+            logger.info("The scene was exported as SVG image")
         except Exception:
-            logging.exception(traceback.format_exc())
+            logger.exception(traceback.format_exc())
             self.showCriticalError("Unable to export scene content as SVG image!")
 
+    def getDirectoryForProjectExportDialog(self) -> str:
+        return QFileDialog.getExistingDirectory(
+            parent=self,
+            caption="Export project into directory",
+            dir=QDir.currentPath(),
+        )
+
+    def exportProjectAsSvgImagesHandler(self) -> None:
+        self.exportProjectAsImages("svg")
+
+    def exportProjectAsRasterImagesHandler(self) -> None:
+        self.exportProjectAsImages("png")
+
+    def exportProjectAsImages(self, extension: str) -> None:
+        """Exports all diagrams, skipping the ones unchanged since the last export"""
+        if self.project is None:
+            return
+        directory = self.getDirectoryForProjectExportDialog()
+        if directory is None or len(directory.strip()) == 0:
+            return
+        try:
+            self.storeScene()
+            exporter = ProjectExporter(self.project, parent=self)
+            report = exporter.export(directory, extension)
+            self.aStatusBar.showMessage(f"Project export: {report}")
+        except Exception:
+            logger.exception(traceback.format_exc())
+            self.showCriticalError("Unable to export project diagrams!")
+
     def on_selection_changed(
         self, selected: QItemSelection, deselected: QItemSelection
     ) -> None:
@@ -579,47 +794,45 @@ class MainWindow(QMainWindow):
         self.scene_logic.on_project_item_selection_changed(
             selected_project_items, deselected_project_items
         )
+        self.updateStatistics()
 
     def projectItemsFromIndexes(self, proxy_indexes) -> list[model.BaseItem]:
-        return [
-            self.project.get(item.itemId())
-            for item in self.treeView.itemsFromProxyIndexes(proxy_indexes)
-        ]
+        if self.project is None:
+            return []
+        project_items = (
+            self.project.get(item_id)
+            for item_id in self.treeView.itemIdsFromProxyIndexes(proxy_indexes)
+        )
+        return [project_item for project_item in project_items if project_item]
 
     def deleteSelectedItem(self) -> None:
-        logging.info("Action: Delete selected project item")
+        logger.info("Action: Delete selected project item")
         if not self.treeView.isSelected():
             return
-        item: adapters.StandardItem = self.treeView.getSelectedItem()
-        self.deleteItem(item)
+        self.deleteItem(self.treeView.getSelectedItemId())
         self.updateTitle()
 
     def renameSelectedItem(self) -> None:
-        logging.info("Action: Rename selected project item")
+        logger.info("Action: Rename selected project item")
         if not self.treeView.isSelected():
             return
-        item: adapters.StandardItem = self.treeView.getSelectedItem()
-        self.treeView.startEditName(item)
+        self.treeView.startEditName(self.treeView.getSelectedItemId())
         self.updateTitle()
 
-    def deleteItem(self, item: adapters.StandardItem) -> None:
+    def deleteItem(self, item_id: UUID) -> None:
         """Deletes existing item with children from project tree"""
-        item_id: UUID = item.itemId()
-
-        # the order of deletion is important
         self.delete_project_item(item_id)
-        self.treeView.deleteItem(item)
 
     def aboutQtWindow(self) -> None:
-        logging.info("Action: About Qt window")
+        logger.info("Action: About Qt window")
         QMessageBox.aboutQt(self)
 
     def exitApp(self) -> None:
-        logging.info("Action: Exit app")
+        logger.info("Action: Exit app")
         self.close()
 
     def aboutWindow(self) -> None:
-        logging.info("Action: About window")
+        logger.info("Action: About window")
         QMessageBox.about(
             self,
             "About UMLayer",
@@ -643,8 +856,109 @@ class MainWindow(QMainWindow):
         self.setScaleIndex(self.scaleIndex() + change)
 
     def initializeTreeFromProject(self):
+        self.undo_stack.clear()
+        self.clearTreeFilter()
         self.treeView.itemModel.initializeFromProject(self.project)
         self.treeView.initializeTree()
+        self.searchPanel.clear()
+
+    def findElements(self) -> None:
+        logger.info("Action: Find elements")
+        self.searchWindow.show()
+        self.searchWindow.raise_()
+        self.searchPanel.focusQuery()
+
+    def searchElements(self, query: str) -> list[model.TextMatch]:
+        if self.project is None:
+            return []
+        if not self.scene.isStored():
+            self.storeScene()  # index the unsaved changes of the open diagram
+        return self.project.text_index.search(query)
+
+    def showElement(self, diagram_id: UUID, element_index: int) -> None:
+        """Opens the diagram and selects its element"""
+        if self.project is None or self.project.get(diagram_id) is None:
+            return
+        self.showDiagram(diagram_id)
+        self.scene_logic.selectElementAt(element_index)
+
+    def showDiagram(self, diagram_id: UUID) -> None:
+        """Selects the diagram in the project tree, which opens it"""
+        if self.project is None or self.project.get(diagram_id) is None:
+            return
+        if not (
+            self.treeView.isSelected()
+            and self.treeView.getSelectedItemId() == diagram_id
+        ):
+            proxy_index = self.treeView.proxyIndexFromId(diagram_id)
+            if not proxy_index.isValid():
+                # the diagram is hidden by the tree filter
+                self.clearTreeFilter()
+                self.treeView.applyFilter(None)
+                proxy_index = self.treeView.proxyIndexFromId(diagram_id)
+            self.treeView.scrollTo(proxy_index)
+            self.treeView.setCurrentIndex(proxy_index)
+
+    def setRenderProfile(self, profile: RenderProfile) -> None:
+        logger.info("Action: Render profile %s", profile.value)
+        self._render_profile = profile
+        self.sceneView.setRenderProfile(profile)
+        self.app_actions.renderProfileActions[profile].setChecked(True)
+
+    def setPerformanceHudActive(self, active: bool) -> None:
+        logger.info("Action: Performance HUD %s", "on" if active else "off")
+        self.performanceHud.setActive(active)
+
+    def setTraceRecording(self, active: bool) -> None:
+        logger.info("Action: Trace recording %s", "on" if active else "off")
+        if active:
+            tracing.start()
+            return
+        recorder = tracing.stop()
+        if recorder is None:
+            return
+        filename = self.getFileNameForTraceDialog()
+        if filename is None or len(filename.strip()) == 0:
+            return
+        try:
+            recorder.write(filename)
+            self.aStatusBar.showMessage(f"Trace of {len(recorder)} spans saved")
+        except Exception:
+            logger.exception(traceback.format_exc())
+            self.showCriticalError("Unable to save the trace!")
+
+    def undo(self) -> None:
+        logger.info("Action: Undo %s", self.undo_stack.undo_text())
+        if not self.undo_stack.can_undo():
+            return
+        self.undo_stack.undo()
+        self.setDirty(True)
+
+    def redo(self) -> None:
+        logger.info("Action: Redo %s", self.undo_stack.redo_text())
+        if not self.undo_stack.can_redo():
+            return
+        self.undo_stack.redo()
+        self.setDirty(True)
+
+    def updateUndoActions(self) -> None:
+        undo_action = self.app_actions.undoAction
+        undo_action.setEnabled(self.undo_stack.can_undo())
+        undo_action.setText(f"&Undo {self.undo_stack.undo_text()}".rstrip())
+        redo_action = self.app_actions.redoAction
+        redo_action.setEnabled(self.undo_stack.can_redo())
+        redo_action.setText(f"&Redo {self.undo_stack.redo_text()}".rstrip())
+
+    def recordElementChanges(self, diagram_id: UUID, changes: dict[str, str]) -> None:
+        self._interactors.project_interactor.record_element_changes(diagram_id, changes)
+
+    def flushJournal(self) -> None:
+        """Writes the changes made since the last flush to the journal"""
+        diagram_id = self.scene_logic.currentDiagramId()
+        if diagram_id is not None:
+            self.scene_logic.recordElementChanges(diagram_id)
+        self._interactors.project_interactor.flush_journal()
 
     def storeScene(self):
         self.scene_logic.storeScene()
+        self.updateStatistics()
@@ -4,10 +4,14 @@ from PySide6.QtWidgets import (
     QStyleOptionGraphicsItem,
 )
 
+from umlayer import instrumentation
+
 from . import (
     gui_utils,
     Abilities,
     Settings,
+    PaintKind,
+    paint_resource,
     TextItem,
     ResizableElement,
 )
@@ -68,22 +72,21 @@ class NoteElement(ResizableElement):
     def shape(self) -> QPainterPath:
         return self._shape_path
 
+    @instrumentation.measured("paint")
     def paint(
         self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None
     ) -> None:
         self._text_item.setColor(self.textColor())
 
-        pen = (
-            Settings.ELEMENT_SELECTED_PEN
-            if self.isSelected()
-            else Settings.ELEMENT_NORMAL_PEN
-        )
+        pen = paint_resource(PaintKind.ELEMENT, self.isSelected()).pen
         painter.setPen(pen)
+        if self.isSimplified(painter, option):
+            painter.drawPath(self._shape_path)
+            return
         painter.drawPath(self._border_path)
 
         if self.isSelected():
-            shape_pen = Settings.ELEMENT_SHAPE_SELECTED_PEN
-            painter.setPen(shape_pen)
+            painter.setPen(paint_resource(PaintKind.SHAPE, True).pen)
             painter.drawPath(self.shape())
 
     def recalculate(self) -> None:
@@ -126,3 +129,6 @@ class NoteElement(ResizableElement):
         self._border_path = path
 
         self.updateHandlePositions()
+
+
+instrumentation.instrument(NoteElement, recalculate="recalculate")
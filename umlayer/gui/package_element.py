@@ -6,7 +6,17 @@ from PySide6.QtWidgets import (
     QStyleOptionGraphicsItem,
 )
 
-from . import gui_utils, Abilities, Settings, TextItem, ResizableElement
+from umlayer import instrumentation
+
+from . import (
+    gui_utils,
+    Abilities,
+    Settings,
+    PaintKind,
+    paint_resource,
+    TextItem,
+    ResizableElement,
+)
 
 
 class PackageElement(ResizableElement):
@@ -56,24 +66,23 @@ class PackageElement(ResizableElement):
     def shape(self) -> QPainterPath:
         return self._shape_path
 
+    @instrumentation.measured("paint")
     def paint(
         self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None
     ) -> None:
         self._text_item1.setColor(self.textColor())
         self._text_item2.setColor(self.textColor())
 
-        pen = (
-            Settings.ELEMENT_SELECTED_PEN
-            if self.isSelected()
-            else Settings.ELEMENT_NORMAL_PEN
-        )
+        pen = paint_resource(PaintKind.ELEMENT, self.isSelected()).pen
         painter.setPen(pen)
+        if self.isSimplified(painter, option):
+            painter.drawPath(self._shape_path)
+            return
         painter.drawRect(self._rect1)
         painter.drawRect(self._rect2)
 
         if self.isSelected():
-            shape_pen = Settings.ELEMENT_SHAPE_SELECTED_PEN
-            painter.setPen(shape_pen)
+            painter.setPen(paint_resource(PaintKind.SHAPE, True).pen)
             painter.drawPath(self.shape())
 
     def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value):
@@ -142,3 +151,6 @@ class PackageElement(ResizableElement):
         self._shape_path = path
 
         self.updateHandlePositions()
+
+
+instrumentation.instrument(PackageElement, recalculate="recalculate")
@@ -0,0 +1,85 @@
+"""Pens and brushes of the painted elements
+
+They are made from Settings the first time they are needed and shared
+afterwards, so painting an element allocates none of them.
+"""
+
+from enum import IntEnum
+from typing import NamedTuple
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QBrush, QPen
+
+from . import Settings
+
+
+class PaintKind(IntEnum):
+    ELEMENT = 1  # outlines of elements
+    LINE = 2  # lines and their tips
+    SHAPE = 3  # the selection shape around elements
+
+
+class PaintResource(NamedTuple):
+    pen: QPen
+    brush: QBrush
+
+
+_NO_BRUSH = QBrush(Qt.NoBrush)
+
+# (kind, pen style, selected, filled) -> resource, shared by all elements;
+# solid lines have no pen style in keys, as Qt enums are slow to hash
+_resources: dict[tuple[PaintKind, Qt.PenStyle, bool, bool], PaintResource] = {}
+
+# changes when the resources are made again, so that elements keeping
+# resources know they are outdated
+generation = 0
+
+
+def paint_resource(
+    kind: PaintKind,
+    selected: bool,
+    pen_style: Qt.PenStyle = None,
+    filled: bool = False,
+) -> PaintResource:
+    """Returns the pen and brush to paint a part of an element
+
+    pen_style is the style of lines, filled tells if line tips are filled.
+    """
+    key = (kind, pen_style, selected, filled)
+    resource = _resources.get(key)
+    if resource is None:
+        resource = _resources[key] = _make_resource(*key)
+    return resource
+
+
+def invalidate_paint_resources() -> None:
+    """Makes the resources again from Settings, e.g. after changing colors"""
+    global generation
+    _resources.clear()
+    generation += 1
+
+
+def _make_resource(
+    kind: PaintKind, pen_style: Qt.PenStyle, selected: bool, filled: bool
+) -> PaintResource:
+    if kind == PaintKind.SHAPE:
+        return PaintResource(Settings.ELEMENT_SHAPE_SELECTED_PEN, _NO_BRUSH)
+
+    if kind == PaintKind.ELEMENT:
+        pen = Settings.ELEMENT_SELECTED_PEN if selected else Settings.ELEMENT_NORMAL_PEN
+        return PaintResource(pen, _NO_BRUSH)
+
+    pen = QPen(Settings.LINE_SELECTED_PEN if selected else Settings.ELEMENT_NORMAL_PEN)
+    if pen_style is not None:
+        pen.setStyle(pen_style)
+    if filled:
+        brush = (
+            Settings.LINE_SELECTED_BRUSH if selected else Settings.ELEMENT_NORMAL_BRUSH
+        )
+    else:
+        brush = (
+            Settings.ELEMENT_SELECTED_TRANSPARENT_BRUSH
+            if selected
+            else Settings.ELEMENT_NORMAL_TRANSPARENT_BRUSH
+        )
+    return PaintResource(pen, brush)
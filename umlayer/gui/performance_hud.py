@@ -0,0 +1,94 @@
+import time
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QLabel, QWidget
+
+from umlayer import instrumentation
+
+from . import Settings, GraphicsScene
+
+# probes shown after the frame time, in this order
+HUD_PROBES = [
+    "paint",
+    "recalculate",
+    "text layout",
+    "notify",
+    "scene build",
+    "scene store",
+    "storage save",
+    "storage load",
+    "storage journal",
+]
+
+
+class PerformanceHud(QLabel):
+    """Status bar label of the frame time, item counts and hot path rates
+
+    Instrumentation is enabled while the label is active. Rates are calls
+    and milliseconds of a hot path per second, over the last interval.
+    Items are counted in the scene set by setScene.
+    """
+
+    def __init__(self, parent: QWidget = None) -> None:
+        super().__init__(parent)
+        self._scene: GraphicsScene = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(Settings.PERFORMANCE_HUD_INTERVAL)
+        self._timer.timeout.connect(self.refresh)
+        self._samples: dict[str, instrumentation.ProbeSample] = {}
+        self._sampled = 0.0
+        self.hide()
+
+    def setScene(self, scene: GraphicsScene) -> None:
+        self._scene = scene
+
+    def isActive(self) -> bool:
+        return self._timer.isActive()
+
+    def setActive(self, active: bool) -> None:
+        if active == self.isActive():
+            return
+        if active:
+            instrumentation.enable()
+            self._takeSamples()
+            self.setText("Measuring...")
+            self._timer.start()
+        else:
+            self._timer.stop()
+            instrumentation.disable()
+        self.setVisible(active)
+
+    def refresh(self) -> None:
+        started = self._sampled
+        previous = self._samples
+        self._takeSamples()
+        elapsed = self._sampled - started
+        if elapsed <= 0:
+            return
+
+        def rates(name: str) -> tuple[float, float]:
+            """Returns calls and milliseconds of the probe per second"""
+            sample = self._samples.get(name, instrumentation.ProbeSample(0, 0.0))
+            before = previous.get(name, instrumentation.ProbeSample(0, 0.0))
+            return (
+                (sample.calls - before.calls) / elapsed,
+                (sample.seconds - before.seconds) * 1000 / elapsed,
+            )
+
+        frames, frame_ms = rates("frame")
+        frame = "no frames"
+        if frames:
+            frame = f"frame {frame_ms / frames:.1f} ms, {frames:.0f} fps"
+        parts = [frame]
+        if self._scene is not None:
+            items = len(self._scene.items())
+            parts.append(f"{items} items, {len(self._scene.elements())} elements")
+        for name in HUD_PROBES:
+            calls, milliseconds = rates(name)
+            if calls:
+                parts.append(f"{name} {calls:.0f}/s {milliseconds:.1f} ms/s")
+        self.setText(" | ".join(parts))
+
+    def _takeSamples(self) -> None:
+        self._samples = instrumentation.snapshot()
+        self._sampled = time.perf_counter()
@@ -0,0 +1,65 @@
+import logging
+import os
+import re
+
+from umlayer import model, usecases, version
+from . import ExportScene
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectExporter:
+    """Exports every diagram of the project as an image into a directory
+
+    Diagrams whose content and export settings did not change since
+    the previous export into the same directory are not rendered again.
+    """
+
+    def __init__(self, project: model.Project, parent=None):
+        self._project = project
+        self._parent = parent
+
+    @staticmethod
+    def imageFilename(diagram: model.Diagram, extension: str) -> str:
+        name = re.sub(r"[^\w\- ]", "_", diagram.name()).strip() or "diagram"
+        return f"{name}-{diagram.id.hex[:8]}.{extension}"
+
+    def export(self, directory: str, extension: str) -> usecases.ExportReport:
+        os.makedirs(directory, exist_ok=True)
+        export_settings = {"format": extension, "umlayer": version.__version__}
+
+        manifest = usecases.ExportManifest(directory)
+        manifest.load()
+        report = usecases.ExportReport()
+
+        diagrams = [
+            project_item
+            for project_item in self._project.project_items.values()
+            if project_item.itemType == model.ProjectItemType.DIAGRAM
+        ]
+
+        for diagram in diagrams:
+            if not diagram.dtos:
+                continue
+            filename = self.imageFilename(diagram, extension)
+            digest = usecases.diagram_digest(diagram, export_settings)
+            if manifest.is_fresh(diagram.id, digest, filename):
+                report.hits.append(diagram.name())
+                continue
+
+            self._render(diagram, os.path.join(directory, filename), extension)
+            manifest.update(diagram.id, digest, filename)
+            report.misses.append(diagram.name())
+
+        manifest.retain(diagram.id for diagram in diagrams)
+        manifest.save()
+        logger.info("Project exported to %s: %s", directory, report)
+        return report
+
+    def _render(self, diagram: model.Diagram, path: str, extension: str) -> None:
+        export_scene = ExportScene.fromDiagram(diagram, parent=self._parent)
+        if extension == "svg":
+            export_scene.exportAsSvgImage(path)
+        else:
+            export_scene.exportAsRasterImage(path)
+        export_scene.deleteLater()
@@ -25,21 +25,25 @@ class ResizableElement(BaseElement):
 
     def _createHandles(self):
         self._handler.handle[1] = ResizeHandleItem(
+            self,
             Settings.RESIZE_HANDLE_SIZE,
             self.calculateTopLeftHandlePositionChange,
             name="1",
         )
         self._handler.handle[2] = ResizeHandleItem(
+            self,
             Settings.RESIZE_HANDLE_SIZE,
             self.calculateTopRightHandlePositionChange,
             name="2",
         )
         self._handler.handle[3] = ResizeHandleItem(
+            self,
             Settings.RESIZE_HANDLE_SIZE,
             self.calculateBottomRightHandlePositionChange,
             name="3",
         )
         self._handler.handle[4] = ResizeHandleItem(
+            self,
             Settings.RESIZE_HANDLE_SIZE,
             self.calculateBottomLeftHandlePositionChange,
             name="4",
@@ -80,6 +84,10 @@ class ResizableElement(BaseElement):
         )
         self._is_live = is_really_live
         self._handler.setLive(is_really_live)
+        self.updateCacheMode()
+
+    def isLive(self) -> bool:
+        return self.isSelected() or self._handler.is_handle_selected()
 
     def toDto(self):
         dto = super().toDto()
@@ -92,6 +100,12 @@ class ResizableElement(BaseElement):
         self.setDeltaX(dto["dx"])
         self.setDeltaY(dto["dy"])
 
+    def updateFromDto(self, fields: dict) -> None:
+        super().updateFromDto(fields)
+        if "dx" in fields or "dy" in fields:
+            # a changed text recalculates the element, a changed size does not
+            self.recalculate()
+
     @abc.abstractmethod
     def recalculate(self):
         raise NotImplementedError
@@ -127,6 +141,19 @@ class ResizableElement(BaseElement):
     def onItemPositionHasChanged(self, position):
         self.recalculate()
 
+    def beginGroupMove(self) -> None:
+        super().beginGroupMove()
+        self._handler.setSendsGeometryChanges(False)
+
+    def groupMoveBy(self, delta: QPointF) -> None:
+        """Moves the element with its handles, its shape does not change"""
+        super().groupMoveBy(delta)
+        self._handler.moveBy(delta)
+
+    def endGroupMove(self) -> None:
+        super().endGroupMove()
+        self._handler.setSendsGeometryChanges(True)
+
     def onItemSceneChange(self, value) -> None:
         self._handler.on_scene_change(value)
 
@@ -1,4 +1,4 @@
-from PySide6.QtCore import QRectF, Signal
+from PySide6.QtCore import Qt, QRectF, Signal
 from PySide6.QtGui import QPainter, QPainterPath
 from PySide6.QtWidgets import (
     QGraphicsItem,
@@ -13,9 +13,15 @@ class ResizeHandleItem(QGraphicsObject):
     selection_changed_signal = Signal(bool)
 
     def __init__(
-        self, size: int, calculateHandlePositionChange, name: str = "", parent=None
+        self,
+        element,
+        size: int,
+        calculateHandlePositionChange,
+        name: str = "",
+        parent=None,
     ):
         super().__init__(parent)
+        self._element = element
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setFlag(QGraphicsItem.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
@@ -35,6 +41,10 @@ class ResizeHandleItem(QGraphicsObject):
     def __str__(self):
         return f"<Handle {self._name} size={self.size}: {self.pos().x()}, {self.pos().y()}>"
 
+    def element(self):
+        """Returns the element changed by the handle"""
+        return self._element
+
     def isPositionChangeAccepted(self) -> bool:
         return self._isPositionChangeAccepted
 
@@ -69,6 +79,8 @@ class ResizeHandleItem(QGraphicsObject):
         painter.setPen(pen)
         painter.setBrush(brush)
         painter.drawRect(self._bounding_rect)
+        # the view may not restore the painter state after items
+        painter.setBrush(Qt.NoBrush)
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemPositionChange:
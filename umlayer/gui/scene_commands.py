@@ -0,0 +1,167 @@
+"""Undoable changes of diagram elements
+
+Commands refer to elements by their ids, so they stay valid when the diagram
+is closed and its scene is built again. A command opens its diagram
+before undoing or redoing the change.
+"""
+
+import json
+import logging
+from uuid import UUID
+
+from umlayer import model
+from umlayer.model.undo_stack import COMMAND_OVERHEAD
+
+from . import BaseElement
+
+logger = logging.getLogger(__name__)
+
+
+def dto_delta(old_dto: dict, new_dto: dict) -> tuple[dict, dict]:
+    """Returns old and new values of the fields that differ in two dtos of an element"""
+    old_fields = {}
+    new_fields = {}
+    for key, value in new_dto.items():
+        old_value = old_dto.get(key)
+        if old_value != value:
+            old_fields[key] = old_value
+            new_fields[key] = value
+    return old_fields, new_fields
+
+
+class ElementsCommand(model.UndoCommand):
+    def __init__(self, scene_logic, diagram_id: UUID):
+        self._scene_logic = scene_logic
+        self._diagram_id = diagram_id
+
+    def _scene(self):
+        scene = self._scene_logic.openDiagram(self._diagram_id)
+        if scene is None:
+            logger.warning("Diagram %s of the change is not found", self._diagram_id)
+        return scene
+
+
+class _ElementsPresenceCommand(ElementsCommand):
+    """Keeps serialized elements to add them back after removal"""
+
+    def __init__(self, scene_logic, diagram_id: UUID, elements: list[BaseElement]):
+        super().__init__(scene_logic, diagram_id)
+        self._json_dtos = [element.toJson() for element in elements]
+        self._element_ids = [element.elementId() for element in elements]
+        self._size = COMMAND_OVERHEAD + sum(len(dto) for dto in self._json_dtos)
+
+    def size(self) -> int:
+        return self._size
+
+    def _add(self) -> None:
+        scene = self._scene()
+        if scene is None:
+            return
+        elements = [BaseElement.fromJson(json_dto) for json_dto in self._json_dtos]
+        for element in elements:
+            scene.addItem(element)
+        self._scene_logic.selectElements(elements)
+        self._scene_logic.setDirty()
+
+    def _remove(self) -> None:
+        scene = self._scene()
+        if scene is None:
+            return
+        for element_id in self._element_ids:
+            element = scene.element(element_id)
+            if element is not None:
+                scene.removeItem(element)
+        self._scene_logic.setDirty()
+
+
+class AddElementsCommand(_ElementsPresenceCommand):
+    """The elements were added to the diagram"""
+
+    text = "Add elements"
+
+    def undo(self) -> None:
+        self._remove()
+
+    def redo(self) -> None:
+        self._add()
+
+
+class RemoveElementsCommand(_ElementsPresenceCommand):
+    """The elements were removed from the diagram"""
+
+    text = "Delete elements"
+
+    def undo(self) -> None:
+        self._add()
+
+    def redo(self) -> None:
+        self._remove()
+
+
+class ChangeElementsCommand(ElementsCommand):
+    """Some fields of the elements were changed
+
+    Consecutive commands with the same merge key become one command,
+    e.g. the changes of an element text made key by key.
+    """
+
+    def __init__(
+        self,
+        scene_logic,
+        diagram_id: UUID,
+        changes: dict[str, tuple[dict, dict]],
+        text: str = "Change elements",
+        merge_key=None,
+    ):
+        """changes map element ids to old and new values of the changed fields"""
+        super().__init__(scene_logic, diagram_id)
+        self._changes = changes
+        self._merge_key = merge_key
+        self._size = self._calculateSize()
+        self.text = text
+
+    def undo(self) -> None:
+        self._apply(0)
+
+    def redo(self) -> None:
+        self._apply(1)
+
+    def size(self) -> int:
+        return self._size
+
+    def merge_with(self, command: model.UndoCommand) -> bool:
+        if (
+            not isinstance(command, ChangeElementsCommand)
+            or self._merge_key is None
+            or self._merge_key != command._merge_key
+            or self._diagram_id != command._diagram_id
+        ):
+            return False
+
+        for element_id, (old_fields, new_fields) in command._changes.items():
+            if element_id not in self._changes:
+                self._changes[element_id] = (old_fields, new_fields)
+                continue
+            merged_old_fields, merged_new_fields = self._changes[element_id]
+            for key, value in old_fields.items():
+                merged_old_fields.setdefault(key, value)
+            merged_new_fields.update(new_fields)
+        self._size = self._calculateSize()
+        return True
+
+    def _apply(self, side: int) -> None:
+        scene = self._scene()
+        if scene is None:
+            return
+        elements = []
+        for element_id, fields in self._changes.items():
+            element = scene.element(element_id)
+            if element is None:
+                continue
+            element.updateFromDto(fields[side])
+            elements.append(element)
+        self._scene_logic.selectElements(elements)
+        self._scene_logic.setDirty()
+
+    def _calculateSize(self) -> int:
+        return COMMAND_OVERHEAD + len(json.dumps(self._changes))
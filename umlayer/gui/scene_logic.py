@@ -1,3 +1,4 @@
+import json
 import logging
 
 from PySide6.QtCore import QPointF
@@ -12,9 +13,15 @@ from . import (
     NoteElement,
     TextElement,
     ClassElement,
+    dto_delta,
+    AddElementsCommand,
+    RemoveElementsCommand,
+    ChangeElementsCommand,
 )
 
-from umlayer import model
+from umlayer import instrumentation, model
+
+logger = logging.getLogger(__name__)
 
 
 class SceneLogic:
@@ -22,6 +29,10 @@ class SceneLogic:
         self.temp_list = []
         self._grid_enabled = False
         self.window = None
+        # elements of the scene in the order of the stored diagram content
+        self._stored_elements: list[BaseElement] = []
+        # element id -> dto of elements before the change being made
+        self._change_dtos: dict[str, dict] = {}
 
     def setWindow(self, window):
         self.window = window
@@ -32,12 +43,63 @@ class SceneLogic:
     def selectElement(self, element):
         element.setSelected(True)
 
+    def selectElements(self, elements: list[BaseElement]) -> None:
+        self.window.scene.deselectAll()
+        for element in elements:
+            self.selectElement(element)
+        # the selection may stay the same while the text has changed
+        self.window.on_scene_selection_changed()
+
+    def currentDiagramId(self):
+        if not self.window.isDiagramSelected():
+            return None
+        return self.window.treeView.getSelectedItemId()
+
+    def openDiagram(self, diagram_id):
+        """Shows the diagram in the scene, returns the scene or None"""
+        if self.currentDiagramId() != diagram_id:
+            self.window.showDiagram(diagram_id)
+        if self.currentDiagramId() != diagram_id:
+            return None
+        return self.window.scene
+
+    def pushCommand(self, command) -> None:
+        self.window.undo_stack.push(command)
+
+    def beginChange(self, elements: list[BaseElement]) -> None:
+        """Remembers the elements before a change, to record what has changed"""
+        self._change_dtos = {
+            element.elementId(): element.toDto() for element in elements
+        }
+
+    def endChange(self, text: str, merge_key=None) -> None:
+        """Records changed fields of the elements given to beginChange"""
+        change_dtos = self._change_dtos
+        self._change_dtos = {}
+        diagram_id = self.currentDiagramId()
+        if not change_dtos or diagram_id is None:
+            return
+
+        changes = {}
+        for element_id, old_dto in change_dtos.items():
+            element = self.window.scene.element(element_id)
+            if element is None:
+                continue
+            old_fields, new_fields = dto_delta(old_dto, element.toDto())
+            if new_fields:
+                changes[element_id] = (old_fields, new_fields)
+        if changes:
+            self.pushCommand(
+                ChangeElementsCommand(self, diagram_id, changes, text, merge_key)
+            )
+
     def addElement(self, element: BaseElement) -> None:
         self.window.scene.deselectAll()
         self.window.scene.addItem(element)
         element.setPos(self.initialPosition())
         self.selectElement(element)
         self.setDirty()
+        self.pushCommand(AddElementsCommand(self, self.currentDiagramId(), [element]))
 
     def initialPosition(self) -> QPointF:
         """Return scene coordinates of the initial position of new elements"""
@@ -103,23 +165,44 @@ class SceneLogic:
         self.storeSceneTo(diagram)
 
     def storeSceneTo(self, diagram: model.BaseItem):
-        logging.info(f"Store scene to {diagram.name()}")
-        diagram.dtos.clear()
-        for item in self.window.scene.elements():
-            json_dto = item.toJson()
-            diagram.dtos.append(json_dto)
+        logger.debug("Store scene to %s", diagram.name())
+        elements = self.window.scene.elements()
+        dtos = [item.toJson() for item in elements]
+        texts = [item.text() for item in elements]
         h_val, h_min, h_max, v_val, v_min, v_max = self.window.sceneView.scrollData()
-        diagram.scroll_data = [h_val, h_min, h_max, v_val, v_min, v_max]
+        scroll_data = [h_val, h_min, h_max, v_val, v_min, v_max]
+        self.window.project.storeDiagram(diagram.id, dtos, scroll_data, texts)
+        self._stored_elements = elements
+        self.window.scene.setStored()
 
     def buildSceneFrom(self, project_item):
-        for json_dto in project_item.dtos:
-            element = BaseElement.fromJson(json_dto)
+        self._stored_elements = []
+        for position, json_dto in enumerate(project_item.dtos):
+            dto = json.loads(json_dto)
+            if "id" not in dto:
+                dto["id"] = model.stored_element_id(project_item.id, position)
+            element = BaseElement.fromDto(dto)
             # TODO: override addItem and move setNotify there
             self.window.scene.addItem(element)
+            self._stored_elements.append(element)
+        # the stored content has not changed
+        self.window.scene.takeChangedElements()
+        self.window.scene.setStored()
         if project_item.scroll_data is not None:
             hv, h_min, h_max, v_val, v_min, v_max = project_item.scroll_data
             self.window.sceneView.setScrollData(hv, h_min, h_max, v_val, v_min, v_max)
 
+    def selectElementAt(self, element_index: int) -> None:
+        """Selects and shows the element stored at the position in the diagram"""
+        if not 0 <= element_index < len(self._stored_elements):
+            return
+        element = self._stored_elements[element_index]
+        if element.scene() is not self.window.scene:
+            return
+        self.window.scene.deselectAll()
+        self.selectElement(element)
+        self.window.sceneView.ensureVisible(element)
+
     def delete_selected_elements(self):
         elements = self.window.scene.selectedElements()
         self._remove_elements(elements)
@@ -140,6 +223,8 @@ class SceneLogic:
         ]
         if not elements:
             return
+        for element in elements:
+            element.renewElementId()
 
         self.setDirty()
         self.window.scene.deselectAll()
@@ -160,6 +245,7 @@ class SceneLogic:
             element.setPos(new_pos)
             self.window.scene.addItem(element)
             self.selectElement(element)
+        self.pushCommand(AddElementsCommand(self, self.currentDiagramId(), elements))
 
     def disableScene(self):
         self.window.app_actions.enableSceneActions(False)
@@ -189,11 +275,28 @@ class SceneLogic:
 
     def on_deselect_project_item(self, project_item: model.BaseItem) -> None:
         if project_item.itemType == model.ProjectItemType.DIAGRAM:
+            self.recordElementChanges(project_item.id)
             self.storeSceneTo(project_item)
-            logging.debug(f"The scene was stored to diagram {project_item.name()}")
+            logger.debug("The scene was stored to diagram %s", project_item.name())
         self.window.scene.clearElements()
+        self.window.scene.takeChangedElements()
+        self.window.scene.setStored()
+        self._stored_elements = []
+        self._change_dtos = {}
+
+    def recordElementChanges(self, diagram_id) -> None:
+        """Records the elements changed in the scene in the project journal"""
+        changes = {
+            element_id: None if element is None else element.toJson()
+            for element_id, element in self.window.scene.takeChangedElements().items()
+        }
+        self.window.recordElementChanges(diagram_id, changes)
 
     def _remove_elements(self, elements):
+        if elements:
+            self.pushCommand(
+                RemoveElementsCommand(self, self.currentDiagramId(), elements)
+            )
         for element in elements:
             self.window.scene.removeItem(element)
             self.setDirty()
@@ -214,7 +317,7 @@ class SceneLogic:
         )
 
     def selectAllElements(self):
-        logging.info("Action: Select all elements")
+        logger.info("Action: Select all elements")
 
         if not self.isEnabled():
             return
@@ -227,6 +330,7 @@ class SceneLogic:
             return
 
         selected_element = self.window.scene.selectedElements()[0]
+        self.beginChange([selected_element])
         overlap_elements = self.window.scene.collidingElements(selected_element)
 
         z_value = 0
@@ -235,12 +339,15 @@ class SceneLogic:
                 z_value = element.zValue() + 0.1
         selected_element.setZValue(z_value)
         selected_element.update()
+        selected_element.notify()
+        self.endChange("Bring to front")
 
     def send_to_back(self):
         if not self.window.scene.selectedElements():
             return
 
         selected_element = self.window.scene.selectedElements()[0]
+        self.beginChange([selected_element])
         overlap_elements = self.window.scene.collidingElements(selected_element)
 
         z_value = 0
@@ -249,3 +356,15 @@ class SceneLogic:
                 z_value = element.zValue() - 0.1
         selected_element.setZValue(z_value)
         selected_element.update()
+        selected_element.notify()
+        self.endChange("Send to back")
+
+
+# the tree selection slot of the main window calls the switch by name,
+# so the probe is swapped in while instrumentation is enabled
+instrumentation.instrument(
+    SceneLogic,
+    storeSceneTo="scene store",
+    buildSceneFrom="scene build",
+    on_project_item_selection_changed="diagram switch",
+)
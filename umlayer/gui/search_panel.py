@@ -0,0 +1,79 @@
+import logging
+
+from PySide6.QtCore import Qt, QTimer
+
+from PySide6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+)
+
+logger = logging.getLogger(__name__)
+
+# delay between the last key press and the search, milliseconds
+SEARCH_DELAY = 150
+
+
+class SearchPanel(QWidget):
+    """Finds diagram elements of the project by their text"""
+
+    def __init__(self, window, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._window = window
+
+        self.queryEdit = QLineEdit(self)
+        self.queryEdit.setPlaceholderText("Find elements")
+        self.queryEdit.setClearButtonEnabled(True)
+        self.resultList = QListWidget(self)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.queryEdit)
+        layout.addWidget(self.resultList)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SEARCH_DELAY)
+        self._timer.timeout.connect(self.search)
+
+        self.queryEdit.textChanged.connect(self._timer.start)
+        self.queryEdit.returnPressed.connect(self.search)
+        self.resultList.itemActivated.connect(self.on_item_activated)
+
+    def focusQuery(self) -> None:
+        self.queryEdit.setFocus()
+        self.queryEdit.selectAll()
+
+    def clear(self) -> None:
+        self.queryEdit.clear()
+        self.resultList.clear()
+
+    def search(self) -> None:
+        self._timer.stop()
+        self.resultList.clear()
+        query = self.queryEdit.text()
+        if not query.strip():
+            return
+
+        project = self._window.project
+        for match in self._window.searchElements(query):
+            diagram = project.get(match.diagram_id)
+            if diagram is None:
+                continue
+            item = QListWidgetItem(f"{diagram.name()}: {firstLine(match.text)}")
+            item.setToolTip(match.text)
+            item.setData(Qt.UserRole, (match.diagram_id, match.element_index))
+            self.resultList.addItem(item)
+
+    def on_item_activated(self, item: QListWidgetItem) -> None:
+        diagram_id, element_index = item.data(Qt.UserRole)
+        self._window.showElement(diagram_id, element_index)
+
+
+def firstLine(text: str) -> str:
+    for line in text.splitlines():
+        if line.strip():
+            return line.strip()
+    return ""
@@ -68,6 +68,27 @@ class Settings:
 
     _GRID_COLOR = QColor(191, 215, 181)
     GRID_PEN = QPen(_GRID_COLOR, 0.5, Qt.SolidLine)
+    # the least distance between grid lines on the screen, pixels
+    GRID_MIN_SPACING = 4
+
+    # levels of detail, i.e. screen pixels per scene unit,
+    # below which elements are painted with less detail
+    GREEKED_TEXT_LOD = 0.45  # text is painted as bars
+    HIDDEN_TEXT_LOD = 0.15  # text is not painted
+    SIMPLIFIED_SHAPE_LOD = 0.35  # shapes are painted without details
+    GREEKED_TEXT_ALPHA = 80
+
+    # elements that are not edited are painted from cached pixmaps
+    RENDER_CACHE_ENABLED = True
+    # the memory for the cached pixmaps of all elements, kilobytes
+    RENDER_CACHE_LIMIT = 64 * 1024
+
+    # dragging at least so many selected elements moves them as a group,
+    # by one snapped delta per mouse move
+    GROUP_MOVE_MIN_ELEMENTS = 2
+
+    # the performance HUD shows rates over so many milliseconds
+    PERFORMANCE_HUD_INTERVAL = 1000
 
     ELEMENT_PADDING = 0
 
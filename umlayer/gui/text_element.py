@@ -2,7 +2,17 @@ from PySide6.QtCore import Qt, QPointF, QRectF
 from PySide6.QtGui import QPainter, QPainterPath
 from PySide6.QtWidgets import QApplication, QGraphicsItem, QStyleOptionGraphicsItem
 
-from . import gui_utils, Abilities, BaseElement, Settings, TextItem
+from umlayer import instrumentation
+
+from . import (
+    gui_utils,
+    Abilities,
+    BaseElement,
+    Settings,
+    PaintKind,
+    paint_resource,
+    TextItem,
+)
 
 
 class TextElement(BaseElement):
@@ -56,13 +66,14 @@ class TextElement(BaseElement):
     def shape(self) -> QPainterPath:
         return self._shape_path
 
+    @instrumentation.measured("paint")
     def paint(
         self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None
     ) -> None:
         self._text_item.setColor(self.textColor())
 
-        if self.isSelected():
-            painter.setPen(Settings.ELEMENT_SHAPE_SELECTED_PEN)
+        if self.isSelected() and not self.isSimplified(painter, option):
+            painter.setPen(paint_resource(PaintKind.SHAPE, True).pen)
             painter.drawPath(self.shape())
 
     def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value):
@@ -85,3 +96,6 @@ class TextElement(BaseElement):
         self._shape_path = path
         self.update()
         self.notify()
+
+
+instrumentation.instrument(TextElement, _recalculate="recalculate")
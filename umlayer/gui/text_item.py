@@ -1,4 +1,14 @@
-from PySide6.QtWidgets import QGraphicsTextItem
+from PySide6.QtCore import Qt, QRectF
+from PySide6.QtGui import QColor, QPainter, QTextBlock
+from PySide6.QtWidgets import (
+    QGraphicsItem,
+    QGraphicsTextItem,
+    QStyleOptionGraphicsItem,
+)
+
+from umlayer import instrumentation
+
+from . import gui_utils, Settings
 
 
 class TextItem(QGraphicsTextItem):
@@ -10,6 +20,10 @@ class TextItem(QGraphicsTextItem):
         self._center = center
         # end of serializable data
 
+        self._greeked_rects: list[QRectF] = []
+        if Settings.RENDER_CACHE_ENABLED:
+            # the text changes seldom, while its layout is costly to paint
+            self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         self._recalculate()
 
     def text(self):
@@ -29,7 +43,29 @@ class TextItem(QGraphicsTextItem):
             self._recalculate()
 
     def setColor(self, color):
-        self.setDefaultTextColor(color)
+        # elements set the color on every paint, a change repaints the text
+        color = QColor(color)
+        if self.defaultTextColor() != color:
+            self.setDefaultTextColor(color)
+
+    @instrumentation.measured("paint")
+    def paint(
+        self, painter: QPainter, option: QStyleOptionGraphicsItem, widget=None
+    ) -> None:
+        level_of_detail = gui_utils.level_of_detail(painter, option)
+        if level_of_detail < Settings.HIDDEN_TEXT_LOD:
+            return
+        if level_of_detail < Settings.GREEKED_TEXT_LOD:
+            # the text is unreadable: bars in place of the lines are enough
+            color = QColor(self.defaultTextColor())
+            color.setAlpha(Settings.GREEKED_TEXT_ALPHA)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(color)
+            painter.drawRects(self._greeked_rects)
+            # the view may not restore the painter state after items
+            painter.setBrush(Qt.NoBrush)
+            return
+        super().paint(painter, option, widget)
 
     def _getHtml(self, text):
         alignment = "center" if self.center() else "left"
@@ -48,4 +84,28 @@ white-space: pre;
         # print(html)
         self.setHtml(html)
         self.adjustSize()
+        self._greeked_rects = self._calculateGreekedRects()
         self.update()
+
+    def _calculateGreekedRects(self) -> list[QRectF]:
+        """Returns the bars painted in place of the text lines"""
+        rects = []
+        document = self.document()
+        document_layout = document.documentLayout()
+        block: QTextBlock = document.begin()
+        while block.isValid():
+            block_position = document_layout.blockBoundingRect(block).topLeft()
+            layout = block.layout()
+            for index in range(layout.lineCount()):
+                line = layout.lineAt(index)
+                if line.naturalTextWidth() <= 0:
+                    continue
+                rect = line.naturalTextRect().translated(block_position)
+                # a bar is thinner than the line, so that lines stay apart
+                margin = rect.height() / 4
+                rects.append(rect.adjusted(0, margin, 0, -margin))
+            block = block.next()
+        return rects
+
+
+instrumentation.instrument(TextItem, _recalculate="text layout")
@@ -1,7 +1,7 @@
 import logging
 from uuid import UUID
 
-from PySide6.QtCore import Qt, QItemSelectionModel, QModelIndex
+from PySide6.QtCore import Qt, QItemSelectionModel, QModelIndex, QSignalBlocker
 
 from PySide6.QtGui import QFocusEvent
 
@@ -14,6 +14,11 @@ from PySide6.QtWidgets import (
 
 from umlayer import adapters
 
+logger = logging.getLogger(__name__)
+
+# a filter showing more items leaves folders collapsed
+FILTER_EXPAND_LIMIT = 1000
+
 
 class TreeView(QTreeView):
     """
@@ -29,7 +34,7 @@ class TreeView(QTreeView):
         # also disable light blue selection
         self.setSelectionMode(QAbstractItemView.SingleSelection)
 
-        self.setSortingEnabled(True)
+        # the item model keeps rows sorted
         self.setHeaderHidden(True)
         self.setUniformRowHeights(True)
         self.setWordWrap(False)
@@ -45,7 +50,7 @@ class TreeView(QTreeView):
         return self.model()
 
     @property
-    def itemModel(self) -> adapters.StandardItemModel:
+    def itemModel(self) -> adapters.ProjectTreeModel:
         return self.proxyModel.sourceModel()
 
     @property
@@ -58,60 +63,91 @@ class TreeView(QTreeView):
     def getModelIndex(self, proxy_index: QModelIndex) -> QModelIndex:
         return self.proxyModel.mapToSource(proxy_index)
 
-    def itemsFromProxyIndexes(self, proxy_indexes) -> list[adapters.StandardItem]:
+    def proxyIndexFromId(self, item_id: UUID) -> QModelIndex:
+        return self.getProxyIndex(self.itemModel.indexFromId(item_id))
+
+    def itemIdsFromProxyIndexes(self, proxy_indexes) -> list[UUID]:
         return [
-            self.itemModel.itemFromIndex(self.getModelIndex(proxy_index))
+            proxy_index.data(adapters.ItemRoles.IdRole)
             for proxy_index in proxy_indexes
             if proxy_index.isValid()
         ]
 
-    def getSelectedItems(self) -> list[adapters.StandardItem]:
-        return self.itemsFromProxyIndexes(self.selectedIndexes())
+    def getSelectedItemIds(self) -> list[UUID]:
+        return self.itemIdsFromProxyIndexes(self.selectedIndexes())
 
     def isSelected(self) -> bool:
-        return bool(self.getSelectedItems())
-
-    def getSelectedItem(self) -> adapters.StandardItem:
-        """Returns selected item or throws Exception"""
-        return self.getSelectedItems()[0]
+        return bool(self.getSelectedItemIds())
 
     def getSelectedItemId(self) -> UUID:
         """Returns selected item id or throws Exception"""
-        return self.getSelectedItem().itemId()
+        return self.getSelectedItemIds()[0]
 
     def initializeTree(self) -> None:
-        self.sortByColumn(0, Qt.SortOrder.AscendingOrder)
-        self.expandAll()
-        root_item = self.itemModel.rootItem()
-        model_index: QModelIndex = root_item.index()
-        proxy_index: QModelIndex = self.getProxyIndex(model_index)
+        proxy_index: QModelIndex = self.getProxyIndex(self.itemModel.rootIndex())
+        self.expand(proxy_index)
         self.selectionModel().select(
             proxy_index, QItemSelectionModel.SelectionFlag.Select
         )
 
-    def startEditName(self, item: adapters.StandardItem) -> None:
-        model_index: QModelIndex = item.index()
-        proxy_index: QModelIndex = self.getProxyIndex(model_index)
+    def applyFilter(self, item_ids: set[UUID] = None) -> None:
+        """Shows only the items with their ancestors, or all items if None
+
+        The selected item stays selected if it is shown, otherwise the root is.
+        Selection changes are notified only when the selected item is hidden,
+        so the open diagram is not built again as the filter changes.
+        """
+        if self.itemModel.isFilteredBy(item_ids):
+            return
+        selected_id = self.getSelectedItemId() if self.isSelected() else None
+        if selected_id is not None and not self.itemModel.isShownBy(
+            selected_id, item_ids
+        ):
+            self.clearSelection()
+            selected_id = None
+
+        selection_model = self.selectionModel()
+        # resetting the model drops the selection, which is restored silently
+        with QSignalBlocker(selection_model):
+            self.itemModel.setFilter(item_ids)
+            root_index: QModelIndex = self.getProxyIndex(self.itemModel.rootIndex())
+            self.expand(root_index)
+            if self.itemModel.isFiltered() and len(item_ids) <= FILTER_EXPAND_LIMIT:
+                for item_id in item_ids:
+                    self.expandAncestors(item_id)
+            if selected_id is not None:
+                proxy_index = self.proxyIndexFromId(selected_id)
+                selection_model.setCurrentIndex(
+                    proxy_index, QItemSelectionModel.SelectionFlag.ClearAndSelect
+                )
+
+        if selected_id is None:
+            proxy_index = root_index
+            self.setCurrentIndex(proxy_index)
+        self.viewport().update()
+        self.scrollTo(proxy_index)
+
+    def expandAncestors(self, item_id: UUID) -> None:
+        parent_index = self.proxyIndexFromId(item_id).parent()
+        while parent_index.isValid() and not self.isExpanded(parent_index):
+            self.expand(parent_index)
+            parent_index = parent_index.parent()
+
+    def startEditName(self, item_id: UUID) -> None:
+        proxy_index: QModelIndex = self.proxyIndexFromId(item_id)
         self.scrollTo(proxy_index)
         self.setCurrentIndex(proxy_index)
         self.edit(proxy_index)
 
     def onCloseEditor(self, editor: QAbstractItemDelegate, hint) -> None:
-        """Set element name after editing"""
-        logging.debug("Finish name editing")
+        """Show the renamed item at its sorted position
+
+        The name itself is set by the item model.
+        """
+        logger.debug("Finish name editing")
         if not self.isSelected():
             return
-        item: adapters.StandardItem = self.getSelectedItem()
-        item_id: UUID = item.itemId()
-
-        name: str = item.text()
-        self.window.setProjectItemName(item_id, name)
-
-        parent_item: adapters.StandardItem = item.parent()
-        parent_item.sortChildren(0, Qt.SortOrder.AscendingOrder)
-        model_index: QModelIndex = item.index()
-        proxy_index: QModelIndex = self.getProxyIndex(model_index)
-        self.scrollTo(proxy_index)
+        self.scrollTo(self.proxyIndexFromId(self.getSelectedItemId()))
 
     def focusInEvent(self, event: QFocusEvent) -> None:
         self.onFocused(True)
@@ -125,9 +161,3 @@ class TreeView(QTreeView):
         self.setFrameStyle(
             QFrame.Panel | (QFrame.Plain if is_focused else QFrame.Sunken)
         )
-
-    def deleteItem(self, item: adapters.StandardItem) -> None:
-        model_index: QModelIndex = item.index()
-        row: int = model_index.row()
-        parent_index: QModelIndex = model_index.parent()
-        self.itemModel.removeRow(row, parent_index)
@@ -0,0 +1,194 @@
+"""Counters and timers of the hot paths
+
+A probe counts the calls of a hot path and sums the time spent in it.
+Hot paths are registered in two ways:
+
+    instrument(SceneLogic, buildSceneFrom="scene build")
+
+replaces the method with a timing wrapper while instrumentation is
+enabled and restores it when it is disabled, so it costs nothing when
+disabled. Qt binds a Python override of a virtual method, e.g. paint,
+to an item on its first call, so replacing the method later would only
+reach new items. Such methods are decorated instead:
+
+    @measured("paint")
+    def paint(self, painter, option, widget=None): ...
+
+and the decorator checks if instrumentation is enabled on every call.
+
+The performance HUD and the trace recorder enable instrumentation
+independently, it stays enabled until each enable() has its disable().
+While a span recorder is set, every call is also recorded as a span.
+"""
+
+import functools
+import inspect
+import time
+from typing import Callable, NamedTuple, Protocol
+
+
+class Probe:
+    """Calls of a hot path and the time spent in them"""
+
+    __slots__ = ("name", "calls", "seconds")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+
+
+class ProbeSample(NamedTuple):
+    calls: int
+    seconds: float
+
+
+class SpanRecorder(Protocol):
+    def add(self, name: str, category: str, started: float, ended: float) -> None:
+        """Records a call of the hot path, the category is the name of its probe
+
+        Times are of time.perf_counter.
+        """
+
+
+_probes: dict[str, Probe] = {}
+# (owner, attribute) -> (original function, probe, span name)
+_hot_paths: dict[tuple[object, str], tuple[Callable, Probe, str]] = {}
+_enabled = False
+# enable() calls without their disable()
+_users = 0
+_recorder: SpanRecorder = None
+
+
+def probe(name: str) -> Probe:
+    """Returns the probe of the name, made on first use"""
+    if name not in _probes:
+        _probes[name] = Probe(name)
+    return _probes[name]
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def instrument(owner: object, **probe_names: str) -> None:
+    """Registers methods of the class or functions of the module as hot paths
+
+    Keywords are names of attributes defined by the owner itself,
+    values are names of their probes.
+    """
+    owner_name = getattr(owner, "__qualname__", owner.__name__)
+    for attribute, name in probe_names.items():
+        function = vars(owner).get(attribute)
+        if not callable(function):
+            raise ValueError(f"{owner!r} defines no function {attribute}")
+        hot_path = function, probe(name), f"{owner_name}.{attribute}"
+        _hot_paths[owner, attribute] = hot_path
+        if _enabled:
+            setattr(owner, attribute, _wrap(*hot_path))
+
+
+def measured(name: str) -> Callable[[Callable], Callable]:
+    """Decorates a function measured while instrumentation is enabled"""
+    a_probe = probe(name)
+
+    def decorator(function: Callable) -> Callable:
+        wrapper = _wrap(function, a_probe, function.__qualname__)
+
+        @functools.wraps(function)
+        def checking_wrapper(*args, **kwargs):
+            if _enabled:
+                return wrapper(*args, **kwargs)
+            return function(*args, **kwargs)
+
+        return checking_wrapper
+
+    return decorator
+
+
+def enable() -> None:
+    global _enabled, _users
+    _users += 1
+    if _enabled:
+        return
+    _enabled = True
+    for (owner, attribute), hot_path in _hot_paths.items():
+        setattr(owner, attribute, _wrap(*hot_path))
+
+
+def disable() -> None:
+    global _enabled, _users
+    if _users == 0:
+        return
+    _users -= 1
+    if _users > 0:
+        return
+    _enabled = False
+    for (owner, attribute), (function, _, _) in _hot_paths.items():
+        setattr(owner, attribute, function)
+
+
+def set_recorder(recorder: SpanRecorder) -> None:
+    """Sets the recorder of the spans, None to stop recording"""
+    global _recorder
+    _recorder = recorder
+
+
+def reset() -> None:
+    for a_probe in _probes.values():
+        a_probe.calls = 0
+        a_probe.seconds = 0.0
+
+
+def snapshot() -> dict[str, ProbeSample]:
+    """Returns the calls and seconds of every probe"""
+    return {
+        name: ProbeSample(a_probe.calls, a_probe.seconds)
+        for name, a_probe in _probes.items()
+    }
+
+
+def _wrap(function: Callable, a_probe: Probe, span: str) -> Callable:
+    perf_counter = time.perf_counter
+
+    if inspect.isgeneratorfunction(function):
+        # the probe measures only the steps of the generator, not its consumer;
+        # the span lasts from the first step to the last one
+        @functools.wraps(function)
+        def generator_wrapper(*args, **kwargs):
+            a_probe.calls += 1
+            iterator = function(*args, **kwargs)
+            first_started = None
+            try:
+                while True:
+                    started = perf_counter()
+                    if first_started is None:
+                        first_started = started
+                    try:
+                        value = next(iterator)
+                    except StopIteration as stop:
+                        return stop.value
+                    finally:
+                        ended = perf_counter()
+                        a_probe.seconds += ended - started
+                    yield value
+            finally:
+                iterator.close()
+                if _recorder is not None and first_started is not None:
+                    _recorder.add(span, a_probe.name, first_started, ended)
+
+        return generator_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        started = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            ended = perf_counter()
+            a_probe.calls += 1
+            a_probe.seconds += ended - started
+            if _recorder is not None:
+                _recorder.add(span, a_probe.name, started, ended)
+
+    return wrapper
@@ -0,0 +1,145 @@
+"""Logging configuration
+
+Log records are put into a queue by the calling thread and written to the
+rotating log file and to stdout by a background listener thread,
+so the GUI thread does not wait for disk or console I/O.
+
+Levels are configured per subsystem. They are read from the "Logging"
+group of the application settings and may be overridden by
+environment variables:
+
+    UMLAYER_LOG_LEVEL=DEBUG                      level of all other loggers
+    UMLAYER_LOG_LEVELS=storage=DEBUG,scene=INFO  levels of the subsystems
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LOG_FILENAME = "umlayer.log"
+LOG_FILE_MAX_BYTES = 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 3
+
+ROOT = "root"
+
+# subsystem name -> loggers of the subsystem
+SUBSYSTEMS = {
+    "storage": ("umlayer.storage",),
+    "sql": ("sqlalchemy.engine",),
+    "scene": ("umlayer.gui",),
+    "interactor": ("umlayer.usecases",),
+}
+
+DEFAULT_LEVELS = {
+    ROOT: logging.INFO,
+    "sql": logging.WARNING,
+}
+
+LOG_FORMAT = "%(asctime)s [%(threadName)-12.12s] [%(levelname)-5.5s]  %(message)s"
+
+_listener: logging.handlers.QueueListener = None
+
+
+def parse_levels(text: str) -> dict[str, int]:
+    """Parses "storage=DEBUG,scene=WARNING" into levels of the subsystems
+
+    A level without a subsystem name is the root level.
+    Unknown subsystems and levels are ignored.
+    """
+    levels = {}
+    for part in (text or "").split(","):
+        name, _, level_name = part.strip().rpartition("=")
+        name = name.strip().lower() or ROOT
+        level = logging.getLevelName(level_name.strip().upper())
+        if isinstance(level, int) and (name == ROOT or name in SUBSYSTEMS):
+            levels[name] = level
+    return levels
+
+
+def read_settings_levels() -> dict[str, int]:
+    from PySide6.QtCore import QSettings
+
+    # the same organization and application as in UMLayerApplication
+    settings = QSettings("SpiralArms", "UMLayer")
+    settings.beginGroup("Logging")
+    text = ",".join(
+        f"{name}={settings.value(name)}"
+        for name in (ROOT, *SUBSYSTEMS)
+        if settings.contains(name)
+    )
+    settings.endGroup()
+    return parse_levels(text)
+
+
+def read_environment_levels() -> dict[str, int]:
+    levels = parse_levels(os.environ.get("UMLAYER_LOG_LEVEL", ""))
+    levels.update(parse_levels(os.environ.get("UMLAYER_LOG_LEVELS", "")))
+    return levels
+
+
+def configured_levels() -> dict[str, int]:
+    levels = dict(DEFAULT_LEVELS)
+    levels.update(read_settings_levels())
+    levels.update(read_environment_levels())
+    return levels
+
+
+def apply_levels(levels: dict[str, int]) -> None:
+    root_level = levels.get(ROOT, DEFAULT_LEVELS[ROOT])
+    logging.getLogger().setLevel(root_level)
+    for name, logger_names in SUBSYSTEMS.items():
+        for logger_name in logger_names:
+            logging.getLogger(logger_name).setLevel(levels.get(name, logging.NOTSET))
+
+
+def init_logging(levels: dict[str, int] = None, filename: str = LOG_FILENAME) -> None:
+    """Installs the queue handler and starts the background writer"""
+    global _listener
+
+    shutdown_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        filename,
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+        encoding="utf-8",
+        delay=True,
+    )
+    file_handler.setFormatter(formatter)
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+
+    root_logger = logging.getLogger()
+    root_logger.addHandler(queue_handler)
+    apply_levels(configured_levels() if levels is None else levels)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Writes the queued records and stops the background writer"""
+    global _listener
+
+    if _listener is None:
+        return
+
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root_logger.removeHandler(handler)
+
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
@@ -11,5 +11,16 @@ from umlayer.model.project_item_type import ProjectItemType
 from umlayer.model.base_item import BaseItem
 from umlayer.model.folder import Folder
 from umlayer.model.diagram import Diagram
+from umlayer.model.project_observer import ProjectObserver
+from umlayer.model.project_stats import ProjectStats
+from umlayer.model.text_index import TextIndex, TextMatch, tokenize
+from umlayer.model.name_index import NameIndex
+from umlayer.model.undo_stack import UndoCommand, UndoStack
 from umlayer.model.project import Project
+from umlayer.model.project_commands import (
+    AddItemCommand,
+    RemoveItemCommand,
+    RenameItemCommand,
+)
+from umlayer.model.journal import JournalRecord, replay_journal, stored_element_id
 from umlayer.model.data_model import DataModel
@@ -10,6 +10,7 @@ class DataModel:
     def __init__(self) -> None:
         self._project: Project = None
         self._filename: str = None
+        self._read_only: bool = False
 
     @property
     def project(self) -> Project:
@@ -18,6 +19,9 @@ class DataModel:
     def create_project(self) -> None:
         self._project = Project()
 
+    def set_project(self, project: Project) -> None:
+        self._project = project
+
     def delete_project(self) -> None:
         self._project = None
 
@@ -27,3 +31,11 @@ class DataModel:
 
     def set_filename(self, filename: str) -> None:
         self._filename = filename
+
+    @property
+    def read_only(self) -> bool:
+        """The project file was opened for viewing and is not saved into"""
+        return self._read_only
+
+    def set_read_only(self, read_only: bool) -> None:
+        self._read_only = read_only
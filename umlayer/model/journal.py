@@ -0,0 +1,130 @@
+"""Changes of a project recorded since the file was saved
+
+The journal keeps changes at the size of the change: a changed element
+of a diagram is recorded by itself, not with the whole diagram.
+Replaying the journal on the saved project restores the unsaved changes.
+"""
+
+import json
+import logging
+from typing import Iterable, NamedTuple
+from uuid import UUID
+
+from . import BaseItem, ProjectItemType, Project
+
+logger = logging.getLogger(__name__)
+
+# value is the added item
+ADD_ITEM = "add_item"
+# the item is removed with its descendants, value is None
+REMOVE_ITEM = "remove_item"
+# value is the new name
+RENAME_ITEM = "rename_item"
+# value is the id of the new parent
+MOVE_ITEM = "move_item"
+# value maps element ids of the diagram to their dtos, None for removed elements
+CHANGE_ELEMENTS = "change_elements"
+
+
+def stored_element_id(diagram_id: UUID, position: int) -> str:
+    """Returns the id of an element stored without one
+
+    Such elements come from files saved before elements had ids.
+    The id depends on the stored position only, so changes
+    recorded for the element apply to it after the file is opened again.
+    """
+    return f"{diagram_id.hex}:{position}"
+
+
+class JournalRecord(NamedTuple):
+    operation: str
+    item_id: UUID
+    value: object = None
+
+
+def replay_journal(project: Project, records: Iterable[JournalRecord]) -> int:
+    """Makes the recorded changes in the project, returns the number of records
+
+    Records that do not apply, e.g. changes of an item removed later,
+    are skipped.
+    """
+    diagrams = _ChangedDiagrams(project)
+    count = 0
+    for record in records:
+        count += 1
+        if record.operation == CHANGE_ELEMENTS:
+            diagrams.change(record.item_id, record.value)
+            continue
+
+        # tree changes may remove the changed diagrams
+        diagrams.store()
+        try:
+            _replay_tree_change(project, record)
+        except AttributeError:
+            logger.warning("Journal record %s of %s is skipped", *record[:2])
+    diagrams.store()
+    return count
+
+
+def _replay_tree_change(project: Project, record: JournalRecord) -> None:
+    if record.operation == ADD_ITEM:
+        project_item: BaseItem = record.value
+        if project.get(project_item.id) is not None:
+            raise AttributeError("project_item_id")
+        project.add(project_item, project_item.parent_id)
+    elif record.operation == REMOVE_ITEM:
+        project.remove(record.item_id)
+    elif record.operation == RENAME_ITEM:
+        project.rename(record.item_id, record.value)
+    elif record.operation == MOVE_ITEM:
+        project.move(record.item_id, record.value)
+    else:
+        raise ValueError(f"Unknown journal operation {record.operation}")
+
+
+class _ChangedDiagrams:
+    """Diagrams with replayed element changes, stored into the project together"""
+
+    def __init__(self, project: Project):
+        self._project = project
+        # diagram id -> dtos of the elements, None for removed ones
+        self._dtos: dict[UUID, list[str]] = {}
+        # diagram id -> element id -> position of the element dto
+        self._positions: dict[UUID, dict[str, int]] = {}
+
+    def change(self, diagram_id: UUID, changes: dict[str, str]) -> None:
+        diagram = self._project.get(diagram_id)
+        if diagram is None or diagram.itemType != ProjectItemType.DIAGRAM:
+            logger.warning("Element changes of missing diagram %s", diagram_id)
+            return
+
+        if diagram_id not in self._dtos:
+            self._dtos[diagram_id] = list(diagram.dtos)
+            self._positions[diagram_id] = {
+                json.loads(dto).get("id")
+                or stored_element_id(diagram_id, position): position
+                for position, dto in enumerate(diagram.dtos)
+            }
+        dtos = self._dtos[diagram_id]
+        positions = self._positions[diagram_id]
+
+        for element_id, dto in changes.items():
+            position = positions.get(element_id)
+            if position is not None:
+                dtos[position] = dto
+                if dto is None:
+                    del positions[element_id]
+            elif dto is not None:
+                positions[element_id] = len(dtos)
+                dtos.append(dto)
+
+    def store(self) -> None:
+        for diagram_id, dtos in self._dtos.items():
+            diagram = self._project.get(diagram_id)
+            self._project.storeDiagram(
+                diagram_id,
+                [dto for dto in dtos if dto is not None],
+                diagram.scroll_data,
+            )
+        self._dtos.clear()
+        self._positions.clear()
@@ -0,0 +1,110 @@
+"""Index of project item names for filtering the project tree"""
+
+import bisect
+import itertools
+import re
+from typing import Iterable
+from uuid import UUID
+
+# words of a name: "HTTPServer2" has words "HTTP", "Server" and "2"
+_WORD = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[^\W\dA-Z_]+|[A-Z]+|\d+|[^\W\d_]+")
+
+# separates the keys of an item, cannot be a part of a query
+_SEPARATOR = "\n"
+
+# sorts after all keys starting with the same prefix
+_LAST_CHAR = "\U0010ffff"
+
+
+def name_keys(name: str) -> list[str]:
+    """Returns casefolded parts of the name starting at each word
+
+    "Order Service2" gives "order service2", "service2", "2".
+    """
+    name = " ".join(name.split())
+    folded = name.casefold()
+    if len(folded) != len(name):
+        # casefolding changed the length, word positions do not apply
+        return [folded]
+    starts = [match.start() for match in _WORD.finditer(name)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    return [folded[start:] for start in starts]
+
+
+class NameIndex:
+    """Finds project items whose name has a word starting with the query
+
+    Queries ignore case. A query may span words, e.g. "order ser"
+    finds "Order Service". The results of the last query are kept,
+    so a query extending it, as when typing, only checks them again.
+    """
+
+    def __init__(self):
+        # id -> keys of the item, each preceded by the separator
+        self._keys: dict[UUID, str] = {}
+        # (key, id) of all items in sorted order, for prefix lookups
+        self._sorted: list[tuple[str, UUID]] = []
+        self._last_query: str = None
+        self._last_ids: set[UUID] = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def load(self, names: Iterable[tuple[UUID, str]]) -> None:
+        """Replaces the content of the index with (id, name) pairs"""
+        self._keys = {}
+        self._sorted = []
+        for item_id, name in names:
+            keys = name_keys(name)
+            self._keys[item_id] = _join(keys)
+            self._sorted.extend(zip(keys, itertools.repeat(item_id)))
+        self._sorted.sort()
+        self._forget_last_query()
+
+    def add(self, item_id: UUID, name: str) -> None:
+        keys = name_keys(name)
+        self._keys[item_id] = _join(keys)
+        for key in keys:
+            bisect.insort(self._sorted, (key, item_id))
+        self._forget_last_query()
+
+    def remove(self, item_id: UUID) -> None:
+        keys = self._keys.pop(item_id, None)
+        if keys is None:
+            return
+        for key in keys.split(_SEPARATOR)[1:]:
+            del self._sorted[bisect.bisect_left(self._sorted, (key, item_id))]
+        self._forget_last_query()
+
+    def rename(self, item_id: UUID, name: str) -> None:
+        self.remove(item_id)
+        self.add(item_id, name)
+
+    def find(self, query: str) -> set[UUID]:
+        """Returns ids of items having a name word that starts with the query
+
+        Spaces in the query and in names match any whitespace.
+        """
+        query = " ".join(query.casefold().split())
+        if self._last_query is not None and query.startswith(self._last_query):
+            pattern = _SEPARATOR + query
+            item_ids = {
+                item_id for item_id in self._last_ids if pattern in self._keys[item_id]
+            }
+        else:
+            first = bisect.bisect_left(self._sorted, (query,))
+            stop = bisect.bisect_left(self._sorted, (query + _LAST_CHAR,), first)
+            item_ids = {item_id for _, item_id in self._sorted[first:stop]}
+
+        self._last_query = query
+        self._last_ids = item_ids
+        return set(item_ids)
+
+    def _forget_last_query(self) -> None:
+        self._last_query = None
+        self._last_ids = None
+
+
+def _join(keys: list[str]) -> str:
+    return _SEPARATOR + _SEPARATOR.join(keys)
@@ -1,6 +1,16 @@
+from collections import deque
+from typing import Iterable, Iterator
 from uuid import UUID
 
-from . import BaseItem
+from . import (
+    BaseItem,
+    NameIndex,
+    ProjectItemType,
+    ProjectObserver,
+    ProjectStats,
+    TextIndex,
+)
+from .text_index import dto_texts
 
 
 class Project:
@@ -8,8 +18,54 @@ class Project:
 
     def __init__(self):
         self.project_items = {}  # bad design
+        self._children: dict[UUID, dict[UUID, None]] = {}  # ordered sets of ids
         self._root = None
         self._is_dirty = False
+        self._observers: list[ProjectObserver] = []
+        self.stats = ProjectStats()
+        self.text_index = TextIndex()
+        self.name_index = NameIndex()
+
+    @classmethod
+    def load_items(cls, project_items: Iterable[BaseItem]) -> "Project":
+        """Builds a clean project from stored items in one pass
+
+        Items may come in any order. Raises ValueError
+        if the items do not form a single tree.
+        """
+        project = cls()
+        items = project.project_items
+        children = project._children
+        stats = project.stats
+        root = None
+
+        for project_item in project_items:
+            if project_item.id in items:
+                raise ValueError(f"Duplicate item {project_item.id}")
+            items[project_item.id] = project_item
+            stats.item_added(project_item)
+            if project_item.parent_id is None:
+                if root is not None:
+                    raise ValueError("More than one root")
+                root = project_item
+            else:
+                children.setdefault(project_item.parent_id, {})[project_item.id] = None
+
+        if root is None:
+            raise ValueError("No root")
+
+        orphans = children.keys() - items.keys()
+        if orphans:
+            raise ValueError(f"Items of missing parents {sorted(map(str, orphans))}")
+
+        project._root = root
+        # an item is unreachable from the root only if it is on a cycle
+        if sum(1 for _ in project.walk_depth_first()) != len(items):
+            raise ValueError("Items are not connected to the root")
+        project.name_index.load(
+            (project_item.id, project_item.name()) for project_item in items.values()
+        )
+        return project
 
     @property
     def root(self):
@@ -17,6 +73,8 @@ class Project:
 
     def setRoot(self, root: BaseItem):
         self._add(root)
+        self.stats.item_added(root)
+        self.name_index.add(root.id, root.name())
         self._root = root
 
     def __str__(self):
@@ -31,16 +89,33 @@ class Project:
 
         self._is_dirty = dirty
 
+    def subscribe(self, observer: ProjectObserver) -> None:
+        self._observers.append(observer)
+
+    def unsubscribe(self, observer: ProjectObserver) -> None:
+        if observer in self._observers:
+            self._observers.remove(observer)
+
     def remove(self, project_item_id: UUID = None):
         if project_item_id not in self.project_items.keys():
             raise AttributeError("element_id")
+        project_item = self.project_items[project_item_id]
         self._remove(project_item_id)
         self.setProjectDirty(True)
+        for observer in self._observers:
+            observer.onItemRemoved(project_item)
 
     def _remove(self, project_item_id: UUID = None):
-        for child in self.children(project_item_id):
-            self._remove(child.id)
-        del self.project_items[project_item_id]
+        project_item = self.project_items[project_item_id]
+        for removed_item in list(self.walk_depth_first(project_item_id)):
+            del self.project_items[removed_item.id]
+            self.stats.item_removed(removed_item)
+            self.text_index.remove_diagram(removed_item.id)
+            self.name_index.remove(removed_item.id)
+            self._children.pop(removed_item.id, None)
+        siblings = self._children.get(project_item.parent_id)
+        if siblings is not None:
+            siblings.pop(project_item_id, None)
 
     def add(self, project_item: BaseItem, parent_id: UUID):
         if parent_id not in self.project_items:
@@ -48,22 +123,135 @@ class Project:
             self.printProjectItems()
             raise AttributeError("parent_id")
         self._add(project_item, parent_id)
+        self.stats.item_added(project_item)
+        self.name_index.add(project_item.id, project_item.name())
+        if project_item.itemType == ProjectItemType.DIAGRAM and project_item.dtos:
+            self.text_index.set_diagram(project_item.id, dto_texts(project_item.dtos))
+        self.setProjectDirty(True)
+        for observer in self._observers:
+            observer.onItemAdded(project_item)
+
+    def storeDiagram(
+        self,
+        diagram_id: UUID,
+        dtos: Iterable[str],
+        scroll_data: list = None,
+        texts: Iterable[str] = None,
+    ) -> None:
+        """Replaces the content of the diagram with serialized elements
+
+        Texts of the elements are taken from the serialized elements
+        unless the caller already has them.
+        """
+        diagram = self.project_items.get(diagram_id)
+        if diagram is None:
+            raise AttributeError("diagram_id")
+        diagram.dtos = list(dtos)
+        diagram.scroll_data = scroll_data
+        self.stats.diagram_stored(diagram)
+        self.text_index.set_diagram(
+            diagram_id, dto_texts(diagram.dtos) if texts is None else texts
+        )
+
+    def indexTexts(self, rows: Iterable[tuple[UUID, int, str]] = None) -> None:
+        """Fills the text index of a loaded project
+
+        Uses the stored (diagram id, element position, text) rows if there are any,
+        otherwise reads texts from the content of all diagrams.
+        """
+        if rows is not None:
+            self.text_index.load_rows(rows)
+            return
+        for project_item in self.project_items.values():
+            if project_item.itemType == ProjectItemType.DIAGRAM and project_item.dtos:
+                self.text_index.set_diagram(
+                    project_item.id, dto_texts(project_item.dtos)
+                )
+
+    def rename(self, project_item_id: UUID, name: str) -> None:
+        project_item = self.project_items.get(project_item_id)
+        if project_item is None:
+            raise AttributeError("project_item_id")
+        if project_item.name() == name:
+            return
+        project_item.setName(name)
+        self.name_index.rename(project_item_id, name)
+        self.setProjectDirty(True)
+        for observer in self._observers:
+            observer.onItemRenamed(project_item)
+
+    def move(self, project_item_id: UUID, parent_id: UUID) -> None:
+        """Moves the item with its descendants to another parent"""
+        project_item = self.project_items.get(project_item_id)
+        if project_item is None or project_item is self._root:
+            raise AttributeError("project_item_id")
+        if parent_id not in self.project_items:
+            raise AttributeError("parent_id")
+
+        ancestor_id = parent_id
+        while ancestor_id is not None:
+            if ancestor_id == project_item_id:
+                # the item cannot be moved into its own subtree
+                raise AttributeError("parent_id")
+            ancestor_id = self.project_items[ancestor_id].parent_id
+
+        old_parent_id = project_item.parent_id
+        if old_parent_id == parent_id:
+            return
+        del self._children[old_parent_id][project_item_id]
+        self._add(project_item, parent_id)
         self.setProjectDirty(True)
+        for observer in self._observers:
+            observer.onItemMoved(project_item, old_parent_id)
 
     def _add(self, project_item: BaseItem, parent_id: UUID = None):
         project_item.parent_id = parent_id
         self.project_items[project_item.id] = project_item
+        if parent_id is not None:
+            self._children.setdefault(parent_id, {})[project_item.id] = None
 
     def get(self, project_item_id: UUID) -> BaseItem:
         return self.project_items.get(project_item_id)
 
     def children(self, parent_id: UUID) -> set[BaseItem]:
         return set(
-            project_item
-            for project_item in self.project_items.values()
-            if project_item.parent_id == parent_id
+            self.project_items[child_id]
+            for child_id in self._children.get(parent_id, ())
         )
 
+    def walk_depth_first(self, start_id: UUID = None) -> Iterator[BaseItem]:
+        """Yields the item and its descendants, each parent before its children
+
+        The walk starts at the root if no item is given.
+        The project must not be changed during the walk.
+        """
+        stack = [self._root.id if start_id is None else start_id]
+        while stack:
+            project_item_id = stack.pop()
+            yield self.project_items[project_item_id]
+            stack.extend(reversed(self._children.get(project_item_id, {})))
+
+    def walk_breadth_first(self, start_id: UUID = None) -> Iterator[BaseItem]:
+        """Yields the item and its descendants level by level
+
+        The walk starts at the root if no item is given.
+        The project must not be changed during the walk.
+        """
+        queue = deque([self._root.id if start_id is None else start_id])
+        while queue:
+            project_item_id = queue.popleft()
+            yield self.project_items[project_item_id]
+            queue.extend(self._children.get(project_item_id, ()))
+
+    def descendants(self, project_item_id: UUID) -> Iterator[BaseItem]:
+        """Yields all descendants of the item, each parent before its children"""
+        walk = self.walk_depth_first(project_item_id)
+        next(walk)
+        yield from walk
+
+    def hasChildren(self, parent_id: UUID) -> bool:
+        return bool(self._children.get(parent_id))
+
     def count(self):
         return len(self.project_items)
 
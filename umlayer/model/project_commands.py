@@ -0,0 +1,99 @@
+"""Undoable changes of the project tree"""
+
+from uuid import UUID
+
+from . import BaseItem, ProjectItemType, Project
+from .undo_stack import COMMAND_OVERHEAD, UndoCommand
+
+
+def _item_size(project_item: BaseItem) -> int:
+    size = COMMAND_OVERHEAD + len(project_item.name())
+    if project_item.itemType == ProjectItemType.DIAGRAM:
+        size += sum(len(dto) for dto in project_item.dtos)
+    return size
+
+
+def _item_content(project_item: BaseItem):
+    """Returns the content of a diagram to put back when the item is added again
+
+    The content of a diagram open in the scene may be stale when the diagram
+    leaves the project, so commands keep the content of the time they were made.
+    """
+    if project_item.itemType != ProjectItemType.DIAGRAM:
+        return None
+    return list(project_item.dtos), project_item.scroll_data
+
+
+def _restore_content(project_item: BaseItem, content) -> None:
+    if content is not None:
+        project_item.dtos = list(content[0])
+        project_item.scroll_data = content[1]
+
+
+class AddItemCommand(UndoCommand):
+    """The item was added to the project"""
+
+    def __init__(self, project: Project, project_item: BaseItem):
+        self._project = project
+        self._item = project_item
+        self._parent_id = project_item.parent_id
+        self._content = _item_content(project_item)
+        self.text = f"Create {project_item.name()}"
+
+    def undo(self) -> None:
+        self._project.remove(self._item.id)
+
+    def redo(self) -> None:
+        _restore_content(self._item, self._content)
+        self._project.add(self._item, self._parent_id)
+
+    def size(self) -> int:
+        return _item_size(self._item)
+
+
+class RemoveItemCommand(UndoCommand):
+    """The item was removed from the project with its descendants
+
+    Removed items keep their content of the time of removal, so undo adds
+    the same items back.
+    """
+
+    def __init__(self, project: Project, project_items: list[BaseItem]):
+        """project_items are the removed item and its descendants, parents first"""
+        self._project = project
+        self._items = project_items
+        self._parent_id = project_items[0].parent_id
+        self._contents = [_item_content(project_item) for project_item in project_items]
+        self._size = sum(_item_size(project_item) for project_item in project_items)
+        self.text = f"Delete {project_items[0].name()}"
+
+    def undo(self) -> None:
+        for project_item, content in zip(self._items, self._contents):
+            _restore_content(project_item, content)
+        self._project.add(self._items[0], self._parent_id)
+        for project_item in self._items[1:]:
+            self._project.add(project_item, project_item.parent_id)
+
+    def redo(self) -> None:
+        self._project.remove(self._items[0].id)
+
+    def size(self) -> int:
+        return self._size
+
+
+class RenameItemCommand(UndoCommand):
+    def __init__(self, project: Project, item_id: UUID, old_name: str, name: str):
+        self._project = project
+        self._item_id = item_id
+        self._old_name = old_name
+        self._name = name
+        self.text = f"Rename {old_name}"
+
+    def undo(self) -> None:
+        self._project.rename(self._item_id, self._old_name)
+
+    def redo(self) -> None:
+        self._project.rename(self._item_id, self._name)
+
+    def size(self) -> int:
+        return COMMAND_OVERHEAD + len(self._old_name) + len(self._name)
@@ -0,0 +1,22 @@
+from uuid import UUID
+
+from . import BaseItem
+
+
+class ProjectObserver:
+    """Receives changes of the project structure
+
+    The methods are called after the change is made.
+    """
+
+    def onItemAdded(self, project_item: BaseItem) -> None:
+        pass
+
+    def onItemRemoved(self, project_item: BaseItem) -> None:
+        """The item was removed with all its descendants"""
+
+    def onItemRenamed(self, project_item: BaseItem) -> None:
+        pass
+
+    def onItemMoved(self, project_item: BaseItem, old_parent_id: UUID) -> None:
+        pass
@@ -0,0 +1,64 @@
+from uuid import UUID
+
+from . import BaseItem, ProjectItemType
+
+
+class ProjectStats:
+    """Counters of the project content
+
+    The project updates them on every change, so reading them
+    does not depend on the size of the project.
+    """
+
+    def __init__(self):
+        self.items = 0
+        self.folders = 0
+        self.diagrams = 0
+        self.elements = 0
+        self.payload_bytes = 0
+        self._diagram_elements: dict[UUID, int] = {}
+        self._diagram_bytes: dict[UUID, int] = {}
+
+    def __str__(self):
+        return (
+            f"{self.items} items: {self.folders} folders, {self.diagrams} diagrams,"
+            f" {self.elements} elements, {self.payload_bytes / 1024:.1f} KiB"
+        )
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "items": self.items,
+            "folders": self.folders,
+            "diagrams": self.diagrams,
+            "elements": self.elements,
+            "payload_bytes": self.payload_bytes,
+        }
+
+    def diagram_elements(self, diagram_id: UUID) -> int:
+        return self._diagram_elements.get(diagram_id, 0)
+
+    def item_added(self, project_item: BaseItem) -> None:
+        self.items += 1
+        if project_item.itemType == ProjectItemType.FOLDER:
+            self.folders += 1
+        elif project_item.itemType == ProjectItemType.DIAGRAM:
+            self.diagrams += 1
+            self.diagram_stored(project_item)
+
+    def item_removed(self, project_item: BaseItem) -> None:
+        self.items -= 1
+        if project_item.itemType == ProjectItemType.FOLDER:
+            self.folders -= 1
+        elif project_item.itemType == ProjectItemType.DIAGRAM:
+            self.diagrams -= 1
+            self.elements -= self._diagram_elements.pop(project_item.id, 0)
+            self.payload_bytes -= self._diagram_bytes.pop(project_item.id, 0)
+
+    def diagram_stored(self, diagram: BaseItem) -> None:
+        """Recounts elements of the diagram after its content was replaced"""
+        element_count = len(diagram.dtos)
+        payload_bytes = sum(len(dto.encode("utf-8")) for dto in diagram.dtos)
+        self.elements += element_count - self._diagram_elements.get(diagram.id, 0)
+        self.payload_bytes += payload_bytes - self._diagram_bytes.get(diagram.id, 0)
+        self._diagram_elements[diagram.id] = element_count
+        self._diagram_bytes[diagram.id] = payload_bytes
@@ -0,0 +1,124 @@
+"""Inverted index of element texts of all diagrams"""
+
+import bisect
+import heapq
+import json
+import re
+from typing import Iterable, Iterator, NamedTuple
+from uuid import UUID
+
+_TAG = re.compile(r"<[^>]*>")
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Returns casefolded words of the text without markup tags"""
+    return _TOKEN.findall(_TAG.sub(" ", text).casefold())
+
+
+def dto_texts(dtos: Iterable[str]) -> list[str]:
+    """Returns texts of serialized elements"""
+    return [json.loads(dto).get("text", "") for dto in dtos]
+
+
+class TextMatch(NamedTuple):
+    diagram_id: UUID
+    element_index: int
+    text: str
+
+
+class TextIndex:
+    """Maps words to the diagram elements containing them
+
+    Elements are identified by the diagram id and the position
+    of the element in the stored content of the diagram.
+    Each diagram is indexed as a whole when it is stored.
+    """
+
+    def __init__(self):
+        # word -> (diagram id, element position) of elements containing the word
+        self._postings: dict[str, set[tuple[UUID, int]]] = {}
+        # all words in sorted order, for prefix lookups
+        self._words: list[str] = []
+        # diagram id -> element texts
+        self._texts: dict[UUID, list[str]] = {}
+
+    def __len__(self):
+        """Returns the number of indexed elements"""
+        return sum(len(texts) for texts in self._texts.values())
+
+    def words(self) -> int:
+        return len(self._words)
+
+    def set_diagram(self, diagram_id: UUID, texts: Iterable[str]) -> None:
+        """Replaces the indexed texts of the diagram"""
+        self.remove_diagram(diagram_id)
+        texts = list(texts)
+        if not any(texts):
+            return
+
+        self._texts[diagram_id] = texts
+        for element_index, text in enumerate(texts):
+            for word in set(tokenize(text)):
+                elements = self._postings.get(word)
+                if elements is None:
+                    elements = self._postings[word] = set()
+                    bisect.insort(self._words, word)
+                elements.add((diagram_id, element_index))
+
+    def remove_diagram(self, diagram_id: UUID) -> None:
+        texts = self._texts.pop(diagram_id, None)
+        if texts is None:
+            return
+        for element_index, text in enumerate(texts):
+            for word in set(tokenize(text)):
+                elements = self._postings.get(word)
+                if elements is None:
+                    continue
+                elements.discard((diagram_id, element_index))
+                if not elements:
+                    del self._postings[word]
+                    del self._words[bisect.bisect_left(self._words, word)]
+
+    def rows(self) -> Iterator[tuple[UUID, int, str]]:
+        """Yields (diagram id, element position, text) of all indexed elements"""
+        for diagram_id, texts in self._texts.items():
+            for element_index, text in enumerate(texts):
+                if text:
+                    yield diagram_id, element_index, text
+
+    def load_rows(self, rows: Iterable[tuple[UUID, int, str]]) -> None:
+        """Indexes stored (diagram id, element position, text) rows"""
+        diagrams: dict[UUID, list[str]] = {}
+        for diagram_id, element_index, text in rows:
+            texts = diagrams.setdefault(diagram_id, [])
+            if len(texts) <= element_index:
+                texts.extend([""] * (element_index + 1 - len(texts)))
+            texts[element_index] = text
+        for diagram_id, texts in diagrams.items():
+            self.set_diagram(diagram_id, texts)
+
+    def search(self, query: str, limit: int = 200) -> list[TextMatch]:
+        """Returns elements containing words starting with every word of the query"""
+        found = None
+        for query_word in set(tokenize(query)):
+            elements = set()
+            for word in self._words_starting_with(query_word):
+                elements |= self._postings[word]
+            found = elements if found is None else found & elements
+            if not found:
+                return []
+
+        if found is None:
+            return []
+        first = heapq.nsmallest(limit, found, key=lambda pair: (pair[0].int, pair[1]))
+        return [
+            TextMatch(diagram_id, element_index, self._texts[diagram_id][element_index])
+            for diagram_id, element_index in first
+        ]
+
+    def _words_starting_with(self, prefix: str) -> Iterator[str]:
+        position = bisect.bisect_left(self._words, prefix)
+        while position < len(self._words) and self._words[position].startswith(prefix):
+            yield self._words[position]
+            position += 1
@@ -0,0 +1,168 @@
+"""Undo history of project changes"""
+
+import abc
+from typing import Callable
+
+# default memory limit of the undo history, bytes
+DEFAULT_BYTE_BUDGET = 8 * 1024 * 1024
+
+# memory taken by a command besides its payload, bytes
+COMMAND_OVERHEAD = 200
+
+
+class UndoCommand(abc.ABC):
+    """A recorded change that can be undone and made again
+
+    A command keeps only what the change affected, so undoing
+    and redoing it costs as much as the change itself.
+    """
+
+    text = ""
+
+    @abc.abstractmethod
+    def undo(self) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def redo(self) -> None:
+        raise NotImplementedError
+
+    def size(self) -> int:
+        """Returns the approximate memory taken by the command, bytes"""
+        return COMMAND_OVERHEAD
+
+    def merge_with(self, command: "UndoCommand") -> bool:
+        """Absorbs the command made right after this one
+
+        Returns False if the commands cannot be merged.
+        """
+        return False
+
+
+class UndoStack:
+    """History of changes made in the project
+
+    Commands are pushed after their changes are made. When the history
+    takes more memory than the byte budget, the oldest commands are dropped;
+    the last command is kept even if it alone exceeds the budget.
+    """
+
+    def __init__(
+        self,
+        byte_budget: int = DEFAULT_BYTE_BUDGET,
+        on_changed: Callable[[], None] = None,
+    ):
+        self._commands: list[UndoCommand] = []
+        self._sizes: list[int] = []
+        self._index = 0  # number of done commands
+        self._size = 0
+        self._byte_budget = byte_budget
+        self._on_changed = on_changed
+        self._applying = False
+
+    def __len__(self):
+        return len(self._commands)
+
+    def size(self) -> int:
+        """Returns the approximate memory taken by all commands, bytes"""
+        return self._size
+
+    def byte_budget(self) -> int:
+        return self._byte_budget
+
+    def set_byte_budget(self, byte_budget: int) -> None:
+        self._byte_budget = byte_budget
+        if self._evict():
+            self._notify()
+
+    def can_undo(self) -> bool:
+        return self._index > 0
+
+    def can_redo(self) -> bool:
+        return self._index < len(self._commands)
+
+    def undo_text(self) -> str:
+        return self._commands[self._index - 1].text if self.can_undo() else ""
+
+    def redo_text(self) -> str:
+        return self._commands[self._index].text if self.can_redo() else ""
+
+    def is_applying(self) -> bool:
+        """Tells if a command is being undone or redone"""
+        return self._applying
+
+    def push(self, command: UndoCommand) -> None:
+        """Records the command of a change that has been made
+
+        Changes made while a command is undone or redone are not recorded.
+        """
+        if self._applying:
+            return
+        self._drop_undone()
+
+        if self._commands and self._commands[-1].merge_with(command):
+            size = self._commands[-1].size()
+            self._size += size - self._sizes[-1]
+            self._sizes[-1] = size
+        else:
+            size = command.size()
+            self._commands.append(command)
+            self._sizes.append(size)
+            self._size += size
+            self._index += 1
+
+        self._evict()
+        self._notify()
+
+    def undo(self) -> None:
+        if not self.can_undo():
+            return
+        self._index -= 1
+        self._apply(self._commands[self._index].undo)
+
+    def redo(self) -> None:
+        if not self.can_redo():
+            return
+        self._index += 1
+        self._apply(self._commands[self._index - 1].redo)
+
+    def clear(self) -> None:
+        self._commands = []
+        self._sizes = []
+        self._index = 0
+        self._size = 0
+        self._notify()
+
+    def _apply(self, method: Callable[[], None]) -> None:
+        self._applying = True
+        try:
+            method()
+        finally:
+            self._applying = False
+        self._notify()
+
+    def _drop_undone(self) -> None:
+        if self._index == len(self._commands):
+            return
+        self._size -= sum(self._sizes[self._index :])
+        del self._commands[self._index :]
+        del self._sizes[self._index :]
+
+    def _evict(self) -> bool:
+        """Drops the oldest done commands until the history fits the budget"""
+        count = 0
+        size = self._size
+        while size > self._byte_budget and count < self._index - 1:
+            size -= self._sizes[count]
+            count += 1
+        if count == 0:
+            return False
+        del self._commands[:count]
+        del self._sizes[:count]
+        self._index -= count
+        self._size = size
+        return True
+
+    def _notify(self) -> None:
+        if self._on_changed is not None:
+            self._on_changed()
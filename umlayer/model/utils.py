@@ -1,7 +1,7 @@
 from . import constants
 
 
-def build_window_title(filename: str, is_dirty: bool):
+def build_window_title(filename: str, is_dirty: bool, read_only: bool = False):
     title = "UMLayer"
 
     if filename:
@@ -9,7 +9,8 @@ def build_window_title(filename: str, is_dirty: bool):
             filename = filename[:-4]
 
         star = " *" if is_dirty else ""
-        title = f"{filename}{star} \u2014 " + title
+        mode = " [read-only]" if read_only else ""
+        title = f"{filename}{mode}{star} \u2014 " + title
 
     return title
 
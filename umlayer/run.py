@@ -9,8 +9,10 @@ import traceback
 def run():
     """Construct and run the UMLayer application"""
     from umlayer.composition_root import CompositionRoot
+    from umlayer import logging_setup, tracing
 
-    init_logging()
+    logging_setup.init_logging()
+    tracing.start_from_environment()
 
     from umlayer import version
 
@@ -38,26 +40,9 @@ def run():
     return result_code
 
 
-def init_logging():
-    log_formatter = logging.Formatter(
-        "%(asctime)s [%(threadName)-12.12s] [%(levelname)-5.5s]  %(message)s"
-    )
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
-
-    file_handler = logging.FileHandler("umlayer.log")
-    file_handler.setFormatter(log_formatter)
-    root_logger.addHandler(file_handler)
-
-    console_handler = logging.StreamHandler(
-        sys.stdout
-    )  # sys.stderr (default), sys.stdout
-    console_handler.setFormatter(log_formatter)
-    root_logger.addHandler(console_handler)
-
-
 def main():
     """Start function"""
+    from umlayer import logging_setup, tracing
 
     try:
         errcode = run()
@@ -67,6 +52,9 @@ def main():
         logging.exception(traceback.format_exc())
         errcode = 1
         raise ex  # TODO: comment this in release version
+    finally:
+        tracing.finish_from_environment()
+        logging_setup.shutdown_logging()
 
     sys.exit(errcode)
 
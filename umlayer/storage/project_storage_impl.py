@@ -1,40 +1,496 @@
 """Project storage implementation"""
 
+import itertools
+import logging
 import os
+import pathlib
+import sqlite3
+from typing import Iterable, Iterator
+from uuid import UUID
+
 import jsonpickle
-import sqlalchemy.engine.cursor
+import sqlalchemy.engine
+import sqlalchemy.exc
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import SingletonThreadPool
+
+from umlayer import instrumentation, model, usecases
+
+logger = logging.getLogger(__name__)
+
+# SQLite settings of the project file connection
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16 * 1024,  # KiB
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+# SQLite settings of the read-only connection
+READ_ONLY_PRAGMAS = {
+    "query_only": 1,
+    "cache_size": -16 * 1024,  # KiB
+    "mmap_size": 1024 * 1024 * 1024,
+}
+
+INSERT_BATCH_SIZE = 1000
+PROGRESS_STEP = 1000
+
+# Items are stored the root first and parents before children, as the project
+# walks them breadth first: ordinal is the position of the item in this order,
+# depth is its distance from the root
+CREATE_ELEMENTS_TABLE = (
+    "CREATE TABLE elements ("
+    "id text PRIMARY KEY, "
+    "parent_id text, "
+    "depth integer NOT NULL, "
+    "ordinal integer NOT NULL UNIQUE, "
+    "is_root integer NOT NULL, "
+    "json_data text)"
+)
+
+INSERT_ELEMENT = text(
+    "INSERT INTO elements (id, parent_id, depth, ordinal, is_root, json_data)"
+    " VALUES (:id, :parent_id, :depth, :ordinal, :is_root, :json_data)"
+)
+
+# Texts of diagram elements, so that opening a file does not parse
+# the content of every diagram to build the search index.
+# A full-text table is used when SQLite supports it.
+CREATE_TEXTS_FTS_TABLE = (
+    "CREATE VIRTUAL TABLE element_texts USING fts5("
+    "diagram_id UNINDEXED, element_index UNINDEXED, text)"
+)
 
-from sqlalchemy import create_engine, text
+CREATE_TEXTS_TABLE = (
+    "CREATE TABLE element_texts ("
+    "diagram_id text NOT NULL, "
+    "element_index integer NOT NULL, "
+    "text text NOT NULL)"
+)
 
-from umlayer import model, usecases
+INSERT_TEXT = text(
+    "INSERT INTO element_texts (diagram_id, element_index, text)"
+    " VALUES (:diagram_id, :element_index, :text)"
+)
+
+# Changes made after the file was saved, in the order they were made.
+# Saving the project drops the table.
+CREATE_JOURNAL_TABLE = (
+    "CREATE TABLE IF NOT EXISTS journal ("
+    "seq integer PRIMARY KEY AUTOINCREMENT, "
+    "operation text NOT NULL, "
+    "item_id text NOT NULL, "
+    "value text)"
+)
+
+INSERT_JOURNAL_RECORD = (
+    "INSERT INTO journal (operation, item_id, value) VALUES (?, ?, ?)"
+)
+
+# how long a journal write waits for the file locked by a save, seconds
+JOURNAL_LOCK_TIMEOUT = 30
+
+# another file is saved under the name of the target with this suffix first
+TEMP_SUFFIX = ".saving"
+
+
+def _set_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for name, value in PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
 
 
 class ProjectStorageImpl(usecases.ProjectStorage):
-    def save(self, project_items: list[model.BaseItem], filepath: str = None):
-        if os.path.exists(filepath):
-            os.remove(filepath)
+    """Keeps one database engine for the open project file
+
+    The engine holds a persistent connection per thread,
+    so repeated saves and loads do not reconnect.
+    """
+
+    def __init__(self):
+        self._engine: sqlalchemy.engine.Engine = None
+        self._filepath: str = None
+
+    def save(
+        self,
+        project_items: Iterable[model.BaseItem],
+        filepath: str = None,
+        texts: Iterable[tuple[UUID, int, str]] = None,
+    ):
+        """Writes the items to the file
+
+        The open file is rewritten in one transaction. Another file is written
+        next to the target and replaces it once complete, so a failed save
+        keeps the previous content of the target.
+        """
+        if filepath is None:
+            raise ValueError("filepath")
+
+        # the items are checked to form a tree before the file is touched
+        ordered_items = list(_breadth_first(project_items))
+        filepath = os.path.abspath(filepath)
+        if filepath == self._filepath:
+            _write_project(self._engine, ordered_items, texts)
+        else:
+            self._replace_file(filepath, ordered_items, texts)
+
+        logger.debug("Project saved to %s", filepath)
+
+    def _replace_file(
+        self,
+        filepath: str,
+        ordered_items: list[tuple[int, model.BaseItem]],
+        texts: Iterable[tuple[UUID, int, str]],
+    ) -> None:
+        self.close()
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        temp_filepath = filepath + TEMP_SUFFIX
+        _remove_database(temp_filepath)
+
+        engine = _create_engine(temp_filepath)
+        try:
+            _write_project(engine, ordered_items, texts)
+        except Exception:
+            engine.dispose()
+            _remove_database(temp_filepath)
+            raise
+        engine.dispose()
+
+        # a WAL left of the previous content must not be applied to the new one
+        for path in (filepath + "-wal", filepath + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+        os.replace(temp_filepath, filepath)
+        _remove_database(temp_filepath)
+        self._engine_for(filepath)
+
+    def load(
+        self, filepath: str = None, read_only: bool = False, progress=None
+    ) -> Iterator[model.BaseItem]:
+        if read_only:
+            return self._load_read_only(filepath, progress)
+        return self._load(filepath, progress)
+
+    def _load(self, filepath: str, progress) -> Iterator[model.BaseItem]:
+        engine = self._engine_for(filepath)
+
+        try:
+            with engine.connect() as conn:
+                yield from _read_project_items(conn.exec_driver_sql, progress)
+        except Exception:
+            self.close()
+            raise
+
+        logger.debug("Project loaded from %s", filepath)
+
+    def _load_read_only(self, filepath: str, progress) -> Iterator[model.BaseItem]:
+        """Reads the file without the database engine and without taking locks
+
+        The file is opened as immutable, so it reflects the last saved state.
+        """
+        if filepath is None:
+            raise ValueError("filepath")
+
+        connection = _connect_read_only(filepath)
+        try:
+            yield from _read_project_items(connection.execute, progress)
+        finally:
+            connection.close()
+
+        logger.debug("Project loaded read-only from %s", filepath)
+
+    def load_texts(
+        self, filepath: str = None, read_only: bool = False
+    ) -> list[tuple[UUID, int, str]]:
+        if read_only:
+            connection = _connect_read_only(filepath)
+            try:
+                return _read_texts(connection.execute)
+            finally:
+                connection.close()
+
+        with self._engine_for(filepath).connect() as conn:
+            return _read_texts(conn.exec_driver_sql)
+
+    def append_journal(
+        self, records: list[model.JournalRecord], filepath: str = None
+    ) -> None:
+        """Writes the records through a connection of its own
+
+        The engine connections belong to the main thread,
+        journal records are written from a background one.
+        """
+        if filepath is None:
+            raise ValueError("filepath")
+
+        rows = [
+            (record.operation, str(record.item_id), jsonpickle.encode(record.value))
+            for record in records
+        ]
+        connection = sqlite3.connect(filepath, timeout=JOURNAL_LOCK_TIMEOUT)
+        try:
+            _set_pragmas(connection, None)
+            with connection:
+                connection.execute(CREATE_JOURNAL_TABLE)
+                connection.executemany(INSERT_JOURNAL_RECORD, rows)
+        finally:
+            connection.close()
+
+    def load_journal(self, filepath: str = None) -> list[model.JournalRecord]:
+        with self._engine_for(filepath).connect() as conn:
+            return _read_journal(conn.exec_driver_sql)
+
+    def clear_journal(self, filepath: str = None) -> None:
+        """Drops the journal through a connection of its own
+
+        The journal of a file other than the open one is cleared
+        without moving the engine to that file.
+        """
+        if filepath is None:
+            raise ValueError("filepath")
+        if not os.path.exists(filepath):
+            return
+
+        connection = sqlite3.connect(filepath, timeout=JOURNAL_LOCK_TIMEOUT)
+        try:
+            _set_pragmas(connection, None)
+            with connection:
+                connection.execute("DROP TABLE IF EXISTS journal")
+        finally:
+            connection.close()
+
+    def close(self) -> None:
+        if self._engine is None:
+            return
+        self._engine.dispose()
+        logger.debug("Storage of %s closed", self._filepath)
+        self._engine = None
+        self._filepath = None
+
+    def _engine_for(self, filepath: str):
+        """Returns the engine of the file, creating it if the file is not open yet"""
+        if filepath is None:
+            raise ValueError("filepath")
+
+        filepath = os.path.abspath(filepath)
+        if filepath == self._filepath:
+            return self._engine
+
+        self.close()
+
+        engine = _create_engine(filepath)
+        self._engine = engine
+        self._filepath = filepath
+        logger.debug("Storage of %s opened", filepath)
+        return engine
+
+
+instrumentation.instrument(
+    ProjectStorageImpl,
+    save="storage save",
+    _load="storage load",
+    _load_read_only="storage load",
+    load_texts="storage load",
+    append_journal="storage journal",
+)
+
+
+def _create_engine(filepath: str) -> sqlalchemy.engine.Engine:
+    engine = create_engine(
+        "sqlite+pysqlite:///" + filepath,
+        future=True,
+        poolclass=SingletonThreadPool,
+    )
+    event.listen(engine, "connect", _set_pragmas)
+    return engine
+
+
+def _remove_database(filepath: str) -> None:
+    for path in (filepath, filepath + "-wal", filepath + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _connect_read_only(filepath: str) -> sqlite3.Connection:
+    if filepath is None:
+        raise ValueError("filepath")
+
+    uri = pathlib.Path(filepath).resolve().as_uri() + "?mode=ro&immutable=1"
+    connection = sqlite3.connect(uri, uri=True)
+    for name, value in READ_ONLY_PRAGMAS.items():
+        connection.execute(f"PRAGMA {name}={value}")
+    return connection
+
+
+def _write_project(
+    engine: sqlalchemy.engine.Engine,
+    ordered_items: list[tuple[int, model.BaseItem]],
+    texts: Iterable[tuple[UUID, int, str]],
+) -> None:
+    rows = (
+        {
+            "id": str(project_item.id),
+            "parent_id": None if depth == 0 else str(project_item.parent_id),
+            "depth": depth,
+            "ordinal": ordinal,
+            "is_root": int(depth == 0),
+            "json_data": jsonpickle.encode(project_item),
+        }
+        for ordinal, (depth, project_item) in enumerate(ordered_items)
+    )
+
+    with engine.begin() as conn:
+        # pysqlite commits DDL statements at once, outside the transaction
+        # of the engine: an explicit BEGIN keeps the rewrite atomic
+        conn.exec_driver_sql("BEGIN")
+        conn.execute(text("DROP TABLE IF EXISTS elements"))
+        conn.execute(text(CREATE_ELEMENTS_TABLE))
+        while batch := list(itertools.islice(rows, INSERT_BATCH_SIZE)):
+            conn.execute(INSERT_ELEMENT, batch)
+        _save_texts(conn, texts)
+        conn.execute(text("DROP TABLE IF EXISTS journal"))
+
+    with engine.connect() as conn:
+        # keep the project file self-contained between saves
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def _save_texts(conn, texts: Iterable[tuple[UUID, int, str]]) -> None:
+    conn.execute(text("DROP TABLE IF EXISTS element_texts"))
+    if texts is None:
+        return
+
+    fts5 = conn.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')"))
+    if fts5.scalar():
+        conn.execute(text(CREATE_TEXTS_FTS_TABLE))
+    else:
+        conn.execute(text(CREATE_TEXTS_TABLE))
+
+    rows = (
+        {"diagram_id": str(diagram_id), "element_index": element_index, "text": text_}
+        for diagram_id, element_index, text_ in texts
+    )
+    while batch := list(itertools.islice(rows, INSERT_BATCH_SIZE)):
+        conn.execute(INSERT_TEXT, batch)
+
+
+def _read_texts(execute) -> list[tuple[UUID, int, str]]:
+    """Returns the stored (diagram id, element position, text) rows
+
+    Returns None if the file has no texts or they cannot be read,
+    e.g. the full-text table in SQLite without full-text search.
+    """
+    tables = execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='element_texts'"
+    )
+    if not list(tables):
+        return None
+
+    try:
+        rows = execute("SELECT diagram_id, element_index, text FROM element_texts")
+        return [
+            (UUID(diagram_id), int(element_index), text_)
+            for diagram_id, element_index, text_ in rows
+        ]
+    except (sqlite3.Error, sqlalchemy.exc.DBAPIError) as error:
+        logger.warning("Stored texts are ignored: %s", error)
+        return None
+
+
+def _read_journal(execute) -> list[model.JournalRecord]:
+    """Returns the records of the journal in the order they were written
+
+    Returns no records if the journal cannot be read.
+    """
+    tables = execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='journal'"
+    )
+    if not list(tables):
+        return []
+
+    try:
+        rows = execute("SELECT operation, item_id, value FROM journal ORDER BY seq")
+        return [
+            model.JournalRecord(operation, UUID(item_id), jsonpickle.decode(value))
+            for operation, item_id, value in rows
+        ]
+    except (sqlite3.Error, sqlalchemy.exc.DBAPIError, ValueError) as error:
+        logger.warning("The journal is ignored: %s", error)
+        return []
+
+
+def _breadth_first(
+    project_items: Iterable[model.BaseItem],
+) -> Iterator[tuple[int, model.BaseItem]]:
+    """Yields (depth, item) pairs, the root first and parents before children
+
+    Items already in this order, as the project walks them, keep it.
+    Other items are ordered by loading them into a project.
+    Raises ValueError if the items do not form a single tree.
+    """
+    project_items = list(project_items)
+    depths = _parents_first_depths(project_items)
+    if depths is None:
+        project = model.Project.load_items(project_items)
+        project_items = list(project.walk_breadth_first())
+        depths = _parents_first_depths(project_items)
+    for project_item in project_items:
+        yield depths[project_item.id], project_item
+
+
+def _parents_first_depths(project_items: list[model.BaseItem]) -> dict[UUID, int]:
+    """Returns depths of the items given the root first and parents before children
 
-        dirname = os.path.dirname(filepath)
-        os.makedirs(dirname, exist_ok=True)
+    Returns None for items in another order or not forming a single tree.
+    """
+    depths = {}
+    for project_item in project_items:
+        if project_item.id in depths:
+            return None
+        if not depths:
+            if project_item.parent_id is not None:
+                return None
+            depths[project_item.id] = 0
+            continue
+        parent_depth = depths.get(project_item.parent_id)
+        if parent_depth is None:
+            return None
+        depths[project_item.id] = parent_depth + 1
+    return depths or None
 
-        engine = create_engine("sqlite+pysqlite:///" + filepath, echo=True, future=True)
 
-        with engine.begin() as conn:
-            conn.execute(
-                text("CREATE TABLE elements (id text PRIMARY KEY, json_data text)")
-            )
+def _read_project_items(execute, progress=None) -> Iterator[model.BaseItem]:
+    """Yields the stored items, the root first and parents before children
 
-            for project_item in project_items:
-                json_data = jsonpickle.encode(project_item)
+    execute runs an SQL statement and returns an iterable of rows.
+    progress, if given, is called with the numbers of loaded and all items.
+    """
+    columns = {row[1] for row in execute("PRAGMA table_info(elements)")}
+    if "ordinal" not in columns:
+        # the file was saved without the load order
+        yield from _read_unordered_project_items(execute, progress)
+        return
 
-                sql = f"INSERT INTO elements (id, json_data) VALUES ('{str(project_item.id)}', '{json_data}')"
-                conn.execute(text(sql))
+    total = next(iter(execute("SELECT count(*) FROM elements")))[0]
+    rows = execute("SELECT is_root, json_data FROM elements ORDER BY ordinal")
+    for loaded, (is_root, json_data) in enumerate(rows, 1):
+        if (loaded == 1) != bool(is_root):
+            raise ValueError("The first stored item must be the root")
+        yield jsonpickle.decode(json_data)
+        if progress is not None and (loaded % PROGRESS_STEP == 0 or loaded == total):
+            progress(loaded, total)
 
-    def load(self, filepath: str = None) -> list[model.BaseItem]:
-        engine = create_engine("sqlite+pysqlite:///" + filepath, echo=True, future=True)
 
-        with engine.begin() as conn:
-            sql = "SELECT * FROM elements"
-            result: sqlalchemy.engine.cursor.CursorResult = conn.execute(text(sql))
-            project_items = [jsonpickle.decode(json_data) for _, json_data in result]
-            return project_items
+def _read_unordered_project_items(execute, progress=None) -> Iterator[model.BaseItem]:
+    project_items = [
+        jsonpickle.decode(json_data)
+        for json_data, in execute("SELECT json_data FROM elements")
+    ]
+    total = len(project_items)
+    for loaded, (_, project_item) in enumerate(_breadth_first(project_items), 1):
+        yield project_item
+        if progress is not None and (loaded % PROGRESS_STEP == 0 or loaded == total):
+            progress(loaded, total)
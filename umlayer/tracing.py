@@ -0,0 +1,120 @@
+"""Trace recorder
+
+Records the calls of the hot paths registered in umlayer.instrumentation,
+e.g. the project interactor, scene logic, storage and painting, as nested
+spans into a ring buffer, and writes them as a Chrome trace-event file,
+which chrome://tracing and https://ui.perfetto.dev open.
+
+Recording is started and stopped from the View menu, or from the start
+to the end of the application with the environment variable:
+
+    UMLAYER_TRACE=trace.json
+"""
+
+import collections
+import json
+import logging
+import os
+import threading
+import time
+
+from umlayer import instrumentation
+
+logger = logging.getLogger(__name__)
+
+TRACE_VARIABLE = "UMLAYER_TRACE"
+DEFAULT_TRACE_FILENAME = "trace.json"
+# spans kept in the ring buffer, older ones are dropped
+DEFAULT_CAPACITY = 200_000
+
+
+class TraceRecorder:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        # (name, category, started, ended, thread id)
+        self._spans = collections.deque(maxlen=capacity)
+        self._started = time.perf_counter()
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def add(self, name: str, category: str, started: float, ended: float) -> None:
+        self._spans.append((name, category, started, ended, threading.get_ident()))
+
+    def events(self) -> list[dict]:
+        """Returns the spans as complete events, times in microseconds"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((started - self._started) * 1e6, 3),
+                "dur": round((ended - started) * 1e6, 3),
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, category, started, ended, tid in list(self._spans)
+        ]
+        thread_ids = {event["tid"] for event in events}
+        events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread.ident,
+                "args": {"name": thread.name},
+            }
+            for thread in threading.enumerate()
+            if thread.ident in thread_ids
+        )
+        return events
+
+    def write(self, filepath: str) -> None:
+        with open(filepath, "w", encoding="utf-8") as trace_file:
+            json.dump(
+                {"traceEvents": self.events(), "displayTimeUnit": "ms"}, trace_file
+            )
+        logger.info("Trace of %s spans written to %s", len(self), filepath)
+
+
+_recorder: TraceRecorder = None
+
+
+def is_recording() -> bool:
+    return _recorder is not None
+
+
+def start(capacity: int = DEFAULT_CAPACITY) -> None:
+    global _recorder
+    if _recorder is not None:
+        return
+    _recorder = TraceRecorder(capacity)
+    instrumentation.set_recorder(_recorder)
+    instrumentation.enable()
+    logger.info("Trace recording started")
+
+
+def stop() -> TraceRecorder:
+    """Stops recording, returns the recorder, None if nothing was recorded"""
+    global _recorder
+    recorder = _recorder
+    if recorder is None:
+        return None
+    _recorder = None
+    instrumentation.set_recorder(None)
+    instrumentation.disable()
+    logger.info("Trace recording stopped")
+    return recorder
+
+
+def start_from_environment() -> None:
+    """Starts recording if the environment variable names a trace file"""
+    if os.environ.get(TRACE_VARIABLE):
+        start()
+
+
+def finish_from_environment() -> None:
+    """Writes the trace file named by the environment variable, if recording"""
+    filepath = os.environ.get(TRACE_VARIABLE)
+    if filepath and is_recording():
+        stop().write(filepath)
@@ -1,4 +1,10 @@
 from umlayer.usecases.project_interactor import ProjectInteractor
 
-from umlayer.usecases.project_storage import ProjectStorage
+from umlayer.usecases.project_storage import ProjectStorage, LazyProjectStorage
+from umlayer.usecases.journal import Journal
 from umlayer.usecases.interactors import Interactors
+from umlayer.usecases.export_cache import (
+    ExportManifest,
+    ExportReport,
+    diagram_digest,
+)
@@ -0,0 +1,104 @@
+"""Content-hash cache for exporting diagrams
+
+A manifest file is kept next to the exported images. It maps a diagram id
+to the hash of the diagram content and export settings the image was
+rendered from, so unchanged diagrams can be skipped on the next export.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from uuid import UUID
+
+from umlayer import model
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".umlayer-export.json"
+MANIFEST_VERSION = 1
+
+
+def diagram_digest(diagram: model.Diagram, export_settings: dict) -> str:
+    """Return a stable hash of the diagram content and export settings
+
+    Scroll data does not affect the exported image and is ignored.
+    The order of dtos is ignored too: the scene stores its elements in
+    stacking order, which may differ from one store to another,
+    while the stacking itself is described by the zValue of every dto.
+    """
+    canonical_dtos = sorted(
+        json.dumps(json.loads(json_dto), sort_keys=True) for json_dto in diagram.dtos
+    )
+    content = {
+        "dtos": canonical_dtos,
+        "settings": export_settings,
+    }
+    data = json.dumps(content, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class ExportReport:
+    """Names of the diagrams that were skipped (hits) or rendered (misses)"""
+
+    def __init__(self):
+        self.hits: list[str] = []
+        self.misses: list[str] = []
+
+    def __str__(self):
+        return f"{len(self.misses)} exported, {len(self.hits)} unchanged"
+
+
+class ExportManifest:
+    """Stores hashes of the exported diagrams in the output directory"""
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._entries: dict[str, dict] = {}
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self._directory, MANIFEST_FILENAME)
+
+    def load(self) -> None:
+        """Reads the manifest. A missing or broken manifest is treated as empty."""
+        self._entries = {}
+        try:
+            with open(self.path, encoding="utf-8") as manifest_file:
+                data = json.load(manifest_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable export manifest %s", self.path)
+            return
+
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        self._entries = data.get("diagrams", {})
+
+    def save(self) -> None:
+        data = {"version": MANIFEST_VERSION, "diagrams": self._entries}
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(data, manifest_file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def is_fresh(self, diagram_id: UUID, digest: str, filename: str) -> bool:
+        """Checks that the image of the diagram was rendered from the same content"""
+        entry = self._entries.get(str(diagram_id))
+        return (
+            entry is not None
+            and entry["hash"] == digest
+            and entry["file"] == filename
+            and os.path.exists(os.path.join(self._directory, filename))
+        )
+
+    def update(self, diagram_id: UUID, digest: str, filename: str) -> None:
+        self._entries[str(diagram_id)] = {"hash": digest, "file": filename}
+
+    def retain(self, diagram_ids) -> None:
+        """Forgets the diagrams that are not in the project anymore"""
+        keys = {str(diagram_id) for diagram_id in diagram_ids}
+        self._entries = {
+            key: entry for key, entry in self._entries.items() if key in keys
+        }
@@ -0,0 +1,114 @@
+"""Journal of unsaved changes of the open project"""
+
+import copy
+import logging
+import queue
+import threading
+from uuid import UUID
+
+from umlayer import model
+from umlayer.model import journal
+from .project_storage import ProjectStorage
+
+logger = logging.getLogger(__name__)
+
+
+class Journal(model.ProjectObserver):
+    """Records changes of the open project into its file as they are made
+
+    Changes are collected on the main thread and handed to a background
+    thread on flush, which appends them to the file. Saving the project
+    is the checkpoint of the journal: the storage drops the written records,
+    as the saved file contains their changes.
+    """
+
+    def __init__(self, storage: ProjectStorage):
+        self._storage = storage
+        self._project: model.Project = None
+        self._filename: str = None
+        self._pending: list[model.JournalRecord] = []
+        self._batches: queue.Queue = None
+        self._writer: threading.Thread = None
+
+    def is_started(self) -> bool:
+        return self._project is not None
+
+    def filename(self) -> str:
+        """Returns the file of the started journal, None if it is not started"""
+        return self._filename if self.is_started() else None
+
+    def start(self, project: model.Project, filename: str) -> None:
+        """Starts recording changes of the project saved in the file"""
+        self.stop()
+        self._project = project
+        self._filename = filename
+        project.subscribe(self)
+        self._batches = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write,
+            args=(self._batches, filename),
+            name="Journal writer",
+            daemon=True,
+        )
+        self._writer.start()
+        logger.debug("Journal of %s started", filename)
+
+    def stop(self) -> None:
+        """Stops recording, waiting for the flushed records to be written
+
+        Records that were not flushed are dropped.
+        """
+        if not self.is_started():
+            return
+        self._project.unsubscribe(self)
+        self._project = None
+        self._pending = []
+        self._batches.put(None)
+        self._writer.join()
+        self._batches = None
+        self._writer = None
+        logger.debug("Journal of %s stopped", self._filename)
+
+    def discard(self) -> None:
+        """Stops recording and drops the written records of unsaved changes"""
+        filename = self._filename
+        if not self.is_started():
+            return
+        self.stop()
+        self._storage.clear_journal(filename)
+
+    def flush(self) -> None:
+        """Hands the recorded changes over to be written in the background"""
+        if not self._pending:
+            return
+        self._batches.put(self._pending)
+        self._pending = []
+
+    def record_element_changes(self, diagram_id: UUID, changes: dict[str, str]):
+        """changes map element ids to their dtos, None for removed elements"""
+        if self.is_started() and changes:
+            self._record(journal.CHANGE_ELEMENTS, diagram_id, changes)
+
+    def onItemAdded(self, project_item: model.BaseItem) -> None:
+        # diagram content is replaced, not changed in place, so a shallow copy
+        # keeps the state of the item until it is written
+        self._record(journal.ADD_ITEM, project_item.id, copy.copy(project_item))
+
+    def onItemRemoved(self, project_item: model.BaseItem) -> None:
+        self._record(journal.REMOVE_ITEM, project_item.id)
+
+    def onItemRenamed(self, project_item: model.BaseItem) -> None:
+        self._record(journal.RENAME_ITEM, project_item.id, project_item.name())
+
+    def onItemMoved(self, project_item: model.BaseItem, old_parent_id: UUID) -> None:
+        self._record(journal.MOVE_ITEM, project_item.id, project_item.parent_id)
+
+    def _record(self, operation: str, item_id: UUID, value: object = None) -> None:
+        self._pending.append(model.JournalRecord(operation, item_id, value))
+
+    def _write(self, batches: queue.Queue, filename: str) -> None:
+        while (records := batches.get()) is not None:
+            try:
+                self._storage.append_journal(records, filename)
+            except Exception:
+                logger.exception("Unable to write the journal of %s", filename)
@@ -1,8 +1,12 @@
 import logging
+import os
 import traceback
 
-from umlayer import model
+from umlayer import instrumentation, model
 from .project_storage import ProjectStorage
+from .journal import Journal
+
+logger = logging.getLogger(__name__)
 
 
 class ProjectInteractor:
@@ -11,6 +15,7 @@ class ProjectInteractor:
     def __init__(self, data_model: model.DataModel, storage: ProjectStorage):
         self._data_model = data_model
         self._storage: ProjectStorage = storage
+        self._journal = Journal(storage)
         self._window = None
 
     @property
@@ -41,11 +46,20 @@ class ProjectInteractor:
         if not self.is_project_open():
             return
 
-        project_item = self._project.get(id)
-        if project_item.name() != name:
-            project_item.setName(name)
+        if self._project.get(id).name() != name:
+            self._project.rename(id, name)
             self.set_dirty(True)
 
+    def record_element_changes(self, diagram_id, changes: dict[str, str]) -> None:
+        """Records changed elements of the diagram in the journal
+
+        changes map element ids to their dtos, None for removed elements.
+        """
+        self._journal.record_element_changes(diagram_id, changes)
+
+    def flush_journal(self) -> None:
+        self._journal.flush()
+
     def create_new_project(self):
         """Close old and create new project"""
         if not self.close_project():
@@ -53,25 +67,30 @@ class ProjectInteractor:
 
         self._do_create_new_project()
 
-    def open_project(self) -> None:
-        """Shows dialog for path to project file and opens project"""
+    def open_project(self, read_only: bool = False) -> None:
+        """Shows dialog for path to project file and opens project
+
+        A project opened read-only is loaded without locking the file
+        and is never saved into it: saving asks for another file name.
+        """
         if not self.close_project():
             return
 
-        filename = self._window.getFileNameFromOpenDialog("Open")
+        caption = "Open read-only" if read_only else "Open"
+        filename = self._window.getFileNameFromOpenDialog(caption)
 
         if len(filename) == 0:
             return
 
         try:
             # raise Exception  # for debugging
-            self._do_open_project(filename)
-        except Exception as ex:
-            logging.error(ex)
-            print(ex)
+            self._do_open_project(filename, read_only)
+        except Exception:
+            logger.exception("Unable to open project %s", filename)
             self._window.showCriticalError("Unable to open project!")
         else:
             self._data_model.set_filename(filename)
+            self._data_model.set_read_only(read_only)
             self._window.updateTitle()
 
     def save_project(self) -> bool:
@@ -109,15 +128,23 @@ class ProjectInteractor:
         if not self.save_project_if_needed():
             return False
 
+        self._journal.stop()
         self._window.clearProjectTree()
         self._window.disableScene()
 
         self._data_model.delete_project()
         self._data_model.set_filename(None)
+        self._data_model.set_read_only(False)
+        self._storage.close()
 
         self._window.updateTitle()
         return True
 
+    def release_storage(self) -> None:
+        """Closes the project file, e.g. before the application exits"""
+        self._journal.stop()
+        self._storage.close()
+
     def save_project_if_needed(self) -> bool:
         """Asks about saving modified project, and save it if needed
 
@@ -131,24 +158,31 @@ class ProjectInteractor:
         if reply == model.constants.SAVE:
             if not self.save_project():
                 return False
+        elif reply == model.constants.DISCARD:
+            # the recorded changes must not come back when the file is opened
+            self._journal.discard()
 
         return reply != model.constants.CANCEL
 
     def _is_filename_unset(self) -> bool:
         return (
-            self._filename is None or self._filename == model.constants.DEFAULT_FILENAME
+            self._filename is None
+            or self._filename == model.constants.DEFAULT_FILENAME
+            or self._data_model.read_only
         )
 
     def _save_project_as_filename(self, filename):
         try:
             self._do_save_project(filename)
             self._data_model.set_filename(filename)
+            self._data_model.set_read_only(False)
             self._window.updateTitle()
-            return True
         except Exception:
-            logging.exception(traceback.format_exc())
+            logger.exception(traceback.format_exc())
             self._window.showCriticalError("Unable to save project!")
             return False
+        self._start_journal()
+        return True
 
     def _do_save_project(self, filename) -> None:
         """Actually saves the project"""
@@ -165,33 +199,65 @@ class ProjectInteractor:
         if filename is None:
             raise ValueError("filename")
 
-        project_items = self._project.project_items.values()
-        self._storage.save(project_items, filename)
+        # the saved file is the checkpoint: recorded changes are not needed
+        self._window.flushJournal()
+        journal_filename = self._journal.filename()
+        self._journal.stop()
+        self._storage.save(
+            self._project.walk_breadth_first(),
+            filename,
+            self._project.text_index.rows(),
+        )
+        if journal_filename is not None and not _is_same_file(
+            journal_filename, filename
+        ):
+            # the changes are saved in the other file,
+            # they must not be recovered when the original one is opened
+            self._storage.clear_journal(journal_filename)
         self.set_dirty(False)
 
     def _initializeTreeViewFromProject(self):
         self._window.initializeTreeFromProject()
         self.set_dirty(False)
 
-    def _do_open_project(self, filename) -> None:
-        self._load(filename)
+    def _do_open_project(self, filename, read_only: bool = False) -> None:
+        self._load(filename, read_only)
+        # a read-only project shows the last saved state
+        recovered = not read_only and self._replay_journal(filename)
         self._initializeTreeViewFromProject()
+        if recovered:
+            self.set_dirty(True)
+        if not read_only:
+            self._journal.start(self._project, filename)
 
-    def _load(self, filename: str) -> None:
-        """Loads project data and settings from a file
+    def _replay_journal(self, filename: str) -> bool:
+        """Restores changes made after the file was saved, e.g. before a crash
 
-        Throws exceptions in case of errors
+        Returns True if there were such changes.
         """
+        records = self._storage.load_journal(filename)
+        if not records:
+            return False
+        model.replay_journal(self._project, records)
+        logger.info("%s unsaved changes of %s recovered", len(records), filename)
+        return True
 
-        project_items: list[model.BaseItem] = self._storage.load(filename)
-        root = project_items[0]  # breadth first
+    def _start_journal(self) -> None:
+        """Records the changes of the project saved in a file"""
+        if self.is_project_open() and not self._is_filename_unset():
+            self._journal.start(self._project, self._filename)
 
-        self._data_model.create_project()
-        self._project.setRoot(root)
+    def _load(self, filename: str, read_only: bool = False) -> None:
+        """Loads project data and settings from a file
 
-        for project_item in project_items:
-            if project_item.id != root.id:
-                self._project.add(project_item, project_item.parent_id)
+        Throws exceptions in case of errors
+        """
+
+        project_items = self._storage.load(
+            filename, read_only, progress=self._window.showLoadingProgress
+        )
+        self._data_model.set_project(model.Project.load_items(project_items))
+        self._project.indexTexts(self._storage.load_texts(filename, read_only))
 
         self.set_dirty(False)
 
@@ -208,3 +274,23 @@ class ProjectInteractor:
 
     def _set_default_file_name(self) -> None:
         self._data_model.set_filename(model.constants.DEFAULT_FILENAME)
+
+
+def _is_same_file(filename: str, other_filename: str) -> bool:
+    return os.path.abspath(filename) == os.path.abspath(other_filename)
+
+
+instrumentation.instrument(
+    ProjectInteractor,
+    create_new_project="interactor",
+    open_project="interactor",
+    save_project="interactor",
+    save_project_as="interactor",
+    close_project="interactor",
+    save_project_if_needed="interactor",
+    record_element_changes="interactor",
+    flush_journal="interactor",
+    _save="interactor",
+    _load="interactor",
+    _replay_journal="interactor",
+)
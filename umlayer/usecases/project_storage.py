@@ -2,6 +2,8 @@
 """
 
 from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Iterator
+from uuid import UUID
 
 from umlayer import model
 
@@ -10,9 +12,111 @@ class ProjectStorage(ABC):
     """It supports Save/Load operations for a project"""
 
     @abstractmethod
-    def save(self, elements: list[model.BaseItem], filename: str = None) -> None:
+    def save(
+        self,
+        elements: Iterable[model.BaseItem],
+        filename: str = None,
+        texts: Iterable[tuple[UUID, int, str]] = None,
+    ) -> None:
+        """Writes the project items, and texts of diagram elements if given
+
+        texts are (diagram id, element position, text) rows.
+        The journal of the file is dropped: the saved items contain its changes.
+        """
         raise NotImplementedError
 
     @abstractmethod
-    def load(self, filename: str = None) -> list[model.BaseItem]:
+    def load(
+        self,
+        filename: str = None,
+        read_only: bool = False,
+        progress: Callable[[int, int], None] = None,
+    ) -> Iterator[model.BaseItem]:
+        """Yields project items from the file, the root first and parents before children
+
+        A read-only load does not keep the file open and does not lock it.
+        progress, if given, is called with the numbers of loaded and all items.
+        """
         raise NotImplementedError
+
+    def load_texts(
+        self, filename: str = None, read_only: bool = False
+    ) -> list[tuple[UUID, int, str]]:
+        """Returns the stored texts of diagram elements
+
+        Returns None if the file has no stored texts.
+        """
+        return None
+
+    def append_journal(
+        self, records: list[model.JournalRecord], filename: str = None
+    ) -> None:
+        """Adds records of unsaved changes to the journal of the file
+
+        May be called from a background thread.
+        Storages without a journal ignore the records.
+        """
+
+    def load_journal(self, filename: str = None) -> list[model.JournalRecord]:
+        """Returns the records of changes made after the file was saved"""
+        return []
+
+    def clear_journal(self, filename: str = None) -> None:
+        """Drops the journal, e.g. when its changes are discarded"""
+
+    def close(self) -> None:
+        """Releases the resources held for the open project file"""
+
+
+class LazyProjectStorage(ProjectStorage):
+    """Creates the actual storage on first use
+
+    Storage implementations pull in heavy dependencies (database engine,
+    serialization). They are not needed to show the main window.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._storage: ProjectStorage = None
+
+    @property
+    def storage(self) -> ProjectStorage:
+        if self._storage is None:
+            self._storage = self._factory()
+        return self._storage
+
+    def save(
+        self,
+        elements: Iterable[model.BaseItem],
+        filename: str = None,
+        texts: Iterable[tuple[UUID, int, str]] = None,
+    ) -> None:
+        self.storage.save(elements, filename, texts)
+
+    def load(
+        self,
+        filename: str = None,
+        read_only: bool = False,
+        progress: Callable[[int, int], None] = None,
+    ) -> Iterator[model.BaseItem]:
+        return self.storage.load(filename, read_only, progress)
+
+    def load_texts(
+        self, filename: str = None, read_only: bool = False
+    ) -> list[tuple[UUID, int, str]]:
+        return self.storage.load_texts(filename, read_only)
+
+    def append_journal(
+        self, records: list[model.JournalRecord], filename: str = None
+    ) -> None:
+        self.storage.append_journal(records, filename)
+
+    def load_journal(self, filename: str = None) -> list[model.JournalRecord]:
+        return self.storage.load_journal(filename)
+
+    def clear_journal(self, filename: str = None) -> None:
+        self.storage.clear_journal(filename)
+
+    def close(self) -> None:
+        if self._storage is not None:
+            self._storage.close()